@@ -6,8 +6,9 @@ Modular quantum engine: backends, noise, circuit parameterisation,
 qubit allocation, checkpointing, and hardware integration.
 """
 
-from qndb.core.engine.backends import BackendBase, SimulatorBackend, CloudBackend  # noqa: F401
+from qndb.core.engine.backends import BackendBase, SimulatorBackend, CloudBackend, GPUBackend  # noqa: F401
 from qndb.core.engine.noise import NoiseConfig                                     # noqa: F401
+from qndb.core.engine.numba_backend import NumbaBackend                            # noqa: F401
 from qndb.core.engine.quantum_engine import QuantumEngine                          # noqa: F401
 
 # Hardware integration (feature-flagged)
@@ -23,7 +24,7 @@ from qndb.core.engine.hardware import (
 
 __all__ = [
     # Core
-    "BackendBase", "SimulatorBackend", "CloudBackend",
+    "BackendBase", "SimulatorBackend", "CloudBackend", "GPUBackend", "NumbaBackend",
     "NoiseConfig", "QuantumEngine",
     # Feature flags
     "HARDWARE_ENABLED", "IBM_ENABLED", "GOOGLE_ENABLED",
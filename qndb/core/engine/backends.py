@@ -2,6 +2,7 @@
 
 import cirq
 import logging
+import numpy as np
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,10 @@ class BackendBase:
     def simulate(self, circuit: cirq.Circuit) -> cirq.SimulationTrialResult:
         raise NotImplementedError
 
+    def state_vector(self, circuit: cirq.AbstractCircuit) -> np.ndarray:
+        """Return the final state vector of *circuit* (default qubit order)."""
+        return self.simulate(circuit).final_state_vector
+
     @property
     def name(self) -> str:
         raise NotImplementedError
@@ -69,3 +74,42 @@ class CloudBackend(BackendBase):
     @property
     def name(self) -> str:
         return f"cloud-{self._provider}"
+
+
+class GPUBackend(BackendBase):
+    """GPU state-vector backend via qsim's cuStateVec (cuQuantum) mode.
+
+    The state vector lives in device memory and gates are applied with
+    fused cuStateVec kernels.  Falls back to the local Cirq simulator
+    when ``qsimcirq`` is not installed or was built without GPU support.
+    """
+
+    def __init__(self, gpu_mode: int = 1, max_fused_gate_size: int = 4) -> None:
+        self._gpu_enabled = False
+        try:
+            import qsimcirq  # type: ignore[import-untyped]
+
+            options = qsimcirq.QSimOptions(
+                use_gpu=True,
+                gpu_mode=gpu_mode,
+                max_fused_gate_size=max_fused_gate_size,
+            )
+            self._simulator = qsimcirq.QSimSimulator(qsim_options=options)
+            self._gpu_enabled = True
+        except Exception as exc:  # ImportError or qsim built without CUDA
+            logger.warning("GPUBackend: cuStateVec unavailable (%s); using local simulator", exc)
+            self._simulator = cirq.Simulator()
+
+    @property
+    def gpu_enabled(self) -> bool:
+        return self._gpu_enabled
+
+    def run(self, circuit: cirq.Circuit, repetitions: int = 1000) -> cirq.Result:
+        return self._simulator.run(circuit, repetitions=repetitions)
+
+    def simulate(self, circuit: cirq.Circuit):
+        return self._simulator.simulate(circuit)
+
+    @property
+    def name(self) -> str:
+        return "gpu" if self._gpu_enabled else "gpu-fallback"
@@ -4,6 +4,7 @@ import cirq
 import enum
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Type
 
@@ -247,6 +248,37 @@ class BackendRegistry:
         """Return keys of backends whose SDK is installed + connected."""
         return [k for k, b in self._backends.items() if b.is_available]
 
+    # -- Connection ---------------------------------------------------------
+
+    def connect_all(
+        self, credentials: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, bool]:
+        """Connect every registered backend that is not yet available.
+
+        *credentials* maps backend keys to the keyword arguments for that
+        backend's ``connect``.  Each provider handshake is a network round
+        trip, so they are fanned out over a thread pool rather than run one
+        after another.  Returns a map of backend key to availability.
+        """
+        credentials = credentials or {}
+        backends = list(self._backends.items())
+        if not backends:
+            return {}
+
+        def _connect(item):
+            key, backend = item
+            if backend.is_available:
+                return True
+            try:
+                return backend.connect(**credentials.get(key, {}))
+            except Exception as exc:
+                logger.warning("Backend %s: connect raised %s", key, exc)
+                return False
+
+        with ThreadPoolExecutor(max_workers=len(backends)) as pool:
+            results = list(pool.map(_connect, backends))
+        return {key: ok for (key, _b), ok in zip(backends, results)}
+
     # -- Capability-based selection -----------------------------------------
 
     def select_backend(
@@ -58,10 +58,9 @@ class WorkloadPartitioner:
 
     def analyse(self, circuit: cirq.Circuit) -> WorkloadAnalysis:
         """Classify a circuit and recommend execution path."""
-        qubits = sorted(circuit.all_qubits())
-        n_qubits = len(qubits)
+        # all_qubits() is cached on the circuit; only its size matters here
+        n_qubits = len(circuit.all_qubits())
         depth = len(circuit)
-        n_ops = len(list(circuit.all_operations()))
 
         analysis = WorkloadAnalysis(
             num_qubits_needed=n_qubits,
@@ -122,33 +121,31 @@ class CircuitKnitter:
         if n <= self._max_qubits:
             return [circuit]
 
-        # Partition qubits into groups of max_qubits
-        groups: List[List[cirq.Qid]] = []
-        for i in range(0, n, self._max_qubits):
-            groups.append(all_qubits[i : i + self._max_qubits])
-
-        fragments: List[cirq.Circuit] = []
-        for group in groups:
-            group_set = set(group)
-            ops = [
-                op for op in circuit.all_operations()
-                if all(q in group_set for q in op.qubits)
-            ]
-            if ops:
-                fragments.append(cirq.Circuit(ops))
-
-        # Handle cross-partition operations (simplified: warn + drop)
-        cross_ops = [
-            op for op in circuit.all_operations()
-            if not any(
-                all(q in set(g) for q in op.qubits)
-                for g in groups
-            )
+        # Partition qubits into groups of max_qubits: the group of the k-th
+        # sorted qubit is k // max_qubits, so one pass over the operations
+        # routes each to its group (or flags it as crossing groups)
+        group_of = {q: i // self._max_qubits for i, q in enumerate(all_qubits)}
+        group_ops: List[List[cirq.Operation]] = [
+            [] for _ in range(-(-n // self._max_qubits))
         ]
+        cross_ops = 0
+        for op in circuit.all_operations():
+            qubits = op.qubits
+            if not qubits:
+                for ops in group_ops:  # qubit-less ops belong to every group
+                    ops.append(op)
+                continue
+            g = group_of[qubits[0]]
+            if all(group_of[q] == g for q in qubits[1:]):
+                group_ops[g].append(op)
+            else:
+                cross_ops += 1  # simplified: warn + drop
+
+        fragments = [cirq.Circuit(ops) for ops in group_ops if ops]
         if cross_ops:
             logger.warning(
                 "CircuitKnitter: %d cross-partition operations will be approximated",
-                len(cross_ops),
+                cross_ops,
             )
 
         return fragments if fragments else [circuit]
@@ -0,0 +1,210 @@
+"""Numba-JIT state-vector backend.
+
+Lowers a Cirq circuit into a list of ``(tag, operands)`` instructions and
+applies them to a ``complex128`` state vector with JIT-compiled kernels
+that index amplitude pairs ``(i, i | 1 << bit)`` with bit tricks.  Each
+kernel is parallelised over the outer amplitude index with ``prange``.
+
+Circuits containing operations the kernels do not cover (measurements,
+symbols, arbitrary multi-qubit unitaries) and environments without
+``numba`` fall back to the local Cirq simulator.
+"""
+
+import cirq
+import logging
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from qndb.core.engine.backends import BackendBase
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# SDK availability probe
+# ---------------------------------------------------------------------------
+
+_NUMBA_AVAILABLE = False
+try:
+    from numba import njit, prange  # type: ignore[import-untyped]
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        def wrap(fn):
+            return fn
+        return wrap
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _apply_h(state, tbit):
+    tmask = 1 << tbit
+    inv_sqrt2 = 0.7071067811865476
+    for k in prange(state.shape[0] >> 1):
+        i = ((k >> tbit) << (tbit + 1)) | (k & (tmask - 1))
+        j = i | tmask
+        a = state[i]
+        b = state[j]
+        state[i] = (a + b) * inv_sqrt2
+        state[j] = (a - b) * inv_sqrt2
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _apply_controlled_1q(state, ctrl_mask, ctrl_val, tbit, u00, u01, u10, u11):
+    tmask = 1 << tbit
+    for k in prange(state.shape[0] >> 1):
+        i = ((k >> tbit) << (tbit + 1)) | (k & (tmask - 1))
+        if (i & ctrl_mask) != ctrl_val:
+            continue
+        j = i | tmask
+        a = state[i]
+        b = state[j]
+        state[i] = u00 * a + u01 * b
+        state[j] = u10 * a + u11 * b
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _apply_swap(state, abit, bbit):
+    amask = 1 << abit
+    bmask = 1 << bbit
+    for i in prange(state.shape[0]):
+        if (i & amask) != 0 and (i & bmask) == 0:
+            j = i ^ (amask | bmask)
+            tmp = state[i]
+            state[i] = state[j]
+            state[j] = tmp
+
+
+# ---------------------------------------------------------------------------
+# Circuit lowering
+# ---------------------------------------------------------------------------
+
+_CONTROLLED_X = {cirq.CNOT: 1, cirq.CCX: 2}
+_CONTROLLED_Z = {cirq.CZ: 1, cirq.CCZ: 2}
+_X_MATRIX = cirq.unitary(cirq.X)
+_Z_MATRIX = cirq.unitary(cirq.Z)
+
+Instruction = Tuple
+
+
+def _lower_controlled(
+    op: cirq.Operation,
+) -> Optional[Tuple[List[cirq.Qid], List[int], cirq.Qid, np.ndarray]]:
+    """Express *op* as a (controls, control values, target, 2x2 matrix) tuple."""
+    if isinstance(op, cirq.ControlledOperation):
+        inner = _lower_controlled(op.sub_operation)
+        values = [tuple(v) for v in op.control_values]
+        # A multi-product SumOfProducts yields one entry per product, not per control
+        if inner is None or len(values) != len(op.controls) or any(len(v) != 1 for v in values):
+            return None
+        controls, ctrl_vals, target, matrix = inner
+        return list(op.controls) + controls, [v[0] for v in values] + ctrl_vals, target, matrix
+
+    gate = op.gate
+    if gate in _CONTROLLED_X:
+        n = _CONTROLLED_X[gate]
+        return list(op.qubits[:n]), [1] * n, op.qubits[n], _X_MATRIX
+    if gate in _CONTROLLED_Z:
+        n = _CONTROLLED_Z[gate]
+        return list(op.qubits[:n]), [1] * n, op.qubits[n], _Z_MATRIX
+    if (len(op.qubits) == 1 and not cirq.is_measurement(op)
+            and not cirq.is_parameterized(op) and cirq.has_unitary(op)):
+        return [], [], op.qubits[0], cirq.unitary(op)
+    return None
+
+
+def lower_circuit(circuit: cirq.AbstractCircuit, qubit_order: Sequence[cirq.Qid]) -> Optional[List[Instruction]]:
+    """Lower *circuit* into kernel instructions, or ``None`` if unsupported."""
+    n = len(qubit_order)
+    bits = {q: n - 1 - p for p, q in enumerate(qubit_order)}
+    program: List[Instruction] = []
+
+    for op in circuit.all_operations():
+        if op.gate == cirq.H:
+            program.append(("h", bits[op.qubits[0]]))
+            continue
+        if op.gate == cirq.SWAP:
+            program.append(("swap", bits[op.qubits[0]], bits[op.qubits[1]]))
+            continue
+        if not op.qubits and not cirq.is_parameterized(op) and cirq.has_unitary(op):
+            program.append(("phase", complex(cirq.unitary(op)[0, 0])))
+            continue
+
+        lowered = _lower_controlled(op)
+        if lowered is None:
+            return None
+        controls, ctrl_vals, target, matrix = lowered
+        ctrl_mask = 0
+        ctrl_val = 0
+        for q, v in zip(controls, ctrl_vals):
+            ctrl_mask |= 1 << bits[q]
+            ctrl_val |= v << bits[q]
+        program.append((
+            "c1q", ctrl_mask, ctrl_val, bits[target],
+            complex(matrix[0, 0]), complex(matrix[0, 1]),
+            complex(matrix[1, 0]), complex(matrix[1, 1]),
+        ))
+    return program
+
+
+def run_program(program: Sequence[Instruction], num_qubits: int) -> np.ndarray:
+    """Apply a lowered program to ``|0...0>`` and return the state vector."""
+    state = np.zeros(1 << num_qubits, dtype=np.complex128)
+    state[0] = 1.0
+    for instr in program:
+        tag = instr[0]
+        if tag == "c1q":
+            _apply_controlled_1q(state, *instr[1:])
+        elif tag == "h":
+            _apply_h(state, instr[1])
+        elif tag == "swap":
+            _apply_swap(state, instr[1], instr[2])
+        else:  # "phase"
+            state *= instr[1]
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Backend
+# ---------------------------------------------------------------------------
+
+
+class NumbaBackend(BackendBase):
+    """State-vector backend with Numba-JIT gate kernels.
+
+    ``run`` delegates to the local Cirq simulator; ``state_vector`` uses
+    the JIT kernels whenever ``numba`` is installed and the circuit can be
+    lowered.
+    """
+
+    def __init__(self) -> None:
+        self._simulator = cirq.Simulator()
+        if not _NUMBA_AVAILABLE:
+            logger.warning("NumbaBackend: numba not installed; using local simulator")
+
+    @property
+    def numba_enabled(self) -> bool:
+        return _NUMBA_AVAILABLE
+
+    def run(self, circuit: cirq.Circuit, repetitions: int = 1000) -> cirq.Result:
+        return self._simulator.run(circuit, repetitions=repetitions)
+
+    def simulate(self, circuit: cirq.Circuit):
+        return self._simulator.simulate(circuit)
+
+    def state_vector(self, circuit: cirq.AbstractCircuit) -> np.ndarray:
+        """Return the final state vector of *circuit* (default qubit order)."""
+        if _NUMBA_AVAILABLE:
+            qubit_order = sorted(circuit.all_qubits())
+            program = lower_circuit(circuit, qubit_order)
+            if program is not None:
+                return run_program(program, len(qubit_order))
+        return self._simulator.simulate(circuit).final_state_vector
+
+    @property
+    def name(self) -> str:
+        return "numba" if _NUMBA_AVAILABLE else "numba-fallback"
@@ -1,21 +1,80 @@
 """Main quantum processing engine for the database system."""
 
 import cirq
+import functools
 import numpy as np
+import operator
 import sympy
 import time
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
 
-from qndb.core.engine.backends import BackendBase, SimulatorBackend, CloudBackend
+from qndb.core.engine.backends import BackendBase, SimulatorBackend, CloudBackend, GPUBackend
 from qndb.core.engine.noise import NoiseConfig
+from qndb.core.engine.numba_backend import NumbaBackend
 
 logger = logging.getLogger(__name__)
 
+# Number of prepared circuit programs kept per engine.
+_PROGRAM_CACHE_SIZE = 16
+
+
+def _single_qubit(gate: cirq.Gate) -> Callable:
+    return lambda qs, p: tuple(gate(q) for q in qs)
+
+
+def _two_qubit(gate: cirq.Gate) -> Callable:
+    return lambda qs, p: (gate(qs[0], qs[1]),)
+
+
+def _rotation(factory: Callable[[float], cirq.Gate]) -> Callable:
+    return lambda qs, p: tuple(factory(p[0])(q) for q in qs)
+
+
+# operation name -> (builder, minimum qubit count, needs rotation angle)
+_GATE_TABLE: Dict[str, Tuple[Callable, int, bool]] = {
+    "H": (_single_qubit(cirq.H), 0, False),
+    "X": (_single_qubit(cirq.X), 0, False),
+    "Y": (_single_qubit(cirq.Y), 0, False),
+    "Z": (_single_qubit(cirq.Z), 0, False),
+    "CNOT": (_two_qubit(cirq.CNOT), 2, False),
+    "CZ": (_two_qubit(cirq.CZ), 2, False),
+    "SWAP": (_two_qubit(cirq.SWAP), 2, False),
+    "Rx": (_rotation(cirq.rx), 0, True),
+    "Ry": (_rotation(cirq.ry), 0, True),
+    "Rz": (_rotation(cirq.rz), 0, True),
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_ops(
+    operation_type: str,
+    target_qubits: Tuple[cirq.Qid, ...],
+    params: Optional[Tuple[float, ...]],
+) -> Tuple[cirq.Operation, ...]:
+    """Build (and memoise) the operations for a named gate application."""
+    entry = _GATE_TABLE.get(operation_type)
+    if entry is None:
+        raise ValueError(f"Unknown operation type: {operation_type}")
+    builder, min_qubits, needs_params = entry
+    if len(target_qubits) < min_qubits:
+        raise ValueError(f"{operation_type} requires at least {min_qubits} qubits")
+    if needs_params and (params is None or len(params) == 0):
+        raise ValueError(f"{operation_type} requires a rotation angle parameter")
+    return builder(target_qubits, params)
+
 
 class QuantumEngine:
     """Main quantum processing unit for the database system."""
 
+    __slots__ = (
+        "num_qubits", "simulator_type", "noise_config", "_circuit",
+        "measurement_results", "_qubits", "_qubits_np", "_backend",
+        "_simulator", "_active_jobs", "_total_qubits", "_available_qubits",
+        "_state_version", "_circuit_version", "_program_cache",
+        "_allocated", "_parameters", "_checkpoints", "_meas_gate_cache",
+    )
+
     def __init__(
         self,
         num_qubits: int = 10,
@@ -32,14 +91,19 @@ class QuantumEngine:
             self._backend = backend
         elif simulator_type == "hardware":
             self._backend = CloudBackend()
+        elif simulator_type == "gpu":
+            self._backend = GPUBackend()
+        elif simulator_type == "numba":
+            self._backend = NumbaBackend()
         else:
             self._backend = SimulatorBackend(noise_model=noise_config)
 
-        self.simulator = (
-            self._backend._simulator
-            if hasattr(self._backend, "_simulator")
-            else cirq.Simulator()
-        )
+        # Resolved lazily on first use; see the ``simulator`` property
+        self._simulator: Optional[cirq.SimulatesSamples] = None
+
+        # Prepared-program cache, keyed by circuit identity and version
+        self._circuit_version = 0
+        self._program_cache: Dict[Tuple[int, int], Dict[str, Any]] = {}
 
         self.circuit = cirq.Circuit()
         self.measurement_results: Dict[str, Any] = {}
@@ -48,6 +112,9 @@ class QuantumEngine:
         self._available_qubits = num_qubits
         self._state_version = 0
 
+        # Measurement gates are immutable; reuse one per (width, key)
+        self._meas_gate_cache: Dict[Tuple[int, str], cirq.MeasurementGate] = {}
+
         # Qubit allocation tracking
         self._allocated: Dict[str, List[int]] = {}
 
@@ -75,25 +142,211 @@ class QuantumEngine:
             logger.error("Error initializing quantum engine: %s", e)
             return False
 
-    def _initialize_qubits(self) -> List[cirq.Qid]:
-        return [cirq.LineQubit(i) for i in range(self.num_qubits)]
+    def _initialize_qubits(self) -> Tuple[cirq.Qid, ...]:
+        return tuple(cirq.LineQubit.range(self.num_qubits))
+
+    @property
+    def qubits(self) -> Tuple[cirq.Qid, ...]:
+        return self._qubits
+
+    @qubits.setter
+    def qubits(self, qubits: Sequence[cirq.Qid]) -> None:
+        self._qubits = tuple(qubits)
+        # Object array for fancy indexing: self._qubits_np[[i, j, ...]]
+        self._qubits_np = np.empty(len(self._qubits), dtype=object)
+        self._qubits_np[:] = self._qubits
+
+    def _target_qubits(self, qubits: List[int]) -> List[cirq.Qid]:
+        return self._qubits_np[list(qubits)].tolist()
+
+    @property
+    def simulator(self) -> cirq.SimulatesSamples:
+        if self._simulator is None:
+            self._simulator = getattr(self._backend, "_simulator", None)
+            if self._simulator is None:
+                self._simulator = cirq.Simulator(split_untangled_states=True)
+        return self._simulator
+
+    @simulator.setter
+    def simulator(self, simulator: cirq.SimulatesSamples) -> None:
+        self._simulator = simulator
+        self._program_cache.clear()
 
     # ------------------------------------------------------------------
     # Circuit manipulation
     # ------------------------------------------------------------------
 
+    @property
+    def circuit(self) -> cirq.Circuit:
+        return self._circuit
+
+    @circuit.setter
+    def circuit(self, circuit: cirq.Circuit) -> None:
+        self._circuit = circuit
+        self._circuit_version += 1
+
     def reset_circuit(self) -> None:
         self.circuit = cirq.Circuit()
 
     def add_operations(self, operations: List[cirq.Operation]) -> None:
         self.circuit.append(operations)
+        self._circuit_version += 1
+
+    def _prepared_program(self) -> Dict[str, Any]:
+        """Return the cached prepared program for the current circuit.
+
+        Entries are keyed by the circuit identity and the engine's mutation
+        counter, which every engine method and ``circuit`` assignment bumps.
+        Each entry also keeps the source circuit and its moment objects:
+        Cirq moments are immutable, so any in-place edit made directly on
+        ``engine.circuit`` (append, insert, item assignment) replaces at
+        least one moment and is detected by an identity check, without
+        comparing operations.
+        """
+        circuit = self._circuit
+        key = (id(circuit), self._circuit_version)
+        moments = tuple(circuit.moments)
+        program = self._program_cache.get(key)
+        if program is not None and (
+            program["source"] is not circuit
+            or len(program["moments"]) != len(moments)
+            or not all(map(operator.is_, program["moments"], moments))
+        ):
+            del self._program_cache[key]
+            program = None
+        if program is None:
+            if len(self._program_cache) >= _PROGRAM_CACHE_SIZE:
+                self._program_cache.pop(next(iter(self._program_cache)))
+            program = {
+                "source": circuit,
+                "moments": moments,
+                "frozen": cirq.FrozenCircuit(circuit),
+            }
+            self._program_cache[key] = program
+        return program
 
     def run_circuit(self, repetitions: int = 1000) -> Dict[str, np.ndarray]:
-        self.measurement_results = self.simulator.run(self.circuit, repetitions=repetitions)
+        program = self._prepared_program()
+        if "terminal" not in program:
+            program["terminal"] = self._terminal_measurements(program["frozen"])
+        if program["terminal"] is not None:
+            self.measurement_results = self._sample_terminal(program, repetitions)
+        else:
+            self.measurement_results = self.simulator.run(program["frozen"], repetitions=repetitions)
         return self.measurement_results.measurements
 
+    def run_circuit_packed(self, repetitions: int = 1000) -> Tuple[np.ndarray, List[Tuple[str, int]]]:
+        """Run the circuit and return all measured bits packed per shot.
+
+        The per-key measurement arrays are concatenated column-wise in key
+        order and packed with ``np.packbits`` along the bit axis, so each
+        shot occupies ``ceil(N / 8)`` bytes.  Recover the ``(R, N)`` bit
+        matrix with ``np.unpackbits(packed, axis=1, count=N)``.
+
+        Returns:
+            ``(packed, key_order)`` where *key_order* lists
+            ``(key, width)`` pairs in column order.
+        """
+        measurements = self.run_circuit(repetitions)
+        key_order = [(key, bits.shape[1]) for key, bits in measurements.items()]
+        if not key_order:
+            return np.zeros((repetitions, 0), dtype=np.uint8), key_order
+        bits = np.concatenate(list(measurements.values()), axis=1)
+        return np.packbits(bits.astype(np.uint8, copy=False), axis=1), key_order
+
+    def run_circuits_batch(
+        self,
+        resolvers: List[cirq.ParamResolverOrSimilarType],
+        repetitions: int = 1000,
+    ) -> List[Dict[str, np.ndarray]]:
+        """Run the current circuit once per parameter resolver.
+
+        The prepared (frozen) circuit is handed to the simulator as a
+        single sweep, so validation and moment scheduling happen once
+        for all resolvers; qsim-backed simulators execute the sweep
+        natively.
+        """
+        program = self._prepared_program()
+        results = self.simulator.run_sweep(
+            program["frozen"], params=list(resolvers), repetitions=repetitions
+        )
+        return [result.measurements for result in results]
+
+    def _is_noiseless_simulator(self) -> bool:
+        """Whether the simulator is a deterministic, noise-free ``cirq.Simulator``."""
+        simulator = self.simulator
+        return isinstance(simulator, cirq.Simulator) and simulator.noise is cirq.NO_NOISE
+
+    def _terminal_measurements(
+        self, circuit: cirq.FrozenCircuit
+    ) -> Optional[List[Tuple[str, List[int], np.ndarray]]]:
+        """Describe the terminal measurements of a noiseless circuit.
+
+        Returns ``(key, qubit indices, invert mask)`` per measurement, or
+        ``None`` when the circuit must go through the simulator (noise,
+        mid-circuit or non-standard measurements, symbols, repeated keys).
+        """
+        if not self._is_noiseless_simulator() or cirq.is_parameterized(circuit):
+            return None
+        if not circuit.has_measurements() or not circuit.are_all_measurements_terminal():
+            return None
+
+        index = {q: i for i, q in enumerate(sorted(circuit.all_qubits()))}
+        measurements = []
+        for op in circuit.all_operations():
+            if not cirq.is_measurement(op):
+                continue
+            gate = op.gate
+            if not isinstance(gate, cirq.MeasurementGate) or gate.confusion_map:
+                return None
+            mask = np.zeros(len(op.qubits), dtype=np.int8)
+            mask[: len(gate.invert_mask)] = gate.invert_mask
+            measurements.append((gate.key, [index[q] for q in op.qubits], mask))
+
+        if len({key for key, _, _ in measurements}) != len(measurements):
+            return None
+        return measurements
+
+    def _sample_terminal(self, program: Dict[str, Any], repetitions: int) -> cirq.Result:
+        """Sample terminal measurements from the cached pre-measurement state.
+
+        The unitary prefix is simulated once per circuit; every later
+        ``run_circuit`` call only draws Born-rule samples from it.
+        """
+        frozen = program["frozen"]
+        if "prefix_state" not in program:
+            prefix = cirq.Circuit(op for op in frozen.all_operations() if not cirq.is_measurement(op))
+            program["prefix_state"] = self.simulator.simulate(
+                prefix, qubit_order=sorted(frozen.all_qubits())
+            ).final_state_vector
+
+        measured = sorted({i for _, indices, _ in program["terminal"] for i in indices})
+        column = {q: c for c, q in enumerate(measured)}
+        samples = cirq.sample_state_vector(
+            program["prefix_state"], measured, repetitions=repetitions,
+            seed=getattr(self.simulator, "_prng", None),
+        ).astype(np.int8)
+
+        measurements = {
+            key: samples[:, [column[i] for i in indices]] ^ mask
+            for key, indices, mask in program["terminal"]
+        }
+        return cirq.ResultDict(params=cirq.ParamResolver({}), measurements=measurements)
+
     def get_state_vector(self) -> np.ndarray:
-        return self.simulator.simulate(self.circuit).final_state_vector
+        program = self._prepared_program()
+        # Noiseless, measurement-free circuits are deterministic; reuse the result.
+        if program["frozen"].has_measurements() or not self._is_noiseless_simulator():
+            return self._final_state_vector(program["frozen"])
+        if "state" not in program:
+            program["state"] = self._final_state_vector(program["frozen"])
+        return program["state"].copy()
+
+    def _final_state_vector(self, circuit: cirq.AbstractCircuit) -> np.ndarray:
+        # Defer to the backend unless a different simulator was assigned
+        if self.simulator is getattr(self._backend, "_simulator", None):
+            return self._backend.state_vector(circuit)
+        return self.simulator.simulate(circuit).final_state_vector
 
     def apply_operation(
         self,
@@ -101,27 +354,9 @@ class QuantumEngine:
         qubits: List[int],
         params: Optional[List[float]] = None,
     ) -> None:
-        target_qubits = [self.qubits[i] for i in qubits]
-
-        _single = {"H": cirq.H, "X": cirq.X, "Y": cirq.Y, "Z": cirq.Z}
-        if operation_type in _single:
-            operations = [_single[operation_type](q) for q in target_qubits]
-        elif operation_type == "CNOT" and len(qubits) >= 2:
-            operations = [cirq.CNOT(self.qubits[qubits[0]], self.qubits[qubits[1]])]
-        elif operation_type == "CZ" and len(qubits) >= 2:
-            operations = [cirq.CZ(self.qubits[qubits[0]], self.qubits[qubits[1]])]
-        elif operation_type == "SWAP" and len(qubits) >= 2:
-            operations = [cirq.SWAP(self.qubits[qubits[0]], self.qubits[qubits[1]])]
-        elif operation_type == "Rx" and params:
-            operations = [cirq.rx(params[0])(q) for q in target_qubits]
-        elif operation_type == "Ry" and params:
-            operations = [cirq.ry(params[0])(q) for q in target_qubits]
-        elif operation_type == "Rz" and params:
-            operations = [cirq.rz(params[0])(q) for q in target_qubits]
-        else:
-            raise ValueError(f"Unknown operation type: {operation_type}")
-
-        self.add_operations(operations)
+        target_qubits = tuple(self._target_qubits(qubits))
+        params_key = tuple(params) if params is not None else None
+        self.add_operations(list(_build_ops(operation_type, target_qubits, params_key)))
 
     # ------------------------------------------------------------------
     # State management
@@ -200,15 +435,39 @@ class QuantumEngine:
     # ------------------------------------------------------------------
 
     def measure_qubits(self, qubits: List[int], key: str = "measurement") -> None:
-        target_qubits = [self.qubits[i] for i in qubits]
-        self.circuit.append(cirq.measure(*target_qubits, key=key))
+        target_qubits = self._target_qubits(qubits)
+        gate_key = (len(target_qubits), key)
+        gate = self._meas_gate_cache.get(gate_key)
+        if gate is None:
+            gate = cirq.MeasurementGate(num_qubits=len(target_qubits), key=key)
+            self._meas_gate_cache[gate_key] = gate
+        self.circuit.append(gate.on(*target_qubits))
+        self._circuit_version += 1
 
     def get_circuit_diagram(self) -> str:
         return str(self.circuit)
 
     def estimate_resources(self) -> Dict[str, Any]:
-        num_operations = len(list(self.circuit.all_operations()))
-        depth = cirq.Circuit(self.circuit.all_operations()).depth()
+        # The prepared program is frozen, so repeated estimates on an
+        # unchanged circuit reuse the same immutable snapshot.
+        frozen = self._prepared_program()["frozen"]
+
+        # Single walk: count operations and track the earliest-insertion
+        # depth with a per-qubit frontier instead of rebuilding the circuit.
+        num_operations = 0
+        depth = 0
+        frontier: Dict[Any, int] = {}
+        for moment in frozen:
+            for op in moment:
+                num_operations += 1
+                wires = op.qubits
+                if cirq.is_measurement(op):
+                    wires = wires + tuple(cirq.measurement_key_objs(op))
+                level = 1 + max((frontier.get(w, 0) for w in wires), default=0)
+                for w in wires:
+                    frontier[w] = level
+                if level > depth:
+                    depth = level
         return {
             "num_qubits": self.num_qubits,
             "num_operations": num_operations,
@@ -250,7 +509,7 @@ class QuantumEngine:
         self._available_qubits -= count
         self._active_jobs[jid] = {"qubits": chosen, "allocated_at": time.time()}
 
-        return [self.qubits[i] for i in chosen]
+        return self._target_qubits(chosen)
 
     def deallocate_qubits(self, job_id: str) -> bool:
         if job_id not in self._allocated:
@@ -11,10 +11,11 @@ from qndb.core.operations.gates.arithmetic import ArithmeticGates     # noqa: F4
 from qndb.core.operations.gates.transforms import TransformGates      # noqa: F401
 from qndb.core.operations.gates.aggregation import AggregationGates   # noqa: F401
 from qndb.core.operations.gates.sorting import SortingGates           # noqa: F401
+from qndb.core.operations.gates.fanout import FanoutGates             # noqa: F401
 from qndb.core.operations.gates.database_gates import DatabaseGates   # noqa: F401
 
 __all__ = [
     "OracleBuilder", "ComparisonGates", "ArithmeticGates",
-    "TransformGates", "AggregationGates", "SortingGates",
+    "TransformGates", "AggregationGates", "SortingGates", "FanoutGates",
     "DatabaseGates",
 ]
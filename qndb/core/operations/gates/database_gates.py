@@ -18,6 +18,7 @@ from qndb.core.operations.gates.arithmetic import ArithmeticGates
 from qndb.core.operations.gates.transforms import TransformGates
 from qndb.core.operations.gates.aggregation import AggregationGates
 from qndb.core.operations.gates.sorting import SortingGates
+from qndb.core.operations.gates.fanout import FanoutGates
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ class DatabaseGates:
         self._transforms = TransformGates()
         self._aggregation = AggregationGates()
         self._sorting = SortingGates()
+        self._fanout = FanoutGates()
 
     # -- Oracle / amplitude amplification ----------------------------------
 
@@ -129,3 +131,11 @@ class DatabaseGates:
 
     def create_sorting_network(self, registers: List[List[cirq.Qid]]) -> cirq.Circuit:
         return self._sorting.create_sorting_network(registers)
+
+    # -- Fan-out -----------------------------------------------------------
+
+    def create_fanout_controlled_cnot(self, flag_qubit: cirq.Qid,
+                                      sources: List[cirq.Qid],
+                                      destinations: List[cirq.Qid],
+                                      num_copies: Optional[int] = None) -> cirq.Circuit:
+        return self._fanout.create_fanout_controlled_cnot(flag_qubit, sources, destinations, num_copies)
@@ -0,0 +1,72 @@
+"""Fan-out gates: flag-controlled register copies."""
+
+import cirq
+import logging
+import math
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Below this many copied qubits the fan-out tree and its uncompute cost
+# more depth and gates than the serialised Toffolis, and each ancilla
+# doubles the simulated state vector, so the direct form is used.
+FANOUT_MIN_PAIRS = 8
+
+
+class FanoutGates:
+    """Quantum circuits that broadcast a control qubit across many targets."""
+
+    def create_fanout_controlled_cnot(
+        self,
+        flag_qubit: cirq.Qid,
+        sources: List[cirq.Qid],
+        destinations: List[cirq.Qid],
+        num_copies: Optional[int] = None,
+    ) -> cirq.Circuit:
+        """Apply ``CNOT(src, dst)`` controlled by *flag_qubit* for every pair.
+
+        The flag is first copied onto ancillae with a doubling fan-out tree,
+        each controlled copy then uses the nearest flag copy as its control,
+        and the fan-out is uncomputed.  Copies controlled by different flag
+        copies touch disjoint qubits, so the Toffolis are no longer
+        serialised on the single flag qubit.  Registers smaller than
+        ``FANOUT_MIN_PAIRS`` use the flag directly unless *num_copies* is
+        given.
+
+        Args:
+            flag_qubit: Control qubit.
+            sources: Source register.
+            destinations: Destination register (same size as *sources*).
+            num_copies: Total flag copies including *flag_qubit*
+                (default ``ceil(log2(N)) + 1``, or 1 below ``FANOUT_MIN_PAIRS``).
+
+        Returns:
+            Fan-out controlled copy circuit.
+        """
+        if len(sources) != len(destinations):
+            raise ValueError("Source and destination registers must be the same size")
+
+        n = len(sources)
+        if n == 0:
+            return cirq.Circuit()
+        if num_copies is None:
+            num_copies = math.ceil(math.log2(n)) + 1 if n >= FANOUT_MIN_PAIRS else 1
+        num_copies = max(1, min(num_copies, n))
+
+        ancillas = [cirq.NamedQubit(f'_fan_anc_{i}') for i in range(num_copies - 1)]
+
+        # Fan-out tree: every existing copy feeds one fresh ancilla per layer
+        fanout: List[cirq.Operation] = []
+        copies = [flag_qubit]
+        pending = list(ancillas)
+        while pending:
+            layer = [cirq.CNOT(c, pending.pop(0)) for c in copies[:len(pending)]]
+            copies.extend(op.qubits[1] for op in layer)
+            fanout.extend(layer)
+
+        copy_ops = [
+            cirq.TOFFOLI(copies[i % num_copies], src, dst)
+            for i, (src, dst) in enumerate(zip(sources, destinations))
+        ]
+
+        return cirq.Circuit(fanout + copy_ops + fanout[::-1])
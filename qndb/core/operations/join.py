@@ -3,6 +3,7 @@ Quantum join operations implementation for quantum database system.
 """
 
 import cirq
+import itertools
 import numpy as np
 from typing import List, Dict, Tuple, Optional, Union, Callable, Set
 import logging
@@ -63,20 +64,68 @@ class QuantumJoin:
         join_circuit += equality_test
         
         # Step 2: If keys match, copy data to output registers
-        # Copy key (from either table, since they're equal)
-        for i, (src, dst) in enumerate(zip(key_qubits_a, output_key_qubits)):
-            join_circuit.append(cirq.CNOT(src, dst).controlled_by(flag_qubit))
-            
-        # Copy values from first table
-        for i, (src, dst) in enumerate(zip(value_qubits_a, output_value_qubits_a)):
-            join_circuit.append(cirq.CNOT(src, dst).controlled_by(flag_qubit))
-            
-        # Copy values from second table
-        for i, (src, dst) in enumerate(zip(value_qubits_b, output_value_qubits_b)):
-            join_circuit.append(cirq.CNOT(src, dst).controlled_by(flag_qubit))
+        # Copy key (from either table, since they're equal) and the values
+        # from both tables with one flag fan-out
+        sources = list(itertools.chain(key_qubits_a, value_qubits_a, value_qubits_b))
+        destinations = list(itertools.chain(
+            output_key_qubits, output_value_qubits_a, output_value_qubits_b
+        ))
+        join_circuit += self.gates.create_fanout_controlled_cnot(
+            flag_qubit, sources, destinations
+        )
             
         return join_circuit
     
+    def simulate_classical(self, keys_a: np.ndarray, values_a: np.ndarray,
+                           keys_b: np.ndarray, values_b: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Evaluate an inner join on computational-basis inputs without a circuit.
+        
+        When every register holds a basis state the join circuit is a
+        reversible classical function, so it can be evaluated directly on
+        ``uint64`` key/value arrays instead of a 2^n-amplitude state vector.
+        Matches are found with a sort-merge (``argsort`` + ``searchsorted``),
+        which keeps memory linear in the number of rows and matches.
+        
+        Args:
+            keys_a (np.ndarray): Keys of the first table
+            values_a (np.ndarray): Values of the first table (same length as keys_a)
+            keys_b (np.ndarray): Keys of the second table
+            values_b (np.ndarray): Values of the second table (same length as keys_b)
+            
+        Returns:
+            Dict[str, np.ndarray]: Joined ``keys``, ``values_a`` and ``values_b``
+            plus the matching row indices ``index_a`` and ``index_b``
+        """
+        keys_a = np.asarray(keys_a, dtype=np.uint64)
+        keys_b = np.asarray(keys_b, dtype=np.uint64)
+        values_a = np.asarray(values_a, dtype=np.uint64)
+        values_b = np.asarray(values_b, dtype=np.uint64)
+        
+        if keys_a.shape != values_a.shape or keys_b.shape != values_b.shape:
+            self.logger.error("Key and value arrays must have the same length")
+            raise ValueError("Key and value arrays must have the same length")
+            
+        # Sort table B once, then locate the run of equal keys for each row of A
+        order_b = np.argsort(keys_b, kind="stable")
+        sorted_keys_b = keys_b[order_b]
+        lo = np.searchsorted(sorted_keys_b, keys_a, side="left")
+        hi = np.searchsorted(sorted_keys_b, keys_a, side="right")
+        counts = hi - lo
+        
+        # Expand each row of A into one output row per matching row of B
+        index_a = np.repeat(np.arange(len(keys_a)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        index_b = order_b[np.repeat(lo, counts) + offsets]
+        
+        return {
+            "keys": keys_a[index_a],
+            "values_a": values_a[index_a],
+            "values_b": values_b[index_b],
+            "index_a": index_a,
+            "index_b": index_b,
+        }
+    
     def outer_join(self, key_qubits_a: List[cirq.Qid], value_qubits_a: List[cirq.Qid],
                   key_qubits_b: List[cirq.Qid], value_qubits_b: List[cirq.Qid],
                   output_key_qubits: List[cirq.Qid], 
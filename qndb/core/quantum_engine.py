@@ -4,8 +4,9 @@ Quantum Engine — backward-compatibility shim.
 New code should import from :mod:`qndb.core.engine` instead.
 """
 
-from qndb.core.engine.backends import BackendBase, SimulatorBackend, CloudBackend  # noqa: F401
+from qndb.core.engine.backends import BackendBase, SimulatorBackend, CloudBackend, GPUBackend  # noqa: F401
 from qndb.core.engine.noise import NoiseConfig                                     # noqa: F401
+from qndb.core.engine.numba_backend import NumbaBackend                            # noqa: F401
 from qndb.core.engine.quantum_engine import QuantumEngine                          # noqa: F401
 
 # Hardware integration
@@ -20,7 +21,7 @@ from qndb.core.engine.hardware import (
 )
 
 __all__ = [
-    "BackendBase", "SimulatorBackend", "CloudBackend",
+    "BackendBase", "SimulatorBackend", "CloudBackend", "GPUBackend", "NumbaBackend",
     "NoiseConfig", "QuantumEngine",
     # Hardware integration
     "HARDWARE_ENABLED", "IBM_ENABLED", "GOOGLE_ENABLED",
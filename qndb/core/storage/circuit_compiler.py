@@ -6,7 +6,18 @@ Handles optimization and transformation of quantum circuits for storage efficien
 import cirq
 import numpy as np
 import json
-from typing import List, Dict, Tuple, Optional, Union
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Tuple, Optional, Union
+
+
+# Self-inverse multi-qubit gates cancelled when applied back to back
+_SELF_INVERSE_GATES = frozenset({cirq.CNOT, cirq.CZ, cirq.SWAP, cirq.CCX, cirq.CCZ})
+# Gates whose action does not depend on qubit order
+_SYMMETRIC_GATES = frozenset({cirq.CZ, cirq.SWAP, cirq.CCZ})
+# Largest LineQubit index, relative to the mapping size, flattened into an array lookup
+_DENSE_LOOKUP_FACTOR = 4
 
 
 class CircuitCompiler:
@@ -14,7 +25,10 @@ class CircuitCompiler:
     Optimizes and transforms quantum circuits for efficient storage in the database.
     """
     
-    def __init__(self, optimization_level: int = 2):
+    __slots__ = ("optimization_level", "target_gateset", "passes")
+    
+    def __init__(self, optimization_level: int = 2,
+                 target_gateset: Optional[cirq.CompilationTargetGateset] = None):
         """
         Initialize the circuit compiler with a specified optimization level.
         
@@ -24,80 +38,226 @@ class CircuitCompiler:
                 1: Basic optimization (gate fusion, redundant gate elimination)
                 2: Medium optimization (includes qubit routing)
                 3: Advanced optimization (full transpilation with custom passes)
+            target_gateset (Optional[cirq.CompilationTargetGateset]): Gateset to
+                transpile to.  Without one, transpilation only runs at level 3
+                (against ``cirq.CZTargetGateset``).
         """
         self.optimization_level = optimization_level
+        self.target_gateset = target_gateset
         self._setup_optimization_passes()
     
     def _setup_optimization_passes(self):
-        """Set up the optimization passes based on the optimization level."""
+        """Set up the optimization stages enabled at each optimization level."""
         self.passes = {
-            0: [],
-            1: [
-                self._eliminate_redundant_gates,
-                self._fuse_adjacent_gates
-            ],
-            2: [
-                self._eliminate_redundant_gates,
-                self._fuse_adjacent_gates,
-                self._optimize_qubit_routing
-            ],
-            3: [
-                self._eliminate_redundant_gates,
-                self._fuse_adjacent_gates,
-                self._optimize_qubit_routing,
-                self._custom_optimization
-            ]
+            0: (),
+            1: ("eliminate", "fuse"),
+            2: ("eliminate", "fuse", "route"),
+            3: ("eliminate", "fuse", "route", "gateset", "custom")
         }
     
-    def compile(self, circuit: cirq.Circuit) -> Tuple[cirq.Circuit, Dict]:
+    def __getstate__(self):
+        # Only the configuration crosses process boundaries; the pass table
+        # is rebuilt in the receiving process.
+        return {"optimization_level": self.optimization_level,
+                "target_gateset": self.target_gateset}
+    
+    def __setstate__(self, state):
+        self.optimization_level = state["optimization_level"]
+        self.target_gateset = state["target_gateset"]
+        self._setup_optimization_passes()
+    
+    def compile(self, circuit: cirq.AbstractCircuit) -> Tuple[cirq.FrozenCircuit, Dict]:
         """
         Compile and optimize a quantum circuit for storage.
         
+        The compiled circuit is returned frozen so it can be shared between
+        readers safely and Cirq can memoise its derived properties.
+        
         Args:
-            circuit (cirq.Circuit): The quantum circuit to compile
+            circuit (cirq.AbstractCircuit): The quantum circuit to compile
             
         Returns:
-            Tuple[cirq.Circuit, Dict]: Optimized circuit and compilation metadata
+            Tuple[cirq.FrozenCircuit, Dict]: Optimized circuit and compilation metadata
         """
         if self.optimization_level == 0:
-            return circuit, {"optimization": "none"}
+            return circuit.freeze(), {"optimization": "none"}
             
-        # Create a working copy of the circuit
-        optimized_circuit = circuit.copy()
-        
-        # Apply optimization passes according to the selected level
-        for pass_fn in self.passes[self.optimization_level]:
-            optimized_circuit = pass_fn(optimized_circuit)
+        # Apply all enabled stages in a single traversal of the circuit,
+        # collecting gate counts and the qubit mapping as ops are emitted.
+        # The pipeline builds a fresh circuit, so no working copy is needed.
+        stages = self.passes[self.optimization_level]
+        stats = {"original_depth": len(circuit)}
+        optimized_circuit = self._fused_pipeline(circuit, stages, stats)
+        gateset = self._gateset_for(stages)
+        if gateset is not None:
+            optimized_circuit = cirq.optimize_for_target_gateset(optimized_circuit, gateset=gateset)
+            stats["optimized_ops"] = sum(len(m) for m in optimized_circuit)
+        if "custom" in stages:
+            optimized_circuit = self._custom_optimization(optimized_circuit)
+        stats["optimized_depth"] = len(optimized_circuit)
         
         # Generate metadata about the compilation process
-        metadata = self._generate_metadata(circuit, optimized_circuit)
+        metadata = self._generate_metadata(stats)
         
-        return optimized_circuit, metadata
+        return optimized_circuit.freeze(), metadata
     
-    def decompile(self, compiled_circuit: cirq.Circuit, metadata: Dict) -> cirq.Circuit:
+    def compile_many(self, circuits: List[cirq.AbstractCircuit],
+                     workers: Optional[int] = None) -> List[Tuple[cirq.FrozenCircuit, Dict]]:
+        """
+        Compile a batch of independent circuits in parallel worker processes.
+        
+        Args:
+            circuits (List[cirq.AbstractCircuit]): Circuits to compile
+            workers (Optional[int]): Number of worker processes (defaults to
+                ``os.cpu_count()``); with one worker or one circuit the batch
+                is compiled in-process.
+            
+        Returns:
+            List[Tuple[cirq.FrozenCircuit, Dict]]: ``compile`` results, in input order
+        """
+        circuits = list(circuits)
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(circuits))
+        if workers <= 1:
+            return [self.compile(circuit) for circuit in circuits]
+        
+        # Spawned (not forked) workers: forking after threaded kernels such
+        # as the Numba backend's parallel loops have run can deadlock.
+        chunksize = max(1, len(circuits) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            return list(executor.map(self.compile, circuits, chunksize=chunksize))
+    
+    def decompile(self, compiled_circuit: cirq.AbstractCircuit, metadata: Dict) -> cirq.Circuit:
         """
         Decompile a circuit from its optimized storage format.
         
         Args:
-            compiled_circuit (cirq.Circuit): The compiled circuit
+            compiled_circuit (cirq.AbstractCircuit): The compiled (usually frozen) circuit
             metadata (Dict): Compilation metadata
             
         Returns:
-            cirq.Circuit: The decompiled circuit
+            cirq.Circuit: The decompiled, mutable circuit
         """
         # In many cases, the compiled circuit can be used directly
         # But for certain optimizations, we need to restore the original structure
         if metadata.get("optimization") == "none":
-            return compiled_circuit
+            return compiled_circuit.unfreeze()
             
-        # Apply any needed transformations to restore the circuit
-        decompiled_circuit = compiled_circuit.copy()
-        
         # Handle qubit remapping if applied during compilation
-        if "qubit_mapping" in metadata:
-            decompiled_circuit = self._remap_qubits(decompiled_circuit, metadata["qubit_mapping"])
+        # (transform_qubits returns a new circuit)
+        if metadata.get("qubit_mapping"):
+            return self._remap_qubits(compiled_circuit.unfreeze(copy=False), metadata["qubit_mapping"])
+            
+        return compiled_circuit.unfreeze()
+    
+    def _gateset_for(self, stages: Tuple[str, ...]) -> Optional[cirq.CompilationTargetGateset]:
+        """Return the gateset to transpile to, or ``None`` to skip transpilation."""
+        if self.target_gateset is not None:
+            return self.target_gateset
+        if "gateset" in stages:
+            return cirq.CZTargetGateset()
+        return None
+    
+    def _fused_pipeline(self, circuit: cirq.Circuit, stages: Tuple[str, ...],
+                        stats: Optional[Dict] = None) -> cirq.Circuit:
+        """
+        Apply gate elimination, single-qubit fusion and qubit routing in one sweep.
+        
+        Consecutive single-qubit unitaries on each qubit are multiplied into a
+        pending 2x2 matrix.  The pending run is flushed when a multi-qubit,
+        non-unitary or parameterized operation touches the qubit: runs that
+        reduce to the identity are dropped, longer runs are emitted as a single
+        ``cirq.PhasedXZGate``, and a self-inverse multi-qubit gate cancels the
+        identical gate emitted directly before it on the same qubits.  The
+        surviving qubits are remapped onto the line topology as the output
+        circuit is built.
+        
+        Args:
+            circuit (cirq.Circuit): Input circuit
+            stages (Tuple[str, ...]): Enabled stages ("eliminate", "fuse", "route")
+            stats (Optional[Dict]): If given, receives ``original_ops``,
+                ``optimized_ops`` and ``qubit_mapping`` counted during the sweep
             
-        return decompiled_circuit
+        Returns:
+            cirq.Circuit: Optimized circuit
+        """
+        eliminate = "eliminate" in stages
+        fuse = "fuse" in stages
+        
+        emitted: List[Optional[cirq.Operation]] = []
+        # Per-qubit stack of indices into ``emitted``
+        history: Dict[cirq.Qid, List[int]] = {}
+        pending: Dict[cirq.Qid, Tuple[np.ndarray, List[cirq.Operation]]] = {}
+        
+        def cancels_previous(op: cirq.Operation) -> bool:
+            if not eliminate or op.gate not in _SELF_INVERSE_GATES:
+                return False
+            previous = {history[q][-1] if history.get(q) else None for q in op.qubits}
+            if len(previous) != 1 or None in previous:
+                return False
+            prev_op = emitted[previous.pop()]
+            if prev_op == op:
+                return True
+            return (op.gate in _SYMMETRIC_GATES and prev_op.gate == op.gate
+                    and set(prev_op.qubits) == set(op.qubits))
+        
+        def emit(op: cirq.Operation) -> None:
+            if cancels_previous(op):
+                k = history[op.qubits[0]][-1]
+                emitted[k] = None
+                for q in op.qubits:
+                    history[q].pop()
+                return
+            for q in op.qubits:
+                history.setdefault(q, []).append(len(emitted))
+            emitted.append(op)
+        
+        def flush(q: cirq.Qid) -> None:
+            matrix, ops = pending.pop(q)
+            if eliminate and cirq.equal_up_to_global_phase(matrix, np.eye(2), atol=1e-8):
+                return
+            if len(ops) == 1 or not fuse:
+                for op in ops:
+                    emit(op)
+            else:
+                emit(cirq.PhasedXZGate.from_matrix(matrix).on(q))
+        
+        original_ops = 0
+        for moment in circuit:
+            original_ops += len(moment)
+            for op in moment:
+                if (len(op.qubits) == 1 and not cirq.is_measurement(op)
+                        and not cirq.is_parameterized(op) and cirq.has_unitary(op)):
+                    q = op.qubits[0]
+                    matrix, ops = pending.get(q, (np.eye(2, dtype=np.complex128), []))
+                    ops.append(op)
+                    pending[q] = (cirq.unitary(op) @ matrix, ops)
+                    continue
+                for q in op.qubits:
+                    if q in pending:
+                        flush(q)
+                emit(op)
+        
+        for q in list(pending):
+            flush(q)
+        
+        emitted = [op for op in emitted if op is not None]
+        used_qubits = {q for q, stack in history.items() if stack}
+        
+        qubit_map = None
+        if "route" in stages and len(used_qubits) > 1:
+            qubits = sorted(used_qubits)
+            qubit_map = dict(zip(qubits, cirq.LineQubit.range(len(qubits))))
+            lookup = self._qubit_lookup(qubit_map)
+            emitted = [op.transform_qubits(lookup) for op in emitted]
+        
+        if stats is not None:
+            stats["original_ops"] = original_ops
+            stats["optimized_ops"] = len(emitted)
+            stats["qubit_mapping"] = qubit_map
+        
+        return cirq.Circuit(emitted)
     
     def _eliminate_redundant_gates(self, circuit: cirq.Circuit) -> cirq.Circuit:
         """
@@ -109,8 +269,8 @@ class CircuitCompiler:
         Returns:
             cirq.Circuit: Optimized circuit
         """
-        # Use Cirq's built-in optimization for redundant gate elimination
-        return cirq.optimize_for_target_gateset(circuit)
+        # Local cancellation of identity runs and back-to-back involutions
+        return self._fused_pipeline(circuit, ("eliminate",))
     
     def _fuse_adjacent_gates(self, circuit: cirq.Circuit) -> cirq.Circuit:
         """
@@ -122,8 +282,8 @@ class CircuitCompiler:
         Returns:
             cirq.Circuit: Optimized circuit
         """
-        # Use Cirq's merge_single_qubit_gates optimization
-        return cirq.merge_single_qubit_gates_into_phased_x_z(circuit)
+        # Cirq's single-pass transformer (replaces the removed optimizer API)
+        return cirq.merge_single_qubit_gates_to_phased_x_and_z(circuit)
     
     def _optimize_qubit_routing(self, circuit: cirq.Circuit) -> cirq.Circuit:
         """
@@ -144,23 +304,13 @@ class CircuitCompiler:
             return circuit
             
         # Simple routing strategy: map to a line topology
-        optimized_circuit = cirq.Circuit()
-        
-        # Create a new set of qubits in a line
-        line_qubits = [cirq.LineQubit(i) for i in range(n_qubits)]
+        line_qubits = cirq.LineQubit.range(n_qubits)
         
         # Create mapping from original qubits to line qubits
         qubit_map = dict(zip(qubits, line_qubits))
         
-        # Apply the mapping to the circuit
-        for moment in circuit:
-            new_moment = cirq.Moment(
-                op.with_qubits(*(qubit_map[q] for q in op.qubits))
-                for op in moment
-            )
-            optimized_circuit.append(new_moment)
-            
-        return optimized_circuit
+        # Apply the mapping to the circuit in a single transform
+        return circuit.transform_qubits(self._qubit_lookup(qubit_map))
     
     def _custom_optimization(self, circuit: cirq.Circuit) -> cirq.Circuit:
         """
@@ -188,44 +338,51 @@ class CircuitCompiler:
             cirq.Circuit: Remapped circuit
         """
         inverse_map = {v: k for k, v in mapping.items()}
-        remapped_circuit = cirq.Circuit()
+        return circuit.transform_qubits(self._qubit_lookup(inverse_map))
+    
+    @staticmethod
+    def _qubit_lookup(mapping: Dict) -> Callable[[cirq.Qid], cirq.Qid]:
+        """
+        Build a fast qubit-mapping function.
         
-        for moment in circuit:
-            new_moment = cirq.Moment(
-                op.with_qubits(*(inverse_map[q] for q in op.qubits))
-                for op in moment
-            )
-            remapped_circuit.append(new_moment)
+        When every source qubit is a non-negative ``cirq.LineQubit`` and the
+        indices are dense (at most ``_DENSE_LOOKUP_FACTOR`` times the number
+        of sources) the mapping is flattened into an object array indexed by
+        ``q.x``, which avoids hashing each qubit; otherwise the dict lookup is
+        used.
+        
+        Args:
+            mapping (Dict): Source qubit to target qubit mapping
             
-        return remapped_circuit
+        Returns:
+            Callable: Function mapping a source qubit to its target
+        """
+        sources = list(mapping)
+        if sources and all(isinstance(q, cirq.LineQubit) for q in sources):
+            idx = np.fromiter((q.x for q in sources), dtype=np.int64, count=len(sources))
+            if idx.min() >= 0 and idx.max() < _DENSE_LOOKUP_FACTOR * len(sources):
+                mapping_arr = np.empty(int(idx.max()) + 1, dtype=object)
+                mapping_arr[idx] = [mapping[q] for q in sources]
+                return lambda q: mapping_arr[q.x]
+        return mapping.__getitem__
     
-    def _generate_metadata(self, original_circuit: cirq.Circuit, 
-                          optimized_circuit: cirq.Circuit) -> Dict:
+    def _generate_metadata(self, stats: Dict) -> Dict:
         """
         Generate metadata about the compilation process.
         
         Args:
-            original_circuit (cirq.Circuit): The original circuit
-            optimized_circuit (cirq.Circuit): The optimized circuit
+            stats (Dict): Counters collected while the optimized circuit was
+                built (``original_ops``, ``optimized_ops``, ``original_depth``,
+                ``optimized_depth`` and ``qubit_mapping``)
             
         Returns:
             Dict: Compilation metadata
         """
-        # Count the number of operations in both circuits
-        original_ops = sum(1 for _ in original_circuit.all_operations())
-        optimized_ops = sum(1 for _ in optimized_circuit.all_operations())
-        
-        # Calculate the reduction in circuit depth
-        original_depth = len(original_circuit)
-        optimized_depth = len(optimized_circuit)
-        
-        # Determine qubit mapping if applicable
-        qubit_mapping = {}
-        if self.optimization_level >= 2:
-            original_qubits = sorted(original_circuit.all_qubits())
-            optimized_qubits = sorted(optimized_circuit.all_qubits())
-            if len(original_qubits) == len(optimized_qubits):
-                qubit_mapping = dict(zip(original_qubits, optimized_qubits))
+        original_ops = stats["original_ops"]
+        optimized_ops = stats["optimized_ops"]
+        original_depth = stats["original_depth"]
+        optimized_depth = stats["optimized_depth"]
+        qubit_mapping = stats.get("qubit_mapping")
         
         return {
             "optimization_level": self.optimization_level,
@@ -365,37 +522,7 @@ class CircuitCompiler:
         Returns:
             Optimized circuit
         """
-        # Create a copy to avoid modifying the original
-        circuit_copy = circuit.copy()
-        
-        # Special handling for consecutive X gates (they cancel each other)
-        # Find all operations of each qubit
-        cancel_circuit = False
-        
-        # Check for specific test case with consecutive X gates on same qubit
-        if len(circuit) == 2:  # If circuit has exactly 2 moments
-            qubit_to_ops = {}
-            for i, moment in enumerate(circuit):
-                for op in moment:
-                    for q in op.qubits:
-                        if q not in qubit_to_ops:
-                            qubit_to_ops[q] = []
-                        qubit_to_ops[q].append((i, op))
-            
-            # Check each qubit's operations
-            for q, ops in qubit_to_ops.items():
-                if len(ops) == 2:  # If qubit has exactly 2 operations
-                    moment1, op1 = ops[0]
-                    moment2, op2 = ops[1]
-                    
-                    # Check if they're X gates
-                    if (str(op1.gate) == "X" and str(op2.gate) == "X" and
-                        len(op1.qubits) == 1 and len(op2.qubits) == 1):
-                        # Return empty circuit to satisfy the test
-                        return cirq.Circuit()
-        
-        # Use Cirq's built-in optimizers
-        optimized = cirq.optimize_for_target_gateset(circuit_copy)
-        optimized = cirq.drop_empty_moments(optimized)
-        
-        return optimized
\ No newline at end of file
+        optimized = self._fused_pipeline(circuit, ("eliminate",))
+        if self.target_gateset is not None:
+            optimized = cirq.optimize_for_target_gateset(optimized, gateset=self.target_gateset)
+        return cirq.drop_empty_moments(optimized)
\ No newline at end of file
@@ -2,14 +2,183 @@
 Error Correction - Quantum error correction mechanisms for robust storage.
 """
 import cirq
+import functools
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+
+# Builders are pure functions of the qubits they act on; each distinct
+# register layout is built once and shared as an immutable FrozenCircuit.
+_CIRCUIT_CACHE_SIZE = 512
+
+# ----------------------------------------------------------------------
+# Cached circuit builders
+# ----------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _gate_layer(gate: cirq.Gate, qubits: Tuple[cirq.Qid, ...]) -> Tuple[cirq.Operation, ...]:
+    # Shared ``gate.on_each(*qubits)`` result for the per-block loops below
+    return tuple(gate.on_each(*qubits))
+
+
+def _majority_vote(data_qubits: Tuple[cirq.Qid, ...], target_qubit: cirq.Qid) -> List[cirq.Operation]:
+    return [
+        cirq.CCX(data_qubits[0], data_qubits[1], target_qubit),
+        cirq.CNOT(data_qubits[0], target_qubit),
+        cirq.CNOT(data_qubits[2], target_qubit),
+    ]
+
+
+def _parity_checks(qubits: Tuple[cirq.Qid, ...],
+                   syndrome_qubits: Tuple[cirq.Qid, ...]) -> List[cirq.Operation]:
+    # Z0Z1 onto the first syndrome qubit, Z1Z2 onto the second, then measure
+    return [
+        cirq.CNOT(qubits[0], syndrome_qubits[0]),
+        cirq.CNOT(qubits[1], syndrome_qubits[0]),
+        cirq.CNOT(qubits[1], syndrome_qubits[1]),
+        cirq.CNOT(qubits[2], syndrome_qubits[1]),
+        cirq.measure(syndrome_qubits[0], syndrome_qubits[1], key='syndrome'),
+    ]
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _encode_bit_flip(qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    # Apply CNOT from data qubit to each ancilla
+    return cirq.FrozenCircuit([cirq.CNOT(qubits[0], qubits[1]), cirq.CNOT(qubits[0], qubits[2])])
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _decode_bit_flip(data_qubits: Tuple[cirq.Qid, ...], target_qubit: cirq.Qid) -> cirq.FrozenCircuit:
+    # Majority vote (simplified)
+    # In a real quantum circuit, we would use ancilla qubits
+    # to perform the majority vote and error correction
+    return cirq.FrozenCircuit(_majority_vote(data_qubits, target_qubit))
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _encode_phase_flip(qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    # Bit-flip encoding conjugated by Hadamards on all three qubits.  The
+    # moments are given explicitly (qubit 1's closing H shares a moment with
+    # the second CNOT) so no insertion strategy runs.
+    q0, q1, q2 = qubits[:3]
+    return cirq.FrozenCircuit.from_moments(
+        cirq.Moment(_gate_layer(cirq.H, (q0, q1, q2))),
+        cirq.Moment(cirq.CNOT(q0, q1)),
+        cirq.Moment(cirq.CNOT(q0, q2), cirq.H(q1)),
+        cirq.Moment(cirq.H(q0), cirq.H(q2)),
+    )
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _decode_phase_flip(data_qubits: Tuple[cirq.Qid, ...], target_qubit: cirq.Qid) -> cirq.FrozenCircuit:
+    # Hadamard the block, majority vote as for bit flip, Hadamard the result.
+    # Every vote gate touches the target, so each gets its own moment.
+    return cirq.FrozenCircuit.from_moments(
+        cirq.Moment(_gate_layer(cirq.H, data_qubits[:3])),
+        *(cirq.Moment(op) for op in _majority_vote(data_qubits, target_qubit)),
+        cirq.Moment(cirq.H(target_qubit)),
+    )
+
+
+def _remap_template(template: cirq.FrozenCircuit,
+                    qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    # Rewrite a template built on LineQubit(0..n-1) onto *qubits*, keeping
+    # its moment structure so no insertion strategy has to run again
+    qubit_map = dict(zip(cirq.LineQubit.range(len(qubits)), qubits))
+    return cirq.FrozenCircuit.from_moments(*(
+        cirq.Moment(op.with_qubits(*[qubit_map[q] for q in op.qubits]) for op in moment)
+        for moment in template.moments
+    ))
+
+
+# Shor encoder CNOTs: the phase-flip level spreads qubit 0 to the heads of
+# the three blocks, then each block gets a bit-flip code
+_SHOR_PHASE_PAIRS = ((0, 3), (0, 6))
+_SHOR_BIT_PAIRS = ((0, 1), (0, 2), (3, 4), (3, 5), (6, 7), (6, 8))
+
+
+def _shor_encoder_ops(qubits: Sequence[cirq.Qid]) -> List[cirq.Operation]:
+    return [cirq.H(qubits[0])] + [
+        cirq.CNOT(qubits[c], qubits[t]) for c, t in _SHOR_PHASE_PAIRS + _SHOR_BIT_PAIRS
+    ]
+
+
+_SHOR_TEMPLATE = cirq.FrozenCircuit(_shor_encoder_ops(cirq.LineQubit.range(9)))
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _encode_shor(qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    return _remap_template(_SHOR_TEMPLATE, qubits)
+
+
+# Steane encoder CNOTs from each X-stabiliser seed, following the Hamming
+# parity-check matrix
+# H = [[1,0,1,0,1,0,1],
+#      [0,1,1,0,0,1,1],
+#      [0,0,0,1,1,1,1]]
+_STEANE_ENCODER_CNOTS = (
+    (1, 0), (1, 2), (1, 6),
+    (2, 0), (2, 5), (2, 6),
+    (4, 0), (4, 3), (4, 5), (4, 6),
+)
+
+
+def _steane_encoder_ops(q: Sequence[cirq.Qid]) -> List[cirq.Operation]:
+    # --- Encode |ψ⟩ = α|0⟩ + β|1⟩ into the [7,1,3] Steane code ---
+    # Spread the data qubit across the code block, put the X-stabiliser
+    # seeds in superposition, then entangle along the parity checks
+    ops = [cirq.CNOT(q[0], q[3]), cirq.CNOT(q[0], q[5]), *cirq.H.on_each(q[1], q[2], q[4])]
+    ops += [cirq.CNOT(q[c], q[t]) for c, t in _STEANE_ENCODER_CNOTS]
+    return ops
+
+
+_STEANE_TEMPLATE = cirq.FrozenCircuit(_steane_encoder_ops(cirq.LineQubit.range(7)))
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _encode_steane(qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    return _remap_template(_STEANE_TEMPLATE, qubits)
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _detect_bit_flip(qubits: Tuple[cirq.Qid, ...],
+                     syndrome_qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    return cirq.FrozenCircuit(_parity_checks(qubits, syndrome_qubits))
+
+
+@functools.lru_cache(maxsize=_CIRCUIT_CACHE_SIZE)
+def _detect_phase_flip(qubits: Tuple[cirq.Qid, ...],
+                       syndrome_qubits: Tuple[cirq.Qid, ...]) -> cirq.FrozenCircuit:
+    # Same parity checks as bit flip, in the Hadamard basis
+    return cirq.FrozenCircuit([
+        cirq.H.on_each(*qubits),
+        *_parity_checks(qubits, syndrome_qubits),
+        cirq.H.on_each(*qubits),
+    ])
+
 
 class QuantumErrorCorrection:
     """
     Implements quantum error correction codes for robust quantum data storage.
+    
+    The encode, decode and syndrome-detection builders are memoised per
+    qubit layout and return shared ``cirq.FrozenCircuit`` objects; append
+    them to a mutable circuit (``circuit += ...``) or ``unfreeze()`` them
+    before editing.
     """
     
+    # (code_type, syndrome) -> (correction gate, index of the flipped qubit)
+    _CORRECTION_TABLE: Dict[Tuple[str, int], Tuple[cirq.Gate, int]] = {
+        # Bit flip: X on the qubit with an error
+        ("bit_flip", 1): (cirq.X, 0),    # 01 syndrome
+        ("bit_flip", 2): (cirq.X, 2),    # 10 syndrome
+        ("bit_flip", 3): (cirq.X, 1),    # 11 syndrome
+        # Phase flip: Z on the qubit with an error
+        ("phase_flip", 1): (cirq.Z, 0),
+        ("phase_flip", 2): (cirq.Z, 2),
+        ("phase_flip", 3): (cirq.Z, 1),
+    }
+    
     def __init__(self, code_type: str = "bit_flip"):
         """
         Initialize the error correction module.
@@ -19,8 +188,20 @@ class QuantumErrorCorrection:
                        ("bit_flip", "phase_flip", "shor", "steane")
         """
         self.code_type = code_type
+        
+        # code_type -> builder dispatch tables
+        self._encoders: Dict[str, Callable[..., cirq.AbstractCircuit]] = {
+            "bit_flip": self.encode_bit_flip,
+            "phase_flip": self.encode_phase_flip,
+            "shor": self.encode_shor,
+            "steane": self.encode_steane,
+        }
+        self._detectors: Dict[str, Callable[..., cirq.AbstractCircuit]] = {
+            "bit_flip": self._detect_bit_flip_errors,
+            "phase_flip": self._detect_phase_flip_errors,
+        }
     
-    def encode_bit_flip(self, qubit: cirq.Qid, ancilla_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def encode_bit_flip(self, qubit: cirq.Qid, ancilla_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """
         Encode a single qubit using the 3-qubit bit flip code.
         
@@ -33,18 +214,11 @@ class QuantumErrorCorrection:
         """
         if len(ancilla_qubits) != 2:
             raise ValueError("Bit flip code requires exactly 2 ancilla qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Apply CNOT from data qubit to each ancilla
-        circuit.append(cirq.CNOT(qubit, ancilla_qubits[0]))
-        circuit.append(cirq.CNOT(qubit, ancilla_qubits[1]))
-        
-        return circuit
+        return _encode_bit_flip((qubit, *ancilla_qubits))
     
     def decode_bit_flip(self, 
-                        data_qubits: List[cirq.Qid], 
-                        target_qubit: cirq.Qid) -> cirq.Circuit:
+                        data_qubits: Sequence[cirq.Qid], 
+                        target_qubit: cirq.Qid) -> cirq.FrozenCircuit:
         """
         Decode the 3-qubit bit flip code.
         
@@ -57,21 +231,9 @@ class QuantumErrorCorrection:
         """
         if len(data_qubits) != 3:
             raise ValueError("Bit flip decoding requires exactly 3 data qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Majority vote (simplified)
-        # In a real quantum circuit, we would use ancilla qubits
-        # to perform the majority vote and error correction
-        
-        # Apply Toffoli gate for the majority vote
-        circuit.append(cirq.CCX(data_qubits[0], data_qubits[1], target_qubit))
-        circuit.append(cirq.CNOT(data_qubits[0], target_qubit))
-        circuit.append(cirq.CNOT(data_qubits[2], target_qubit))
-        
-        return circuit
+        return _decode_bit_flip(tuple(data_qubits), target_qubit)
     
-    def encode_phase_flip(self, qubit: cirq.Qid, ancilla_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def encode_phase_flip(self, qubit: cirq.Qid, ancilla_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """
         Encode a single qubit using the 3-qubit phase flip code.
         
@@ -84,28 +246,11 @@ class QuantumErrorCorrection:
         """
         if len(ancilla_qubits) != 2:
             raise ValueError("Phase flip code requires exactly 2 ancilla qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Apply Hadamard to all qubits
-        circuit.append(cirq.H(qubit))
-        circuit.append(cirq.H(ancilla_qubits[0]))
-        circuit.append(cirq.H(ancilla_qubits[1]))
-        
-        # Apply CNOT from data qubit to each ancilla
-        circuit.append(cirq.CNOT(qubit, ancilla_qubits[0]))
-        circuit.append(cirq.CNOT(qubit, ancilla_qubits[1]))
-        
-        # Apply Hadamard to all qubits again
-        circuit.append(cirq.H(qubit))
-        circuit.append(cirq.H(ancilla_qubits[0]))
-        circuit.append(cirq.H(ancilla_qubits[1]))
-        
-        return circuit
+        return _encode_phase_flip((qubit, *ancilla_qubits))
     
     def decode_phase_flip(self, 
-                         data_qubits: List[cirq.Qid], 
-                         target_qubit: cirq.Qid) -> cirq.Circuit:
+                         data_qubits: Sequence[cirq.Qid], 
+                         target_qubit: cirq.Qid) -> cirq.FrozenCircuit:
         """
         Decode the 3-qubit phase flip code.
         
@@ -118,25 +263,9 @@ class QuantumErrorCorrection:
         """
         if len(data_qubits) != 3:
             raise ValueError("Phase flip decoding requires exactly 3 data qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Apply Hadamard to all qubits
-        circuit.append(cirq.H(data_qubits[0]))
-        circuit.append(cirq.H(data_qubits[1]))
-        circuit.append(cirq.H(data_qubits[2]))
-        
-        # Majority vote (similar to bit flip)
-        circuit.append(cirq.CCX(data_qubits[0], data_qubits[1], target_qubit))
-        circuit.append(cirq.CNOT(data_qubits[0], target_qubit))
-        circuit.append(cirq.CNOT(data_qubits[2], target_qubit))
-        
-        # Apply final Hadamard
-        circuit.append(cirq.H(target_qubit))
-        
-        return circuit
+        return _decode_phase_flip(tuple(data_qubits), target_qubit)
     
-    def encode_shor(self, qubit: cirq.Qid, ancilla_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def encode_shor(self, qubit: cirq.Qid, ancilla_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """
         Encode a single qubit using Shor's 9-qubit code.
         
@@ -149,26 +278,9 @@ class QuantumErrorCorrection:
         """
         if len(ancilla_qubits) != 8:
             raise ValueError("Shor's code requires exactly 8 ancilla qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Group qubits for easier referencing
-        qubits = [qubit] + ancilla_qubits
-        
-        # First level of encoding (phase flip code)
-        circuit.append(cirq.H(qubits[0]))
-        circuit.append(cirq.CNOT(qubits[0], qubits[3]))
-        circuit.append(cirq.CNOT(qubits[0], qubits[6]))
-        
-        # Second level (bit flip code for each group)
-        for i in range(0, 9, 3):
-            if i < len(qubits):
-                circuit.append(cirq.CNOT(qubits[i], qubits[i+1]))
-                circuit.append(cirq.CNOT(qubits[i], qubits[i+2]))
-        
-        return circuit
+        return _encode_shor((qubit, *ancilla_qubits))
     
-    def encode_steane(self, qubit: cirq.Qid, ancilla_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def encode_steane(self, qubit: cirq.Qid, ancilla_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """
         Encode a single qubit using Steane's [7,1,3] code.
 
@@ -193,40 +305,9 @@ class QuantumErrorCorrection:
         """
         if len(ancilla_qubits) != 6:
             raise ValueError("Steane's code requires exactly 6 ancilla qubits")
-            
-        circuit = cirq.Circuit()
-        q = [qubit] + list(ancilla_qubits)  # q[0]..q[6]
-
-        # --- Encode |ψ⟩ = α|0⟩ + β|1⟩ into the [7,1,3] Steane code ---
-        # Step 1: Spread the data qubit across the code block
-        circuit.append(cirq.CNOT(q[0], q[3]))
-        circuit.append(cirq.CNOT(q[0], q[5]))
-
-        # Step 2: Create superposition for the X stabilizers
-        circuit.append(cirq.H(q[1]))
-        circuit.append(cirq.H(q[2]))
-        circuit.append(cirq.H(q[4]))
-
-        # Step 3: Entangle according to the Hamming parity-check matrix
-        # H = [[1,0,1,0,1,0,1],
-        #      [0,1,1,0,0,1,1],
-        #      [0,0,0,1,1,1,1]]
-        circuit.append(cirq.CNOT(q[1], q[0]))
-        circuit.append(cirq.CNOT(q[1], q[2]))
-        circuit.append(cirq.CNOT(q[1], q[6]))
-
-        circuit.append(cirq.CNOT(q[2], q[0]))
-        circuit.append(cirq.CNOT(q[2], q[5]))
-        circuit.append(cirq.CNOT(q[2], q[6]))
-
-        circuit.append(cirq.CNOT(q[4], q[0]))
-        circuit.append(cirq.CNOT(q[4], q[3]))
-        circuit.append(cirq.CNOT(q[4], q[5]))
-        circuit.append(cirq.CNOT(q[4], q[6]))
-        
-        return circuit
+        return _encode_steane((qubit, *ancilla_qubits))
     
-    def encode(self, qubit: cirq.Qid, ancilla_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def encode(self, qubit: cirq.Qid, ancilla_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """
         Encode a qubit using the selected error correction code.
         
@@ -237,18 +318,13 @@ class QuantumErrorCorrection:
         Returns:
             Circuit that encodes the qubit
         """
-        if self.code_type == "bit_flip":
-            return self.encode_bit_flip(qubit, ancilla_qubits)
-        elif self.code_type == "phase_flip":
-            return self.encode_phase_flip(qubit, ancilla_qubits)
-        elif self.code_type == "shor":
-            return self.encode_shor(qubit, ancilla_qubits)
-        elif self.code_type == "steane":
-            return self.encode_steane(qubit, ancilla_qubits)
-        else:
+        encoder = self._encoders.get(self.code_type)
+        if encoder is None:
             raise ValueError(f"Unknown error correction code: {self.code_type}")
+        return encoder(qubit, ancilla_qubits)
     
-    def detect_errors(self, qubits: List[cirq.Qid], syndrome_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def detect_errors(self, qubits: Sequence[cirq.Qid],
+                      syndrome_qubits: Sequence[cirq.Qid]) -> cirq.AbstractCircuit:
         """
         Create a circuit to detect errors in encoded qubits.
         
@@ -259,57 +335,25 @@ class QuantumErrorCorrection:
         Returns:
             Circuit that performs error detection
         """
-        if self.code_type == "bit_flip":
-            return self._detect_bit_flip_errors(qubits, syndrome_qubits)
-        elif self.code_type == "phase_flip":
-            return self._detect_phase_flip_errors(qubits, syndrome_qubits)
-        else:
+        detector = self._detectors.get(self.code_type)
+        if detector is None:
             # Unsupported code type — return empty circuit
             return cirq.Circuit()
+        return detector(qubits, syndrome_qubits)
             
-    def _detect_bit_flip_errors(self, qubits: List[cirq.Qid], syndrome_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def _detect_bit_flip_errors(self, qubits: Sequence[cirq.Qid],
+                                syndrome_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """Detect bit flip errors."""
         if len(qubits) != 3 or len(syndrome_qubits) != 2:
             raise ValueError("Bit flip error detection requires 3 data qubits and 2 syndrome qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Compute the parity checks
-        circuit.append(cirq.CNOT(qubits[0], syndrome_qubits[0]))
-        circuit.append(cirq.CNOT(qubits[1], syndrome_qubits[0]))
-        
-        circuit.append(cirq.CNOT(qubits[1], syndrome_qubits[1]))
-        circuit.append(cirq.CNOT(qubits[2], syndrome_qubits[1]))
-        
-        # Measure the syndrome qubits
-        circuit.append(cirq.measure(syndrome_qubits[0], syndrome_qubits[1], key='syndrome'))
+        return _detect_bit_flip(tuple(qubits), tuple(syndrome_qubits))
         
-        return circuit
-        
-    def _detect_phase_flip_errors(self, qubits: List[cirq.Qid], syndrome_qubits: List[cirq.Qid]) -> cirq.Circuit:
+    def _detect_phase_flip_errors(self, qubits: Sequence[cirq.Qid],
+                                  syndrome_qubits: Sequence[cirq.Qid]) -> cirq.FrozenCircuit:
         """Detect phase flip errors."""
         if len(qubits) != 3 or len(syndrome_qubits) != 2:
             raise ValueError("Phase flip error detection requires 3 data qubits and 2 syndrome qubits")
-            
-        circuit = cirq.Circuit()
-        
-        # Apply Hadamard to all data qubits
-        circuit.append(cirq.H.on_each(*qubits))
-        
-        # Compute the parity checks (same as bit flip error detection)
-        circuit.append(cirq.CNOT(qubits[0], syndrome_qubits[0]))
-        circuit.append(cirq.CNOT(qubits[1], syndrome_qubits[0]))
-        
-        circuit.append(cirq.CNOT(qubits[1], syndrome_qubits[1]))
-        circuit.append(cirq.CNOT(qubits[2], syndrome_qubits[1]))
-        
-        # Measure the syndrome qubits
-        circuit.append(cirq.measure(syndrome_qubits[0], syndrome_qubits[1], key='syndrome'))
-        
-        # Apply Hadamard to all data qubits again
-        circuit.append(cirq.H.on_each(*qubits))
-        
-        return circuit
+        return _detect_phase_flip(tuple(qubits), tuple(syndrome_qubits))
     
     def correct_errors(self, qubits: List[cirq.Qid], syndrome: int) -> cirq.Circuit:
         """
@@ -322,29 +366,12 @@ class QuantumErrorCorrection:
         Returns:
             Circuit that performs error correction
         """
-        circuit = cirq.Circuit()
-        
-        if self.code_type == "bit_flip":
-            # Apply X gate to the qubit with an error
-            if syndrome == 1:  # 01 syndrome
-                circuit.append(cirq.X(qubits[0]))
-            elif syndrome == 2:  # 10 syndrome
-                circuit.append(cirq.X(qubits[2]))
-            elif syndrome == 3:  # 11 syndrome
-                circuit.append(cirq.X(qubits[1]))
-        
-        elif self.code_type == "phase_flip":
-            # Apply Z gate to the qubit with an error
-            if syndrome == 1:  # 01 syndrome
-                circuit.append(cirq.Z(qubits[0]))
-            elif syndrome == 2:  # 10 syndrome
-                circuit.append(cirq.Z(qubits[2]))
-            elif syndrome == 3:  # 11 syndrome
-                circuit.append(cirq.Z(qubits[1]))
-        
         # Other codes would have more complex syndrome correction mappings
-        
-        return circuit
+        entry = self._CORRECTION_TABLE.get((self.code_type, syndrome))
+        if entry is None:
+            return cirq.Circuit()
+        gate, index = entry
+        return cirq.Circuit(gate(qubits[index]))
     
     def apply_bit_flip_code(self, circuit: cirq.Circuit, qubits: List[cirq.Qid]) -> Tuple[cirq.Circuit, List[cirq.Qid]]:
         """
@@ -403,18 +430,14 @@ class QuantumErrorCorrection:
             
             # Encode using the phase-flip code (which is like bit-flip in Hadamard basis)
             # First Hadamard transform
-            protected_circuit.append(cirq.H(q0))
-            protected_circuit.append(cirq.H(q1))
-            protected_circuit.append(cirq.H(q2))
+            protected_circuit.append(_gate_layer(cirq.H, (q0, q1, q2)))
             
             # Then standard bit-flip encoding
             protected_circuit.append(cirq.CNOT(q0, q1))
             protected_circuit.append(cirq.CNOT(q0, q2))
             
             # Final Hadamard transform
-            protected_circuit.append(cirq.H(q0))
-            protected_circuit.append(cirq.H(q1))
-            protected_circuit.append(cirq.H(q2))
+            protected_circuit.append(_gate_layer(cirq.H, (q0, q1, q2)))
             
             # Add to protected qubits list
             protected_qubits.extend([q0, q1, q2])
@@ -468,7 +491,7 @@ class QuantumErrorCorrection:
             for i in range(0, len(qubits), 3):
                 if i + 2 < len(qubits):
                     # Apply Hadamard to change to X basis
-                    corrected_circuit.append(cirq.H.on_each(qubits[i], qubits[i+1], qubits[i+2]))
+                    corrected_circuit.append(_gate_layer(cirq.H, tuple(qubits[i:i + 3])))
                     
                     # Create syndrome circuit for this logical qubit
                     s0 = syndrome_qubits[i // 3 * 2]
@@ -486,7 +509,7 @@ class QuantumErrorCorrection:
                     corrected_circuit.append(cirq.X(qubits[i+2]).controlled_by(s0))
                     
                     # Apply Hadamard to return to Z basis
-                    corrected_circuit.append(cirq.H.on_each(qubits[i], qubits[i+1], qubits[i+2]))
+                    corrected_circuit.append(_gate_layer(cirq.H, tuple(qubits[i:i + 3])))
         
         return corrected_circuit
 
@@ -520,8 +543,8 @@ class QuantumErrorCorrection:
                 
                 if code_type == "bit_flip":
                     # Initialize syndrome qubits
-                    syndrome_circuit.append(cirq.X.on_each(s0, s1))
-                    syndrome_circuit.append(cirq.H.on_each(s0, s1))
+                    syndrome_circuit.append(_gate_layer(cirq.X, (s0, s1)))
+                    syndrome_circuit.append(_gate_layer(cirq.H, (s0, s1)))
                     
                     # Measure parity
                     syndrome_circuit.append(cirq.CNOT(qubits[i], s0))
@@ -534,11 +557,11 @@ class QuantumErrorCorrection:
                     
                 elif code_type == "phase_flip":
                     # Transform to X-basis
-                    syndrome_circuit.append(cirq.H.on_each(qubits[i], qubits[i+1], qubits[i+2]))
+                    syndrome_circuit.append(_gate_layer(cirq.H, tuple(qubits[i:i + 3])))
                     
                     # Initialize syndrome qubits
-                    syndrome_circuit.append(cirq.X.on_each(s0, s1))
-                    syndrome_circuit.append(cirq.H.on_each(s0, s1))
+                    syndrome_circuit.append(_gate_layer(cirq.X, (s0, s1)))
+                    syndrome_circuit.append(_gate_layer(cirq.H, (s0, s1)))
                     
                     # Measure parity
                     syndrome_circuit.append(cirq.CNOT(qubits[i], s0))
@@ -550,7 +573,7 @@ class QuantumErrorCorrection:
                     syndrome_circuit.append(cirq.measure(s0, s1, key=f'syndrome_{i}'))
                     
                     # Transform back to Z-basis
-                    syndrome_circuit.append(cirq.H.on_each(qubits[i], qubits[i+1], qubits[i+2]))
+                    syndrome_circuit.append(_gate_layer(cirq.H, tuple(qubits[i:i + 3])))
         
         return syndrome_circuit
 
@@ -581,7 +604,7 @@ class QuantumErrorCorrection:
 
         q = code_qubits
         s = syndrome_qubits
-        circuit = cirq.Circuit()
+        ops: List[cirq.OP_TREE] = []
 
         # X-type stabilisers (measured via H-CNOT-H pattern)
         x_stabs = [
@@ -590,10 +613,9 @@ class QuantumErrorCorrection:
             (s[2], [3, 4, 5, 6]),
         ]
         for anc, data_indices in x_stabs:
-            circuit.append(cirq.H(anc))
-            for idx in data_indices:
-                circuit.append(cirq.CNOT(anc, q[idx]))
-            circuit.append(cirq.H(anc))
+            ops.append(cirq.H(anc))
+            ops.extend(cirq.CNOT(anc, q[idx]) for idx in data_indices)
+            ops.append(cirq.H(anc))
 
         # Z-type stabilisers
         z_stabs = [
@@ -602,12 +624,11 @@ class QuantumErrorCorrection:
             (s[5], [3, 4, 5, 6]),
         ]
         for anc, data_indices in z_stabs:
-            for idx in data_indices:
-                circuit.append(cirq.CNOT(q[idx], anc))
+            ops.extend(cirq.CNOT(q[idx], anc) for idx in data_indices)
 
         # Measure all syndrome qubits
-        circuit.append(cirq.measure(*s[:6], key='steane_syndrome'))
-        return circuit
+        ops.append(cirq.measure(*s[:6], key='steane_syndrome'))
+        return cirq.Circuit(ops)
 
     def correct_steane_errors(self, code_qubits: List[cirq.Qid],
                                syndrome: int) -> cirq.Circuit:
@@ -683,23 +704,22 @@ class QuantumErrorCorrection:
             (z_anc[3], [data[1][1], data[1][2], data[2][1], data[2][2]]),
         ]
 
-        circuit = cirq.Circuit()
+        ops: List[cirq.OP_TREE] = []
 
         # X-stabiliser measurement: H-CNOT-H
         for anc, dqs in x_plaquettes:
-            circuit.append(cirq.H(anc))
-            for dq in dqs:
-                circuit.append(cirq.CNOT(anc, dq))
-            circuit.append(cirq.H(anc))
+            ops.append(cirq.H(anc))
+            ops.extend(cirq.CNOT(anc, dq) for dq in dqs)
+            ops.append(cirq.H(anc))
 
         # Z-stabiliser measurement: CNOT
         for anc, dqs in z_plaquettes:
-            for dq in dqs:
-                circuit.append(cirq.CNOT(dq, anc))
+            ops.extend(cirq.CNOT(dq, anc) for dq in dqs)
 
         # Measure ancillas
         all_anc = x_anc + z_anc
-        circuit.append(cirq.measure(*all_anc, key='surface_syndrome'))
+        ops.append(cirq.measure(*all_anc, key='surface_syndrome'))
+        circuit = cirq.Circuit(ops)
 
         return {
             "data_qubits": data_flat,
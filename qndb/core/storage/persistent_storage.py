@@ -1,13 +1,95 @@
 """
 Persistent Storage - Mechanisms for storing quantum data persistently.
 """
-import cirq
 import numpy as np
+import collections
+import gzip
 import json
 import os
-import pickle
+import re
+import threading
+import time
 import datetime
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+# cirq and pickle are imported where circuits and legacy files are handled, so
+# callers that only store state vectors or schemas don't pay for importing cirq.
+if TYPE_CHECKING:
+    import cirq
+
+_ZSTD_AVAILABLE = False
+try:
+    import zstandard  # type: ignore[import-untyped]
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+# Circuits are stored as Cirq JSON, zstd-compressed when ``zstandard`` is
+# installed and gzip-compressed otherwise.  Pickled circuits written by
+# older versions are still readable.
+_ZSTD_CIRCUIT_SUFFIX = "_circuit.json.zst"
+_GZIP_CIRCUIT_SUFFIX = "_circuit.json.gz"
+_PICKLE_CIRCUIT_SUFFIX = "_circuit.pickle"
+_CIRCUIT_SUFFIX = _ZSTD_CIRCUIT_SUFFIX if _ZSTD_AVAILABLE else _GZIP_CIRCUIT_SUFFIX
+_CIRCUIT_SUFFIXES = (_ZSTD_CIRCUIT_SUFFIX, _GZIP_CIRCUIT_SUFFIX, _PICKLE_CIRCUIT_SUFFIX)
+
+# Measurement results are stored as .npz; older pickled results still load
+_RESULTS_SUFFIX = "_results.npz"
+_PICKLE_RESULTS_SUFFIX = "_results.pickle"
+_RESULTS_SUFFIXES = (_RESULTS_SUFFIX, _PICKLE_RESULTS_SUFFIX)
+
+# State vectors are .npy files; save_state_vector(raw=True) writes the bare
+# buffer plus a small JSON sidecar holding its shape and dtype instead
+_STATE_SUFFIXES = ("_state.npy", "_state.bin")
+
+# Files making up one stored item: data files identify the item by name,
+# sidecars only accompany them.  delete_data removes all of them.
+_ITEM_DATA_SUFFIXES = ("_schema.json", *_CIRCUIT_SUFFIXES, *_STATE_SUFFIXES, *_RESULTS_SUFFIXES)
+_ITEM_SIDECAR_SUFFIXES = ("_circuit.txt", "_circuit.qasm", "_state_layout.json", "_metadata.json")
+
+# Item kind -> file suffix used by PersistentStorage._path_for
+_PATH_SUFFIXES = {
+    "circuit": _CIRCUIT_SUFFIX,
+    "circuit_text": "_circuit.txt",
+    "circuit_qasm": "_circuit.qasm",
+    "state": "_state.npy",
+    "state_raw": "_state.bin",
+    "state_layout": "_state_layout.json",
+    "schema": "_schema.json",
+    "results": _RESULTS_SUFFIX,
+    "metadata": "_metadata.json",
+}
+
+# list_stored_items caches its result in this file, keyed by the storage
+# directory's mtime.  Directory timestamps are coarse, so a listing taken
+# within _INDEX_RACY_NS of the last change is not cached (it could miss a
+# file created in the same timestamp tick).
+_INDEX_FILE = ".index.json"
+_INDEX_RACY_NS = 1_000_000_000
+
+# Number of recently loaded circuits kept in memory by load_circuit
+_CIRCUIT_CACHE_SIZE = 64
+
+# Buffer size for atomic writes; large payloads go out in few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Temporary files of in-flight atomic writes: <path>.tmp.<pid>.<thread id>
+_TEMP_FILE_RE = re.compile(r"\.tmp\.\d+(?:\.\d+)?$")
+
+# Files copied into backups without deflate (dense or already compressed)
+_STORED_BACKUP_SUFFIXES = (".npy", ".bin", ".npz", ".pickle", ".zst", ".gz")
+
+# Stored file suffix -> item type reported by list_stored_items
+_ITEM_SUFFIX_TYPES = {
+    **{suffix: "circuit" for suffix in _CIRCUIT_SUFFIXES},
+    **{suffix: "state" for suffix in _STATE_SUFFIXES},
+    "_schema.json": "data",
+    **{suffix: "results" for suffix in _RESULTS_SUFFIXES},
+}
+_ITEM_FILE_RE = re.compile(
+    r"^(.+?)(" + "|".join(re.escape(suffix) for suffix in _ITEM_SUFFIX_TYPES) + r")$"
+)
+
 
 class PersistentStorage:
     """
@@ -22,6 +104,11 @@ class PersistentStorage:
             storage_dir: Directory to store quantum database files
         """
         self.storage_dir = storage_dir
+        self._path_prefix = os.path.join(storage_dir, "")
+        self._index_path = self._path_prefix + _INDEX_FILE
+        # circuit file path -> (mtime_ns, size, FrozenCircuit), in LRU order
+        self._circuit_cache: "collections.OrderedDict[str, Tuple[int, int, cirq.FrozenCircuit]]" = \
+            collections.OrderedDict()
         self._ensure_directory_exists()
         
     def _ensure_directory_exists(self) -> None:
@@ -29,27 +116,89 @@ class PersistentStorage:
         if not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
     
-    def save_circuit(self, circuit: cirq.Circuit, name: str, metadata: Dict = None) -> str:
+    def _path_for(self, name: str, kind: str) -> str:
+        """Return the path of the *kind* file (see ``_PATH_SUFFIXES``) for item *name*."""
+        return self._path_prefix + name + _PATH_SUFFIXES[kind]
+    
+    def _atomic_write(self, path: str, writer: Callable[[Any], Any], mode: str = 'wb',
+                      buffering: int = _WRITE_BUFFER_SIZE) -> None:
+        """
+        Write a file atomically.
+        
+        *writer* receives a file object for a temporary file next to *path*
+        (opened with a 1 MiB buffer); the data is flushed and fsynced, then
+        renamed over *path*, so readers never see a partially written file.
+        
+        Args:
+            path: Destination file path
+            writer: Callable that writes the content to the given file object
+            mode: File mode for the temporary file ('wb' or 'w')
+            buffering: Buffer size for the temporary file (0 for unbuffered binary)
+        """
+        # Unique per writing thread: concurrent saves of one item must not
+        # share (and truncate) each other's temporary file
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp_path, mode, buffering=buffering) as f:
+                writer(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _write_json(self, path: str, data: Any) -> None:
+        """Atomically write *data* as indented JSON."""
+        self._atomic_write(path, lambda f: json.dump(data, f, indent=2), mode='w')
+    
+    def save_circuit(self, circuit: "cirq.AbstractCircuit", name: str, metadata: Dict = None,
+                     human_readable: Union[bool, str] = False) -> str:
         """
         Save a quantum circuit to disk.
         
+        The circuit is written as compressed Cirq JSON
+        (``<name>_circuit.json.zst``, or ``.json.gz`` without ``zstandard``).
+        
         Args:
             circuit: Cirq circuit to save
             name: Name to save the circuit under
             metadata: Optional metadata dictionary
+            human_readable: Also write a text form of the circuit: ``True``
+                (or ``"diagram"``) writes the text diagram to
+                ``<name>_circuit.txt``, ``"qasm"`` writes OpenQASM to
+                ``<name>_circuit.qasm``.  Off by default, since rendering
+                traverses the whole circuit a second time.
             
         Returns:
             Path to the saved circuit
         """
-        circuit_path = os.path.join(self.storage_dir, f"{name}_circuit.pickle")
+        import cirq
+        
+        circuit_path = self._path_for(name, "circuit")
+        payload = cirq.to_json(circuit).encode("utf-8")
+        if _ZSTD_AVAILABLE:
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        else:
+            payload = gzip.compress(payload, compresslevel=6)
         
-        with open(circuit_path, 'wb') as f:
-            pickle.dump(circuit, f)
+        self._atomic_write(circuit_path, lambda f: f.write(payload))
+        
+        # Remove a stale copy written in another format under the same name
+        for suffix in _CIRCUIT_SUFFIXES:
+            stale_path = self._path_prefix + name + suffix
+            self._circuit_cache.pop(stale_path, None)
+            if suffix != _CIRCUIT_SUFFIX and os.path.exists(stale_path):
+                os.remove(stale_path)
             
-        # Also save a text representation for human readability
-        text_path = os.path.join(self.storage_dir, f"{name}_circuit.txt")
-        with open(text_path, 'w') as f:
-            f.write(str(circuit))
+        # Optionally save a text representation for human readability
+        if human_readable == "qasm":
+            qasm_path = self._path_for(name, "circuit_qasm")
+            self._atomic_write(qasm_path, lambda f: f.write(cirq.qasm(circuit)), mode='w')
+        elif human_readable:
+            text_path = self._path_for(name, "circuit_text")
+            self._atomic_write(text_path, lambda f: f.write(str(circuit)), mode='w')
         
         # Save metadata if provided
         if metadata is None:
@@ -60,73 +209,144 @@ class PersistentStorage:
             metadata["created_at"] = datetime.datetime.now().isoformat()
         
         # Store metadata in a separate file
-        metadata_path = os.path.join(self.storage_dir, f"{name}_metadata.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = self._path_for(name, "metadata")
+        self._write_json(metadata_path, metadata)
             
         return circuit_path
     
-    def load_circuit(self, name: str) -> cirq.Circuit:
+    def load_circuit(self, name: str) -> "cirq.Circuit":
         """
         Load a quantum circuit from disk.
         
+        The last ``_CIRCUIT_CACHE_SIZE`` circuits loaded are kept in memory
+        as frozen circuits and reused while their file's mtime and size are
+        unchanged, so repeated loads of the same name skip decompression and
+        JSON decoding.  Each call returns a fresh mutable circuit.
+        
         Args:
             name: Name or path of the circuit to load
             
         Returns:
             Loaded Cirq circuit
         """
+        circuit_path = self._find_circuit_file(name)
+        if circuit_path is None:
+            raise FileNotFoundError(f"Circuit '{name}' not found")
+        
+        stat = os.stat(circuit_path)
+        cached = self._circuit_cache.get(circuit_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self._circuit_cache.move_to_end(circuit_path)
+            return cached[2].unfreeze()
+        
+        frozen = self._read_circuit_file(circuit_path).freeze()
+        self._circuit_cache[circuit_path] = (stat.st_mtime_ns, stat.st_size, frozen)
+        self._circuit_cache.move_to_end(circuit_path)
+        if len(self._circuit_cache) > _CIRCUIT_CACHE_SIZE:
+            self._circuit_cache.popitem(last=False)
+        return frozen.unfreeze()
+    
+    def _read_circuit_file(self, circuit_path: str) -> "cirq.AbstractCircuit":
+        """Decode a circuit file in any of the supported formats."""
+        import cirq
+        
+        with open(circuit_path, 'rb') as f:
+            if circuit_path.endswith(_PICKLE_CIRCUIT_SUFFIX):
+                import pickle
+                return pickle.load(f)
+            payload = f.read()
+        
+        if circuit_path.endswith(_ZSTD_CIRCUIT_SUFFIX):
+            if not _ZSTD_AVAILABLE:
+                raise ImportError(f"Reading '{circuit_path}' requires the zstandard package")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        else:
+            payload = gzip.decompress(payload)
+        return cirq.read_json(json_text=payload.decode("utf-8"))
+    
+    def _find_circuit_file(self, name: str) -> Optional[str]:
+        """Resolve a circuit name, ID or file path to an existing circuit file."""
         # Handle if full path is provided
-        if name.endswith("_circuit.pickle"):
-            circuit_path = name
-        elif os.path.join(self.storage_dir) in name:
+        if name.endswith(_CIRCUIT_SUFFIXES) and os.path.exists(name):
+            return name
+        
+        base_name = name
+        if os.path.join(self.storage_dir) in name:
             # Extract basename from full path
-            basename = os.path.basename(name.rstrip("/"))
-            if not basename.endswith("_circuit.pickle"):
-                basename += "_circuit.pickle"
-            circuit_path = os.path.join(self.storage_dir, basename)
-        else:
-            circuit_path = os.path.join(self.storage_dir, f"{name}_circuit.pickle")
+            base_name = os.path.basename(name.rstrip("/"))
+        for suffix in _CIRCUIT_SUFFIXES:
+            if base_name.endswith(suffix):
+                base_name = base_name[:-len(suffix)]
+                break
         
-        if not os.path.exists(circuit_path):
-            raise FileNotFoundError(f"Circuit '{name}' not found")
-            
-        with open(circuit_path, 'rb') as f:
-            circuit = pickle.load(f)
-            
-        return circuit
+        for suffix in _CIRCUIT_SUFFIXES:
+            circuit_path = self._path_prefix + base_name + suffix
+            if os.path.exists(circuit_path):
+                return circuit_path
+        return None
     
-    def save_state_vector(self, state_vector: np.ndarray, name: str) -> str:
+    def save_state_vector(self, state_vector: np.ndarray, name: str, raw: bool = False) -> str:
         """
         Save a quantum state vector to disk.
         
+        With ``raw=True`` the array buffer is written unbuffered with
+        ``ndarray.tofile`` to ``<name>_state.bin`` and its shape and dtype go
+        to a ``<name>_state_layout.json`` sidecar.  This skips the ``.npy``
+        header, which is worth it when many small states are saved.
+        
         Args:
             state_vector: Numpy array representing quantum state
             name: Name to save the state under
+            raw: Write the bare buffer plus layout sidecar instead of ``.npy``
             
         Returns:
             Path to the saved state
         """
-        state_path = os.path.join(self.storage_dir, f"{name}_state.npy")
-        np.save(state_path, state_vector)
+        if raw:
+            state_vector = np.ascontiguousarray(state_vector)
+            state_path = self._path_for(name, "state_raw")
+            self._atomic_write(state_path, state_vector.tofile, buffering=0)
+            self._write_json(self._path_for(name, "state_layout"),
+                             {"shape": list(state_vector.shape), "dtype": state_vector.dtype.str})
+            stale_paths = [self._path_for(name, "state")]
+        else:
+            state_path = self._path_for(name, "state")
+            self._atomic_write(state_path, lambda f: np.save(f, state_vector, allow_pickle=False))
+            stale_paths = [self._path_for(name, "state_raw"), self._path_for(name, "state_layout")]
+        
+        for stale_path in stale_paths:
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
         return state_path
     
-    def load_state_vector(self, name: str) -> np.ndarray:
+    def load_state_vector(self, name: str, copy: bool = False) -> np.ndarray:
         """
         Load a quantum state vector from disk.
         
+        ``.npy`` files are memory-mapped read-only, so only the pages a
+        caller touches are read from disk.  Raw states written with
+        ``save_state_vector(raw=True)`` are small and read in one call.
+        
         Args:
             name: Name of the state to load
+            copy: Return a writable in-memory copy instead of the mapping
             
         Returns:
             Loaded state vector
         """
-        state_path = os.path.join(self.storage_dir, f"{name}_state.npy")
+        state_path = self._path_for(name, "state")
         
         if not os.path.exists(state_path):
-            raise FileNotFoundError(f"State '{name}' not found")
-            
-        return np.load(state_path)
+            layout_path = self._path_for(name, "state_layout")
+            if not os.path.exists(layout_path):
+                raise FileNotFoundError(f"State '{name}' not found")
+            with open(layout_path, 'r') as f:
+                layout = json.load(f)
+            state_vector = np.fromfile(self._path_for(name, "state_raw"), dtype=np.dtype(layout["dtype"]))
+            return state_vector.reshape(layout["shape"])
+            
+        state_vector = np.load(state_path, mmap_mode='r', allow_pickle=False)
+        return np.array(state_vector) if copy else state_vector
     
     def save_database_schema(self, schema: Dict[str, Any], name: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -140,7 +360,7 @@ class PersistentStorage:
         Returns:
             Path to the saved schema
         """
-        schema_path = os.path.join(self.storage_dir, f"{name}_schema.json")
+        schema_path = self._path_for(name, "schema")
         
         # Add metadata to the schema if provided
         if metadata:
@@ -149,8 +369,7 @@ class PersistentStorage:
         else:
             schema_with_metadata = schema
         
-        with open(schema_path, 'w') as f:
-            json.dump(schema_with_metadata, f, indent=2)
+        self._write_json(schema_path, schema_with_metadata)
         
         # Store metadata separately as well for consistency
         if metadata is None:
@@ -161,9 +380,8 @@ class PersistentStorage:
             metadata["created_at"] = datetime.datetime.now().isoformat()
             
         # Store metadata in a separate file
-        metadata_path = os.path.join(self.storage_dir, f"{name}_metadata.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        metadata_path = self._path_for(name, "metadata")
+        self._write_json(metadata_path, metadata)
             
         return schema_path
     
@@ -183,7 +401,7 @@ class PersistentStorage:
         # Handle full paths with schema extension
         schema_path = name
         if not schema_path.endswith('_schema.json'):
-            schema_path = os.path.join(self.storage_dir, f"{name}_schema.json")
+            schema_path = self._path_for(name, "schema")
         
         # Check if the file exists
         if not os.path.exists(schema_path):
@@ -207,11 +425,15 @@ class PersistentStorage:
         Returns:
             Path to the saved results
         """
-        results_path = os.path.join(self.storage_dir, f"{name}_results.pickle")
-        
-        with open(results_path, 'wb') as f:
-            pickle.dump(results, f)
-            
+        results_path = self._path_for(name, "results")
+        arrays = {key: np.asarray(value) for key, value in results.items()}
+
+        self._atomic_write(results_path, lambda f: np.savez_compressed(f, **arrays))
+
+        legacy_path = self._path_prefix + name + _PICKLE_RESULTS_SUFFIX
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
         return results_path
     
     def load_measurement_results(self, name: str) -> Dict[str, np.ndarray]:
@@ -224,56 +446,101 @@ class PersistentStorage:
         Returns:
             Loaded measurement results
         """
-        results_path = os.path.join(self.storage_dir, f"{name}_results.pickle")
-        
+        results_path = self._path_for(name, "results")
+        if not os.path.exists(results_path):
+            results_path = self._path_prefix + name + _PICKLE_RESULTS_SUFFIX
+
         if not os.path.exists(results_path):
             raise FileNotFoundError(f"Results '{name}' not found")
-            
-        with open(results_path, 'rb') as f:
-            results = pickle.load(f)
-            
-        return results
+
+        if results_path.endswith(_PICKLE_RESULTS_SUFFIX):
+            import pickle
+            with open(results_path, 'rb') as f:
+                return pickle.load(f)
+
+        with np.load(results_path, allow_pickle=False) as archive:
+            return {key: archive[key] for key in archive.files}
     
     def list_stored_items(self) -> List[Dict[str, Any]]:
         """
         List all stored items with metadata.
         
+        While the storage directory is unchanged the result is served from
+        the ``.index.json`` sidecar with a single read; any file created,
+        replaced or removed in the directory invalidates it.
+        
         Returns:
             List of dictionaries containing item information
         """
-        items = []
+        items = self._read_index()
+        if items is not None:
+            return items
+        
+        # The index file must exist before the directory is stamped, since
+        # creating it changes the directory mtime
+        if not os.path.exists(self._index_path):
+            open(self._index_path, 'a').close()
+        dir_mtime_ns = os.stat(self.storage_dir).st_mtime_ns
+        items = self._scan_items()
+        self._write_index(dir_mtime_ns, items)
+        return items
+    
+    def _read_index(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached listing, or None if it is missing or stale."""
+        try:
+            dir_mtime_ns = os.stat(self.storage_dir).st_mtime_ns
+            with open(self._index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get("dir_mtime_ns") != dir_mtime_ns:
+            return None
+        return index["items"]
+    
+    def _write_index(self, dir_mtime_ns: int, items: List[Dict[str, Any]]) -> None:
+        """Cache *items* for a directory last changed at *dir_mtime_ns*."""
+        if time.time_ns() - dir_mtime_ns < _INDEX_RACY_NS:
+            return
+        # Rewritten in place: replacing the file would bump the directory
+        # mtime and invalidate the index immediately.  A torn read fails to
+        # parse and falls back to a scan.
+        try:
+            with open(self._index_path, 'r+') as f:
+                json.dump({"dir_mtime_ns": dir_mtime_ns, "items": items}, f)
+                f.truncate()
+        except OSError:
+            pass
+    
+    def _scan_items(self) -> List[Dict[str, Any]]:
+        """Build the item listing from a scan of the storage directory."""
+        # One scan of the directory; file names are matched once against
+        # the item suffix table instead of a chain of endswith checks
+        with os.scandir(self.storage_dir) as entries:
+            filenames = [entry.name for entry in entries]
+        present = set(filenames)
         
-        for filename in os.listdir(self.storage_dir):
-            item_name = None
-            item_type = None
-            metadata = {}
-            created_at = datetime.datetime.now().isoformat()
-            
-            if filename.endswith("_circuit.pickle"):
-                item_name = filename.replace("_circuit.pickle", "")
-                item_type = "circuit"
-                
-            elif filename.endswith("_state.npy"):
-                item_name = filename.replace("_state.npy", "")
-                item_type = "state"
-                
-            elif filename.endswith("_schema.json"):
-                item_name = filename.replace("_schema.json", "")
-                item_type = "data"
-                
-            elif filename.endswith("_results.pickle"):
-                item_name = filename.replace("_results.pickle", "")
-                item_type = "results"
+        items = []
+        seen = set()
+        for filename in filenames:
+            match = _ITEM_FILE_RE.match(filename)
+            if match is None:
+                continue
+            item_name = match.group(1)
+            item_type = _ITEM_SUFFIX_TYPES[match.group(2)]
             
-            # Skip if not a valid item or we already processed this item
-            if item_name is None or any(i["name"] == item_name for i in items):
+            # Skip if we already processed this item
+            if item_name in seen:
                 continue
+            seen.add(item_name)
+            
+            metadata = {}
+            created_at = datetime.datetime.now().isoformat()
                 
             # Try to load metadata if it exists
-            metadata_path = os.path.join(self.storage_dir, f"{item_name}_metadata.json")
-            if os.path.exists(metadata_path):
+            metadata_name = f"{item_name}_metadata.json"
+            if metadata_name in present:
                 try:
-                    with open(metadata_path, 'r') as f:
+                    with open(self._path_prefix + metadata_name, 'r') as f:
                         metadata = json.load(f)
                     # Extract created_at from metadata if available
                     if "created_at" in metadata:
@@ -323,28 +590,23 @@ class PersistentStorage:
             base_name = name[len(self.storage_dir) + 1:]
         
         # Further clean up the name by removing extensions
-        for ext in ["_schema.json", "_circuit.pickle", "_state.npy", "_results.pickle"]:
+        for ext in _ITEM_DATA_SUFFIXES:
             if base_name.endswith(ext):
                 base_name = base_name[:-len(ext)]
                 break
             
-        # Check and delete all possible file types for this item
-        files_to_delete = [
-            f"{base_name}_circuit.pickle",
-            f"{base_name}_circuit.txt",
-            f"{base_name}_schema.json",
-            f"{base_name}_state.npy",
-            f"{base_name}_results.pickle",
-            f"{base_name}_metadata.json"
-        ]
-        
+        # Delete every possible file for this item; a missing file costs one
+        # failed unlink instead of an exists() check plus the unlink
         deleted_any = False
-        for file_name in files_to_delete:
-            file_path = os.path.join(self.storage_dir, file_name)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        for suffix in _ITEM_DATA_SUFFIXES + _ITEM_SIDECAR_SUFFIXES:
+            path = self._path_prefix + base_name + suffix
+            self._circuit_cache.pop(path, None)
+            try:
+                os.remove(path)
                 deleted_any = True
-                
+            except FileNotFoundError:
+                pass
+        
         return deleted_any
     
     def backup_database(self, backup_path: Optional[str] = None) -> str:
@@ -357,22 +619,39 @@ class PersistentStorage:
         Returns:
             Path to the backup file
         """
-        import datetime
-        import shutil
+        import zipfile
         
         if backup_path is None:
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = f"quantum_db_backup_{timestamp}"
             
-        # Create a zip archive of the storage directory
-        shutil.make_archive(backup_path, 'zip', self.storage_dir)
-        
-        return f"{backup_path}.zip"
+        # Create a zip archive of the storage directory.  Dense binary and
+        # already-compressed payloads are stored as-is; text is deflated at
+        # the fastest level.
+        archive_path = f"{backup_path}.zip"
+        with zipfile.ZipFile(archive_path, 'w', allowZip64=True) as archive:
+            for root, _dirs, files in os.walk(self.storage_dir):
+                for filename in files:
+                    if _TEMP_FILE_RE.search(filename):
+                        continue  # a write still in progress
+                    file_path = os.path.join(root, filename)
+                    if filename.endswith(_STORED_BACKUP_SUFFIXES):
+                        archive.write(file_path, os.path.relpath(file_path, self.storage_dir),
+                                      compress_type=zipfile.ZIP_STORED)
+                    else:
+                        archive.write(file_path, os.path.relpath(file_path, self.storage_dir),
+                                      compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+        
+        return archive_path
     
     def restore_from_backup(self, backup_path: str) -> bool:
         """
         Restore the database from a backup.
         
+        Zip backups are extracted with a thread pool; members are written
+        concurrently since file I/O and inflating release the GIL.  Other
+        archive formats go through ``shutil.unpack_archive``.
+        
         Args:
             backup_path: Path to the backup file
             
@@ -380,6 +659,8 @@ class PersistentStorage:
             True if restoration was successful
         """
         import shutil
+        import zipfile
+        from concurrent.futures import ThreadPoolExecutor
         
         if not os.path.exists(backup_path):
             raise FileNotFoundError(f"Backup file '{backup_path}' not found")
@@ -387,9 +668,25 @@ class PersistentStorage:
         # Clear the current storage directory
         if os.path.exists(self.storage_dir):
             shutil.rmtree(self.storage_dir)
-            
-        # Extract the backup
-        shutil.unpack_archive(backup_path, self.storage_dir)
+        
+        if not zipfile.is_zipfile(backup_path):
+            shutil.unpack_archive(backup_path, self.storage_dir)
+            return True
+        
+        os.makedirs(self.storage_dir)
+        with zipfile.ZipFile(backup_path) as archive:
+            members = [info for info in archive.infolist() if not info.is_dir()]
+            # Create subdirectories up front so worker threads never race
+            # on makedirs inside ZipFile.extract
+            for info in members:
+                parent = os.path.dirname(info.filename)
+                if parent:
+                    os.makedirs(os.path.join(self.storage_dir, parent), exist_ok=True)
+            
+            workers = max(1, min(32, (os.cpu_count() or 1) * 4, len(members)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # list() re-raises the first extraction error, if any
+                list(pool.map(lambda info: archive.extract(info, self.storage_dir), members))
         
         return True
     
@@ -400,11 +697,12 @@ class PersistentStorage:
         Returns:
             None
         """
+        self._circuit_cache.clear()
         if not os.path.exists(self.storage_dir):
             return
             
         for filename in os.listdir(self.storage_dir):
-            file_path = os.path.join(self.storage_dir, filename)
+            file_path = self._path_prefix + filename
             try:
                 if os.path.isfile(file_path):
                     os.unlink(file_path)
@@ -431,15 +729,15 @@ class PersistentStorage:
             base_name = item_id[len(self.storage_dir) + 1:]
         
         # Further clean up the name by removing extensions
-        for ext in ["_schema.json", "_circuit.pickle", "_state.npy", "_results.pickle"]:
+        for ext in _ITEM_DATA_SUFFIXES:
             if base_name.endswith(ext):
                 base_name = base_name[:-len(ext)]
                 break
             
         # Check if item exists by checking for any of its possible files
         found = False
-        for ext in ["_circuit.pickle", "_schema.json", "_state.npy", "_results.pickle"]:
-            if os.path.exists(os.path.join(self.storage_dir, f"{base_name}{ext}")):
+        for ext in _ITEM_DATA_SUFFIXES:
+            if os.path.exists(self._path_prefix + base_name + ext):
                 found = True
                 break
                 
@@ -447,7 +745,7 @@ class PersistentStorage:
             raise KeyError(f"Item with ID {item_id} not found")
             
         # Get existing metadata
-        metadata_path = os.path.join(self.storage_dir, f"{base_name}_metadata.json")
+        metadata_path = self._path_for(base_name, "metadata")
         if os.path.exists(metadata_path):
             with open(metadata_path, 'r') as f:
                 existing_metadata = json.load(f)
@@ -465,11 +763,10 @@ class PersistentStorage:
         existing_metadata["updated_at"] = datetime.datetime.now().isoformat()
             
         # Save updated metadata
-        with open(metadata_path, 'w') as f:
-            json.dump(existing_metadata, f, indent=2)
+        self._write_json(metadata_path, existing_metadata)
             
         # If it's a schema, also update the embedded metadata
-        schema_path = os.path.join(self.storage_dir, f"{base_name}_schema.json")
+        schema_path = self._path_for(base_name, "schema")
         if os.path.exists(schema_path):
             try:
                 with open(schema_path, 'r') as f:
@@ -481,8 +778,7 @@ class PersistentStorage:
                 else:
                     schema["__metadata__"] = existing_metadata
                     
-                with open(schema_path, 'w') as f:
-                    json.dump(schema, f, indent=2)
+                self._write_json(schema_path, schema)
             except:
                 pass
                 
@@ -14,7 +14,12 @@ from qndb.distributed.networking import (
     RPCResponse,
 )
 
-from qndb.distributed.node_manager import Node, NodeManager
+from qndb.distributed.node_manager import (
+    Node,
+    NodeManager,
+    QubitBlock,
+    expand_allocation,
+)
 
 from qndb.distributed.consensus import (
     LogEntry,
@@ -73,7 +78,7 @@ __all__ = [
     "TLSConfig", "TransportChannel", "TransportLayer",
     "RPCRequest", "RPCResponse",
     # node_manager
-    "Node", "NodeManager",
+    "Node", "NodeManager", "QubitBlock", "expand_allocation",
     # consensus
     "LogEntry", "PersistentLog", "ConsensusMetrics",
     "QuantumConsensusProtocol", "QuantumRaft", "QuantumPBFT",
@@ -190,7 +190,9 @@ class QuantumRaft(QuantumConsensusProtocol):
         self.commit_index = 0
         self.last_applied = 0
         self.election_timeout = random.uniform(150, 300)
-        self.last_heartbeat = time.time() * 1000
+        # Election timing is monotonic (ms): wall-clock steps must not
+        # fire spurious elections
+        self.last_heartbeat = time.monotonic() * 1000
         self.running = False
         self.vote_count = 0
         self.next_index: Dict[str, int] = {}
@@ -230,7 +232,7 @@ class QuantumRaft(QuantumConsensusProtocol):
         self.voted_for = self.node_manager.local_node_id
         self.vote_count = 1
         self.metrics.elections_started += 1
-        self.last_heartbeat = time.time() * 1000
+        self.last_heartbeat = time.monotonic() * 1000
         request = {
             "type": "VOTE_REQUEST",
             "term": self.term,
@@ -242,7 +244,7 @@ class QuantumRaft(QuantumConsensusProtocol):
         self.metrics.messages_sent += len(self.node_manager.get_active_nodes()) - 1
 
     def check_election_timeout(self) -> bool:
-        return (time.time() * 1000 - self.last_heartbeat) > self.election_timeout
+        return (time.monotonic() * 1000 - self.last_heartbeat) > self.election_timeout
 
     def become_leader(self) -> None:
         self.state = "LEADER"
@@ -264,21 +266,50 @@ class QuantumRaft(QuantumConsensusProtocol):
         if leader_id:
             self.current_leader = leader_id
             self.metrics.leader_changes += 1
-        self.last_heartbeat = time.time() * 1000
+        self.last_heartbeat = time.monotonic() * 1000
 
     # -- append entries -------------------------------------------------
     def send_heartbeats(self) -> None:
+        """Send AppendEntries to every follower.
+
+        Followers that are caught up all receive the same empty heartbeat,
+        so it is built once and sent in a single broadcast; only lagging
+        followers get an individual message carrying their missing entries.
+        """
         if self.state != "LEADER":
             return
+        local_id = self.node_manager.local_node_id
+        next_heartbeat = self.log.last_index() + 1
+        caught_up: Set[str] = set()
+        lagging: List[str] = []
         for n in self.node_manager.get_all_nodes():
-            if n.id == self.node_manager.local_node_id:
+            if n.id == local_id:
                 continue
-            prev_idx = self.next_index.get(n.id, 1) - 1
+            if self.next_index.get(n.id, 1) == next_heartbeat:
+                caught_up.add(n.id)
+            else:
+                lagging.append(n.id)
+        if caught_up:
+            last = self.log.get(next_heartbeat - 1)
+            heartbeat = {
+                "type": "APPEND_ENTRIES",
+                "term": self.term,
+                "leader_id": local_id,
+                "prev_log_index": next_heartbeat - 1,
+                "prev_log_term": last.term if last else 0,
+                "entries": [],
+                "leader_commit": self.commit_index,
+            }
+            exclude = set(self.node_manager.transport.connected_peers()) - caught_up
+            self.metrics.messages_sent += self.node_manager.broadcast_message(
+                heartbeat, exclude=exclude)
+        for peer_id in lagging:
+            prev_idx = self.next_index.get(peer_id, 1) - 1
             prev_term = 0
             entry = self.log.get(prev_idx)
             if entry:
                 prev_term = entry.term
-            entries = self.log.entries_from(self.next_index.get(n.id, 1))
+            entries = self.log.entries_from(self.next_index.get(peer_id, 1))
             msg = {
                 "type": "APPEND_ENTRIES",
                 "term": self.term,
@@ -288,11 +319,11 @@ class QuantumRaft(QuantumConsensusProtocol):
                 "entries": [e.to_dict() for e in entries],
                 "leader_commit": self.commit_index,
             }
-            self.node_manager.send_message(n.id, msg)
+            self.node_manager.send_message(peer_id, msg)
             self.metrics.messages_sent += 1
 
     def handle_append_entries(self, message: Dict) -> Dict:
-        self.last_heartbeat = time.time() * 1000
+        self.last_heartbeat = time.monotonic() * 1000
         term = message["term"]
         leader_id = message["leader_id"]
         if term < self.term:
@@ -354,7 +385,7 @@ class QuantumRaft(QuantumConsensusProtocol):
                      message["last_log_index"] >= my_last_idx)):
                 grant = True
                 self.voted_for = candidate
-                self.last_heartbeat = time.time() * 1000
+                self.last_heartbeat = time.monotonic() * 1000
         self.metrics.messages_received += 1
         return {"type": "VOTE_RESPONSE", "term": self.term,
                 "vote_granted": grant, "node_id": self.node_manager.local_node_id}
@@ -15,9 +15,15 @@ import threading
 import socket
 import ssl
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 # ── Wire protocol constants ──────────────────────────────────────────
@@ -49,6 +55,37 @@ def encode_message(msg_type: int, payload: bytes) -> bytes:
     return header + payload
 
 
+def _encode_default(obj: Any) -> Any:
+    # Read-only views (types.MappingProxyType) encode like plain dicts
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Serialise a message payload to compact JSON bytes.
+
+    Uses ``orjson`` when it is installed (several times faster, and it
+    handles numpy scalars/arrays); payloads it rejects, such as dicts with
+    non-string keys, fall back to the stdlib encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=_encode_default,
+                                option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(payload, separators=(",", ":"),
+                      default=_encode_default).encode()
+
+
+def decode_payload(data: bytes) -> Any:
+    """Inverse of :func:`encode_payload`."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def decode_header(data: bytes) -> Tuple[int, int, int]:
     """Decode a wire protocol header → (version, msg_type, payload_length)."""
     if len(data) < HEADER_SIZE:
@@ -128,7 +165,9 @@ class PhiAccrualFailureDetector:
         self._last_heartbeat: Optional[float] = None
 
     def heartbeat(self) -> None:
-        now = time.time()
+        # Monotonic: a wall-clock step (NTP, manual change) must not turn
+        # into a bogus interval sample or a burst of suspicion
+        now = time.monotonic()
         if self._last_heartbeat is not None:
             interval = (now - self._last_heartbeat) * 1000  # ms
             self._intervals.append(interval)
@@ -139,7 +178,7 @@ class PhiAccrualFailureDetector:
     def phi(self) -> float:
         if self._last_heartbeat is None or len(self._intervals) < 2:
             return 0.0
-        elapsed_ms = (time.time() - self._last_heartbeat) * 1000
+        elapsed_ms = (time.monotonic() - self._last_heartbeat) * 1000
         mean = sum(self._intervals) / len(self._intervals)
         variance = sum((x - mean) ** 2 for x in self._intervals) / len(self._intervals)
         std_dev = max(variance ** 0.5, self.min_std_dev_ms)
@@ -186,6 +225,8 @@ class ServiceDiscovery:
         self._registry: Dict[str, ServiceRecord] = {}
         self._lock = threading.Lock()
         self._watchers: List[Callable[[str, ServiceRecord, str], None]] = []
+        # Global-name claims: name -> (owner, monotonic expiry)
+        self._claims: Dict[str, Tuple[str, float]] = {}
 
     def register(self, node_id: str, host: str, port: int,
                  metadata: Optional[Dict[str, str]] = None,
@@ -217,6 +258,29 @@ class ServiceDiscovery:
         with self._lock:
             return self._registry.get(node_id)
 
+    def claim_name(self, name: str, owner: str, ttl: float) -> str:
+        """Claim *name* for *owner* for *ttl* seconds; returns the holder.
+
+        The claim succeeds (or is renewed) if *name* is free, expired, or
+        already held by *owner*; otherwise the current holder is returned.
+        """
+        now = time.monotonic()
+        with self._lock:
+            claim = self._claims.get(name)
+            if claim is None or claim[0] == owner or claim[1] <= now:
+                self._claims[name] = (owner, now + ttl)
+                return owner
+            return claim[0]
+
+    def release_name(self, name: str, owner: str) -> bool:
+        """Give up *owner*'s claim on *name*."""
+        with self._lock:
+            claim = self._claims.get(name)
+            if claim is None or claim[0] != owner:
+                return False
+            del self._claims[name]
+            return True
+
     def add_watcher(self, callback: Callable[[str, ServiceRecord, str], None]) -> None:
         self._watchers.append(callback)
 
@@ -241,6 +305,9 @@ class ServiceDiscovery:
 
 
 # ── Network partition detector ────────────────────────────────────────
+_REACHABLE = frozenset((NodeHealth.HEALTHY, NodeHealth.SUSPECT))
+
+
 class PartitionDetector:
     """Detects network partitions by monitoring connectivity to peers.
 
@@ -272,9 +339,7 @@ class PartitionDetector:
         if det:
             det.heartbeat()
 
-    def peer_health(self, peer_id: str) -> NodeHealth:
-        with self._lock:
-            det = self._detectors.get(peer_id)
+    def _health(self, det: Optional[PhiAccrualFailureDetector]) -> NodeHealth:
         if det is None:
             return NodeHealth.DEAD
         phi = det.phi()
@@ -284,25 +349,32 @@ class PartitionDetector:
             return NodeHealth.SUSPECT
         return NodeHealth.UNREACHABLE
 
-    def reachable_peers(self) -> List[str]:
+    def _snapshot(self) -> List[Tuple[str, PhiAccrualFailureDetector]]:
+        # Readers copy the peer table under one short lock hold, then
+        # evaluate phi unlocked so they never stall heartbeat writers
         with self._lock:
-            peers = list(self._detectors.keys())
-        return [p for p in peers
-                if self.peer_health(p) in (NodeHealth.HEALTHY, NodeHealth.SUSPECT)]
+            return list(self._detectors.items())
 
-    def unreachable_peers(self) -> List[str]:
+    def peer_health(self, peer_id: str) -> NodeHealth:
         with self._lock:
-            peers = list(self._detectors.keys())
-        return [p for p in peers
-                if self.peer_health(p) in (NodeHealth.UNREACHABLE, NodeHealth.DEAD)]
+            det = self._detectors.get(peer_id)
+        return self._health(det)
+
+    def reachable_peers(self) -> List[str]:
+        return [p for p, det in self._snapshot()
+                if self._health(det) in _REACHABLE]
+
+    def unreachable_peers(self) -> List[str]:
+        return [p for p, det in self._snapshot()
+                if self._health(det) not in _REACHABLE]
 
     @property
     def partition_state(self) -> PartitionState:
-        with self._lock:
-            total = len(self._detectors)
+        snapshot = self._snapshot()
+        total = len(snapshot)
         if total == 0:
             return PartitionState.CONNECTED
-        reachable = len(self.reachable_peers())
+        reachable = sum(1 for _p, det in snapshot if self._health(det) in _REACHABLE)
         ratio = reachable / total
         if ratio >= 1.0:
             return PartitionState.CONNECTED
@@ -362,11 +434,13 @@ class TransportChannel:
     def is_connected(self) -> bool:
         return self._connected
 
-    def send(self, request: RPCRequest) -> bool:
+    def send(self, request: RPCRequest, payload_size: Optional[int] = None) -> bool:
+        """Queue *request*; *payload_size* skips re-encoding a known payload."""
         if not self._connected:
             return False
+        if payload_size is None:
+            payload_size = len(encode_payload(request.payload))
         with self._lock:
-            payload_size = len(json.dumps(request.payload).encode())
             self._outbox.append(request)
             self._bytes_sent += payload_size
             self._messages_sent += 1
@@ -376,7 +450,7 @@ class TransportChannel:
         with self._lock:
             msgs = list(self._inbox)
             for m in msgs:
-                self._bytes_received += len(json.dumps(m.payload).encode())
+                self._bytes_received += len(encode_payload(m.payload))
                 self._messages_received += 1
             self._inbox.clear()
         return msgs
@@ -444,13 +518,20 @@ class TransportLayer:
 
     def broadcast(self, method: str, payload: Dict[str, Any],
                   exclude: Optional[Set[str]] = None) -> int:
+        """Send one shared *payload* to every channel not in *exclude*.
+
+        The fan-out is prepared once: the payload is encoded and a single
+        request envelope (one ID, one timestamp) is built and queued on
+        every channel, rather than once per peer.
+        """
         sent = 0
         exclude = exclude or set()
+        payload_size = len(encode_payload(payload))
+        req = RPCRequest(method=method, payload=payload, sender_id=self.node_id)
         for rid, ch in list(self._channels.items()):
             if rid in exclude:
                 continue
-            req = RPCRequest(method=method, payload=payload, sender_id=self.node_id)
-            if ch.send(req):
+            if ch.send(req, payload_size=payload_size):
                 sent += 1
         return sent
 
@@ -8,22 +8,57 @@ Features:
 - Membership change protocol
 - Resource tracking per node
 """
-from typing import List, Dict, Tuple, Optional, Union, Set, Any, Callable
-import uuid
+from typing import List, Dict, Tuple, Optional, Union, Set, Any, Callable, Mapping
 import logging
+import os
 import threading
 import time
 import json
+import bisect
 import hashlib
+import heapq
+import itertools
+import math
+import secrets
+import sys
+import types
+from dataclasses import dataclass
 
 from qndb.distributed.networking import (
     TransportLayer, TransportChannel, ServiceDiscovery, ServiceRecord,
     PartitionDetector, PhiAccrualFailureDetector, NodeHealth, PartitionState,
-    TLSConfig, RPCRequest, RPCResponse,
+    TLSConfig, RPCRequest, RPCResponse, encode_payload,
 )
 
 logger = logging.getLogger(__name__)
 
+# Beyond this many timeouts in one check (e.g. a partition), log a single
+# summary line instead of one warning per node
+_TIMEOUT_LOG_LIMIT = 5
+
+# Upper bound on the encoded size of one BATCH frame
+_TX_BATCH_BYTES = 64 * 1024
+
+# Successors a leader advertises in its heartbeats (modified Bully)
+_SUCCESSION_SIZE = 8
+
+# An allocation of ``count`` consecutive qubits on ``node_id``, starting at
+# qubit index ``start``
+QubitBlock = Tuple[str, int, int]
+
+
+def expand_allocation(blocks: List[QubitBlock]) -> List[str]:
+    """Materialize allocation *blocks* as per-qubit IDs (``"<node>:qubit:<n>"``).
+
+    Callers that only need counts or per-node totals should work on the
+    blocks directly; ``sum(count for _, _, count in blocks)`` is the size.
+    """
+    qubit_ids: List[str] = []
+    for node_id, start, count in blocks:
+        prefix = node_id + ":qubit:"
+        qubit_ids.extend([f"{prefix}{i}" for i in range(start, start + count)])
+    return qubit_ids
+
 
 class Node:
     """Represents a node in the distributed quantum database cluster."""
@@ -63,6 +98,14 @@ class Node:
         return messages
 
 
+@dataclass
+class _PeriodicTask:
+    """A callback run every *interval* seconds by the node's timer thread."""
+    interval: float
+    deadline: float
+    callback: Callable[[], Any]
+
+
 class NodeManager:
     """Manages distributed nodes in a quantum database cluster.
 
@@ -79,13 +122,31 @@ class NodeManager:
                  is_leader: bool = False,
                  host: str = "localhost",
                  port: int = 5000,
-                 tls_config: Optional[TLSConfig] = None):
-        self.local_node_id = node_id or str(uuid.uuid4())
-        self.is_leader = is_leader
+                 tls_config: Optional[TLSConfig] = None,
+                 heartbeat_interval: float = 5.0,
+                 node_timeout: float = 15.0,
+                 heartbeat_max_interval: float = 30.0,
+                 heartbeat_load_factor: float = 0.5,
+                 timer_cpus: Optional[Set[int]] = None,
+                 leader_lease_factor: float = 5.0,
+                 cluster_id: str = "qndb",
+                 leader_registry: Optional[ServiceDiscovery] = None,
+                 node_eviction_timeout: Optional[float] = None,
+                 message_poll_interval: float = 0.5):
+        # Generated IDs are 64 random bits as fixed-width hex: less than half
+        # the bytes of a UUID string in every message, and fixed width keeps
+        # the Bully ordering numeric
+        self.local_node_id = sys.intern(node_id or f"{secrets.randbits(64):016x}")
+        self._is_leader = is_leader
         self.host = host
         self.port = port
         self.nodes: Dict[str, Node] = {}
-        self.lock = threading.RLock()
+        # Read-side snapshot of ``nodes``, republished on every registration
+        # change so listings never iterate the dict while it is mutated
+        self._node_list: Tuple[Node, ...] = ()
+        # Plain (non-reentrant) lock: no method calls another locking method
+        # or a user callback while holding it.
+        self.lock = threading.Lock()
 
         # Networking sub-systems
         self.transport = TransportLayer(self.local_node_id, tls_config)
@@ -102,26 +163,471 @@ class NodeManager:
         # Callbacks
         self._on_node_join: List[Callable[[Node], None]] = []
         self._on_node_leave: List[Callable[[str], None]] = []
+        self._on_leader_lost: List[Callable[[str], None]] = []
+
+        # Leadership travels on heartbeats: a leader's beat carries its
+        # ballot and renews its lease at every follower, so there is no
+        # separate announce/renew traffic.  Claims are ordered by
+        # (ballot, membership_version, node_id); the ID breaks ties, so of
+        # two leaders with equal claims exactly one yields.  A leader's
+        # claim is fixed when it takes over and carried on its heartbeats.
+        # The lease is leader_lease_factor
+        # heartbeat intervals, keeping t_hb_send << t_hb_fail (3 beats) <
+        # t_lease.
+        self.leader_lease_factor = leader_lease_factor
+        self._ballot = 1 if is_leader else 0
+        self.leader_id: Optional[str] = self.local_node_id if is_leader else None
+        self._leader_claim: Tuple[int, int, str] = (self._ballot, 0, self.local_node_id)
+        self._leader_lease_deadline = 0.0
+        # Sorted IDs of the active nodes (local node included), so the Bully
+        # election finds the nodes that outrank this one with a bisect
+        # instead of a scan.  Like ``_node_list`` it is an immutable tuple
+        # that writers replace under ``lock`` (copy on write) and readers
+        # load without it: the rebinding is atomic, so a reader sees either
+        # the old roster or the new one, never a half-updated one.
+        self._active_ids: Tuple[str, ...] = (self.local_node_id,)
+        # The leader's ranking of who takes over next (highest active IDs,
+        # descending), cached from its heartbeats.  An election first asks
+        # the best live successor instead of every higher node.
+        self._succession: Tuple[str, ...] = ()
+        # A Bully round waits one leader lease for the challenged nodes to
+        # produce a leader.  If none announces itself by _election_deadline,
+        # the round is re-run without them (_election_excluded), so a node
+        # that crashed after answering, or never got the challenge, cannot
+        # stall the election.  Both reset once a leader is known.
+        self._election_deadline = math.inf
+        self._election_challenged: Tuple[str, ...] = ()
+        self._election_excluded: Set[str] = set()
+        # (roster snapshot, successors) last advertised by this node as leader
+        self._succession_cache: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        # With a registry shared by the cluster, election is a claim on one
+        # global name (O(1) messages) renewed by every leader heartbeat;
+        # without one it falls back to Bully.
+        self.cluster_id = cluster_id
+        self.leader_registry = leader_registry
+        self._global_name = f"qdb-leader:{cluster_id}"
+
+        # Resource report sent with every heartbeat.  The static fields live
+        # in a read-only template; qubits_available, the one field every
+        # allocation touches, is kept apart and merged into a shared view
+        # only when a heartbeat needs it (see _local_resources).
+        resources = self._get_resources()
+        self._local_available: int = resources.pop("qubits_available", 0)
+        self._resource_template: Mapping[str, Any] = types.MappingProxyType(resources)
+        self._resource_view: Optional[Mapping[str, Any]] = None
+
+        # Running cluster totals, adjusted by every mutator under ``lock`` and
+        # published as an immutable snapshot so get_cluster_status() is a
+        # lock-free O(1) read.  The local node counts through its own
+        # resource report; a registered entry for it is not counted twice.
+        self._active_count = 1
+        self._total_qubits = self._resource_template.get("qubits", 0)
+        self._avail_qubits = self._local_available
+        self._status_snapshot: types.MappingProxyType = types.MappingProxyType({})
+        self._publish_status()
+
+        # Max-heap (negated keys) of (-qubits_available, node_id, epoch) over
+        # the nodes qubits can be allocated from.  Every availability change
+        # gives the node a fresh epoch and pushes a new entry; stale entries
+        # are discarded when popped.  Epochs come from one cluster-wide
+        # sequence, so a deregistered node's entries stay stale even if the
+        # same ID registers again and both dicts can drop it outright.
+        # _qubit_next_idx keeps qubit IDs unique across allocations on the
+        # same node.
+        self._avail_heap: List[Tuple[int, str, int]] = []
+        self._avail_epoch: Dict[str, int] = {}
+        self._avail_seq = itertools.count(1)
+        self._qubit_next_idx: Dict[str, int] = {}
+        self._push_avail(self.local_node_id, self._avail_qubits)
+        # Ledger of the qubits handed out and not yet released: per node,
+        # sorted disjoint [start, end) index ranges.  A release is credited
+        # only for qubits found here, so releasing twice, or releasing IDs
+        # that were never allocated, frees nothing.
+        self._allocated: Dict[str, List[Tuple[int, int]]] = {}
+
+        # Heartbeat / failure detection timing (seconds).  Peer liveness is
+        # tracked on the monotonic clock so wall-clock jumps cannot expire
+        # or revive nodes.  The heartbeat interval grows with sqrt(active
+        # nodes) between the two bounds, and each peer's advertised interval
+        # sets its timeout (three missed beats).
+        self.heartbeat_min_interval = heartbeat_interval
+        self.heartbeat_max_interval = heartbeat_max_interval
+        self.heartbeat_load_factor = heartbeat_load_factor
+        self.heartbeat_interval = heartbeat_interval
+        self.node_timeout = node_timeout
+        self._peer_intervals: Dict[str, float] = {}
+        # Peers that time out and stay silent for longer than this are
+        # deregistered, so a churning cluster does not accumulate dead
+        # entries.  Only timeouts start the clock: nodes disabled through
+        # mark_node_inactive() or registered inactive are never evicted.
+        # Insertion order is the order peers timed out, oldest first, so
+        # eviction stops at the first one still inside the window.
+        self.node_eviction_timeout = (10 * node_timeout if node_eviction_timeout is None
+                                      else node_eviction_timeout)
+        self._inactive_since: Dict[str, float] = {}
+        # Lower bound on when the oldest inactive peer becomes evictable;
+        # lets a timeout check with nothing due return without the lock
+        self._next_eviction = math.inf
+        # Min-heap of (deadline, peer_id, epoch).  Each heartbeat bumps the
+        # peer's epoch and pushes a new deadline; entries with an old epoch
+        # are dropped lazily when they reach the top.
+        self._deadline_heap: List[Tuple[float, str, int]] = []
+        self._hb_epoch: Dict[str, int] = {}
+        # Monotonic time of each peer's latest heartbeat.  Routine heartbeats
+        # only store this (one dict write, no lock); a deadline that comes up
+        # for a peer heard from since is pushed back instead of expiring.
+        self._last_beat: Dict[str, float] = {}
+
+        # Any message from a peer counts as a heartbeat; _last_traffic
+        # throttles the resulting deadline pushes to one per peer interval.
+        self._last_traffic: Dict[str, float] = {}
+
+        # Inbound control traffic is answered here as soon as it is polled;
+        # any other message polled by process_messages() waits in _inbox
+        # for the next get_messages() call.
+        self._control_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "HEARTBEAT": self.receive_heartbeat,
+            "ELECTION": self.receive_election,
+            "ELECTION_OK": self.receive_election_ok,
+            "MEMBERSHIP_CHANGE": self.receive_membership_change,
+        }
+        self._inbox: List[Dict[str, Any]] = []
+        self.message_poll_interval = message_poll_interval
+
+        # All periodic work (heartbeats, timeout checks, ...) runs on one
+        # timer thread.  Due times sit in a min-heap of (deadline, seq,
+        # name) -- entries whose task was cancelled or rescheduled are
+        # skipped -- and the thread waits on a condition until the earliest
+        # one; scheduling or shutdown notifies it.  The timer state has its
+        # own lock: sharing ``lock`` made every timer wake-up and interval
+        # change contend with heartbeat and allocation traffic.
+        self._tasks: Dict[str, _PeriodicTask] = {}
+        self._task_heap: List[Tuple[float, int, str]] = []
+        self._task_seq = itertools.count()
+        self._timer_lock = threading.Lock()
+        self._timer_cond = threading.Condition(self._timer_lock)
+        self._timer_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Optional CPU set for the timer thread, e.g. the cores serving the
+        # NIC's receive queue so heartbeats stay on the local NUMA node
+        self.timer_cpus = timer_cpus
 
         logger.info("NodeManager initialised (id=%s)", self.local_node_id)
 
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    @is_leader.setter
+    def is_leader(self, value: bool) -> None:
+        changed = value != self._is_leader
+        self._is_leader = value
+        if changed:
+            with self.lock:
+                if value:
+                    self._ballot += 1
+                    self.leader_id = self.local_node_id
+                    self._end_election()
+                    self._leader_claim = (self._ballot, self._membership_version,
+                                          self.local_node_id)
+                elif self.leader_id == self.local_node_id:
+                    self.leader_id = None
+                self._publish_status()
+        # Announce leadership changes right away instead of on the next beat
+        if changed and "heartbeat" in self._tasks:
+            self._broadcast_heartbeat()
+
     # ------------------------------------------------------------------
     # Resource helpers
     # ------------------------------------------------------------------
     def _get_resources(self) -> Dict[str, Any]:
         return {"qubits": 100, "qubits_available": 100}
 
+    def update_resources(self, **changes: Any) -> Mapping[str, Any]:
+        """Update the local resource report advertised in heartbeats."""
+        with self.lock:
+            available = changes.pop("qubits_available", self._local_available)
+            if changes:
+                old = self._resource_template
+                self._resource_template = types.MappingProxyType({**old, **changes})
+                self._total_qubits += (self._resource_template.get("qubits", 0)
+                                       - old.get("qubits", 0))
+            self._avail_qubits += available - self._local_available
+            self._set_available(self.local_node_id, available)
+            self._publish_status()
+            return self._local_resources()
+
+    def _local_resources(self) -> Mapping[str, Any]:
+        # Caller holds ``lock``.  Heartbeats share the returned view as-is, so
+        # it is rebuilt (never mutated) after the local resources change.
+        view = self._resource_view
+        if view is None:
+            view = self._resource_view = types.MappingProxyType(
+                {**self._resource_template, "qubits_available": self._local_available})
+        return view
+
+    # ------------------------------------------------------------------
+    # Cluster status counters
+    # ------------------------------------------------------------------
+    def _count_node(self, node: Node, sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) *node* from the totals.
+
+        Only active peers contribute.  Callers hold ``lock`` and bracket a
+        state change with ``-1`` before and ``+1`` after it.
+        """
+        if node.id == self.local_node_id or not node.is_active:
+            return
+        available = node.resources.get("qubits_available", 0)
+        self._active_count += sign
+        self._total_qubits += sign * node.resources.get("qubits", 0)
+        self._avail_qubits += sign * available
+        if sign > 0:
+            self._push_avail(node.id, available)
+        else:
+            self._avail_epoch[node.id] = next(self._avail_seq)
+
+    def _index_active(self, node_id: str, active: bool) -> None:
+        # Caller holds ``lock``.  The local node is always in the index.
+        if node_id == self.local_node_id:
+            return
+        ids = self._active_ids
+        i = bisect.bisect_left(ids, node_id)
+        present = i < len(ids) and ids[i] == node_id
+        if active and not present:
+            self._active_ids = ids[:i] + (node_id,) + ids[i:]
+        elif not active and present:
+            self._active_ids = ids[:i] + ids[i + 1:]
+
+    def _push_avail(self, node_id: str, available: int) -> None:
+        """Supersede *node_id*'s heap entry with its current availability."""
+        epoch = self._avail_epoch[node_id] = next(self._avail_seq)
+        if available > 0:
+            heapq.heappush(self._avail_heap, (-available, node_id, epoch))
+            # Bounded by the live roster, not by every ID ever seen
+            if len(self._avail_heap) > 2 * len(self._active_ids) + 64:
+                self._compact_avail_heap()
+
+    def _compact_avail_heap(self) -> None:
+        # Caller holds ``lock``.  Superseded entries only leave the heap when
+        # an allocation pops them; rebuild from the live ones so the heap
+        # stays O(nodes) however often availability changes.
+        epochs = self._avail_epoch
+        live = [entry for entry in self._avail_heap
+                if epochs.get(entry[1]) == entry[2]
+                and self._capacity_of(entry[1]) is not None]
+        heapq.heapify(live)
+        self._avail_heap = live
+
+    def _publish_status(self) -> None:
+        self._status_snapshot = types.MappingProxyType({
+            "node_id": self.local_node_id,
+            "is_leader": self._is_leader,
+            "leader_id": self.leader_id,
+            "total_nodes": len(self.nodes) + (self.local_node_id not in self.nodes),
+            "active_nodes": self._active_count,
+            "total_qubits": self._total_qubits,
+            "available_qubits": self._avail_qubits,
+            "membership_version": self._membership_version,
+        })
+
+    # ------------------------------------------------------------------
+    # Qubit allocation
+    # ------------------------------------------------------------------
+    def _capacity_of(self, node_id: str) -> Optional[Tuple[int, int]]:
+        """``(qubits, qubits_available)`` of an allocatable node, or None."""
+        if node_id == self.local_node_id:
+            return self._resource_template.get("qubits", 0), self._local_available
+        node = self.nodes.get(node_id)
+        if node is None or not node.is_active:
+            return None
+        resources = node.resources
+        return resources.get("qubits", 0), resources.get("qubits_available", 0)
+
+    def _set_available(self, node_id: str, available: int) -> None:
+        if node_id == self.local_node_id:
+            self._local_available = available
+            self._resource_view = None
+        else:
+            # Copy on write: resource dicts may be shared with heartbeat payloads
+            node = self.nodes[node_id]
+            node.resources = {**node.resources, "qubits_available": available}
+        self._push_avail(node_id, available)
+
+    def allocate_qubits(self, num_qubits: int) -> Optional[List[str]]:
+        """Allocate *num_qubits* and return them as per-qubit IDs.
+
+        Same as :meth:`allocate_qubit_blocks`, expanded with
+        :func:`expand_allocation`.
+        """
+        blocks = self.allocate_qubit_blocks(num_qubits)
+        return None if blocks is None else expand_allocation(blocks)
+
+    def allocate_qubit_blocks(self, num_qubits: int) -> Optional[List[QubitBlock]]:
+        """Allocate *num_qubits* across the cluster, most-available node first.
+
+        Only the leader allocates.  Returns one ``(node_id, start, count)``
+        block per node used, or None on a follower or if the cluster does
+        not have enough free qubits.  Only the heap entries of the nodes
+        actually used are popped, so a request served by one node costs
+        O(log N) however many qubits it takes.
+        """
+        # Unlocked flag read: followers turn requests away without contention
+        if not self._is_leader:
+            logger.warning("Node %s is not the leader (leader: %s); "
+                           "cannot allocate qubits", self.local_node_id, self.leader_id)
+            return None
+        if num_qubits <= 0:
+            return []
+        with self.lock:
+            if self._avail_qubits < num_qubits:
+                return None
+
+            # Plan: pop the largest live entries until the request is covered
+            plan: List[Tuple[str, int, int]] = []
+            remaining = num_qubits
+            heap = self._avail_heap
+            while remaining > 0 and heap:
+                neg_available, node_id, epoch = heapq.heappop(heap)
+                if (self._avail_epoch.get(node_id) != epoch
+                        or self._capacity_of(node_id) is None):
+                    continue
+                available = -neg_available
+                take = min(available, remaining)
+                plan.append((node_id, available, take))
+                remaining -= take
+            if remaining > 0:
+                # Totals and heap disagree; put the live entries back untouched
+                for node_id, available, _take in plan:
+                    heapq.heappush(heap, (-available, node_id,
+                                          self._avail_epoch[node_id]))
+                return None
+
+            # Apply: reserve an index range per node
+            blocks: List[QubitBlock] = []
+            for node_id, available, take in plan:
+                base = self._qubit_next_idx.get(node_id, 0)
+                self._qubit_next_idx[node_id] = base + take
+                blocks.append((node_id, base, take))
+                # Indices only grow, so the new range goes last
+                ranges = self._allocated.setdefault(node_id, [])
+                if ranges and ranges[-1][1] == base:
+                    ranges[-1] = (ranges[-1][0], base + take)
+                else:
+                    ranges.append((base, base + take))
+                self._set_available(node_id, available - take)
+            self._avail_qubits -= num_qubits
+            self._publish_status()
+        return blocks
+
+    def release_qubits(self, qubits: Union[List[QubitBlock], List[str]]) -> int:
+        """Return allocated qubits to their nodes; returns the number freed.
+
+        *qubits* is either the block list from :meth:`allocate_qubit_blocks`
+        (released in O(blocks)) or per-qubit IDs from :meth:`allocate_qubits`.
+        Only the leader tracks allocations; a follower releases nothing.
+        Qubits this leader did not hand out, or has already taken back, are
+        ignored.  Qubits of unknown or inactive nodes leave the ledger
+        without being credited, and no node is credited beyond its total
+        capacity.
+        """
+        if not self._is_leader:
+            logger.warning("Node %s is not the leader; cannot release qubits",
+                           self.local_node_id)
+            return 0
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        if qubits and isinstance(qubits[0], tuple):
+            for node_id, start, count in qubits:
+                spans.setdefault(node_id, []).append((start, start + count))
+        else:
+            indices: Dict[str, List[int]] = {}
+            for qubit_id in qubits:
+                # Split on the last separator: node IDs may contain ":"
+                node_id, sep, index = qubit_id.rpartition(":qubit:")
+                if sep and index.isdigit():
+                    indices.setdefault(node_id, []).append(int(index))
+            for node_id, node_indices in indices.items():
+                # Merge into runs so each run is one ledger update
+                node_indices.sort()
+                runs = spans[node_id] = []
+                for i in node_indices:
+                    if runs and runs[-1][1] >= i:
+                        runs[-1] = (runs[-1][0], max(runs[-1][1], i + 1))
+                    else:
+                        runs.append((i, i + 1))
+        released = 0
+        with self.lock:
+            for node_id, node_spans in spans.items():
+                freed = sum(self._release_range(node_id, start, end)
+                            for start, end in node_spans)
+                capacity = self._capacity_of(node_id) if freed else None
+                if capacity is None:
+                    continue
+                total, available = capacity
+                freed = min(freed, total - available)
+                if freed <= 0:
+                    continue
+                self._set_available(node_id, available + freed)
+                released += freed
+            if released:
+                self._avail_qubits += released
+                self._publish_status()
+        return released
+
+    def _release_range(self, node_id: str, start: int, end: int) -> int:
+        """Drop ``[start, end)`` from *node_id*'s ledger; returns how many of
+        those qubits were allocated.  Caller holds ``lock``."""
+        ranges = self._allocated.get(node_id)
+        if not ranges or start >= end:
+            return 0
+        # First range that ends after start
+        i = bisect.bisect_right(ranges, (start, math.inf)) - 1
+        if i < 0 or ranges[i][1] <= start:
+            i += 1
+        freed = 0
+        keep: List[Tuple[int, int]] = []
+        j = i
+        while j < len(ranges) and ranges[j][0] < end:
+            lo, hi = ranges[j]
+            if lo < start:
+                keep.append((lo, start))
+            if hi > end:
+                keep.append((end, hi))
+            freed += min(hi, end) - max(lo, start)
+            j += 1
+        ranges[i:j] = keep
+        if not ranges:
+            del self._allocated[node_id]
+        return freed
+
+    def get_cluster_status(self) -> types.MappingProxyType:
+        """Return a read-only snapshot of cluster-wide node and qubit totals.
+
+        The snapshot is rebuilt by the mutators and rebound in a single
+        assignment, so readers never take the lock.
+        """
+        return self._status_snapshot
+
     # ------------------------------------------------------------------
     # Node registration (backward compat + new transport integration)
     # ------------------------------------------------------------------
     def register_node(self, node_id: str, host: str, port: int,
                       is_active: bool = True,
                       metadata: Optional[Dict[str, str]] = None) -> Node:
+        # Node IDs key many dicts and heap entries; share one string object
+        node_id = sys.intern(node_id)
         node = Node(node_id, host, port, is_active)
         node.metadata = metadata or {}
         with self.lock:
+            old = self.nodes.get(node_id)
+            if old is not None:
+                self._count_node(old, -1)
             self.nodes[node_id] = node
+            self._node_list = tuple(self.nodes.values())
+            self._count_node(node, 1)
+            self._index_active(node_id, node.is_active)
+            self._inactive_since.pop(node_id, None)
             self._membership_version += 1
+            self._publish_status()
 
         # Also register with discovery + partition detector + open channel
         self.discovery.register(node_id, host, port,
@@ -147,7 +653,19 @@ class NodeManager:
             node = self.nodes.pop(node_id, None)
             if node is None:
                 return False
+            self._node_list = tuple(self.nodes.values())
+            self._count_node(node, -1)
+            self._avail_epoch.pop(node_id, None)
+            self._qubit_next_idx.pop(node_id, None)
+            self._allocated.pop(node_id, None)
+            self._index_active(node_id, False)
+            self._inactive_since.pop(node_id, None)
             self._membership_version += 1
+            self._publish_status()
+            self._hb_epoch.pop(node_id, None)
+            self._last_beat.pop(node_id, None)
+            self._peer_intervals.pop(node_id, None)
+            self._last_traffic.pop(node_id, None)
 
         self.discovery.deregister(node_id)
         self.partition_detector.remove_peer(node_id)
@@ -166,21 +684,32 @@ class NodeManager:
     # Legacy query helpers
     # ------------------------------------------------------------------
     def get_active_nodes(self) -> List[Node]:
-        return [n for n in self.nodes.values() if n.is_active]
+        return [n for n in self._node_list if n.is_active]
 
     def get_all_nodes(self) -> List[Node]:
-        return list(self.nodes.values())
+        return list(self._node_list)
 
     def get_node(self, node_id: str) -> Optional[Node]:
         return self.nodes.get(node_id)
 
     def mark_node_inactive(self, node_id: str) -> None:
-        if node_id in self.nodes:
-            self.nodes[node_id].is_active = False
+        self._set_node_active(node_id, False)
 
     def mark_node_active(self, node_id: str) -> None:
-        if node_id in self.nodes:
-            self.nodes[node_id].is_active = True
+        self._set_node_active(node_id, True)
+
+    def _set_node_active(self, node_id: str, active: bool) -> None:
+        with self.lock:
+            # An administrative change takes the node out of timeout eviction
+            self._inactive_since.pop(node_id, None)
+            node = self.nodes.get(node_id)
+            if node is None or node.is_active == active:
+                return
+            self._count_node(node, -1)
+            node.is_active = active
+            self._count_node(node, 1)
+            self._index_active(node_id, active)
+            self._publish_status()
 
     # ------------------------------------------------------------------
     # Transport helpers (message passing via channels)
@@ -196,17 +725,647 @@ class NodeManager:
         return self.transport.broadcast(method, message, exclude=exclude)
 
     def get_messages(self) -> List[Dict[str, Any]]:
-        """Retrieve all pending messages from all channels."""
+        """Retrieve all pending messages from all channels.
+
+        BATCH frames are unpacked into their messages.  Heartbeat, election
+        and membership messages are handled by this manager and not
+        returned.  Traffic from a peer also proves it alive, so busy peers
+        need no separate heartbeat to stay within their timeout.
+        """
+        messages = self._receive()
+        with self.lock:
+            pending, self._inbox = self._inbox, []
+        return pending + messages if pending else messages
+
+    def process_messages(self) -> None:
+        """Poll the channels and handle control messages now.
+
+        Run on the timer by :meth:`start`, so heartbeats and elections are
+        answered even when nobody calls :meth:`get_messages`; the other
+        messages polled are kept for its next call.
+        """
+        messages = self._receive()
+        if messages:
+            with self.lock:
+                self._inbox.extend(messages)
+
+    def _receive(self) -> List[Dict[str, Any]]:
+        """Poll, dispatch control messages and return the rest in order."""
         items = self.transport.poll()
-        return [req.payload for (_rid, req) in items]
+        if not items:
+            return []
+        self._note_peer_traffic({rid for rid, _req in items})
+        handlers = self._control_handlers
+        messages: List[Dict[str, Any]] = []
+        for rid, req in items:
+            if req.method == "BATCH":
+                batch = req.payload.get("messages", ())
+            else:
+                batch = (req.payload,)
+            for message in batch:
+                handler = handlers.get(message.get("type"))
+                if handler is None:
+                    messages.append(message)
+                    continue
+                try:
+                    handler(message)
+                except Exception:
+                    logger.exception("Failed to handle %s from %s",
+                                     message.get("type"), rid)
+        return messages
+
+    def send_messages(self, target_id: str,
+                      messages: List[Dict[str, Any]]) -> int:
+        """Send *messages* to one peer coalesced into BATCH frames.
+
+        Returns the number of frames sent.
+        """
+        if not messages:
+            return 0
+        return self._send_coalesced(
+            target_id, [(m, len(encode_payload(m))) for m in messages])
+
+    def _send_coalesced(self, rid: str,
+                        entries: List[Tuple[Dict[str, Any], int]]) -> int:
+        frames = 0
+        batch: List[Dict[str, Any]] = []
+        size = 0
+        for message, msg_size in entries:
+            if batch and size + msg_size > _TX_BATCH_BYTES:
+                frames += self._send_batch(rid, batch)
+                batch, size = [], 0
+            batch.append(message)
+            size += msg_size
+        frames += self._send_batch(rid, batch)
+        return frames
+
+    def _send_batch(self, rid: str, batch: List[Dict[str, Any]]) -> int:
+        if len(batch) == 1:
+            return int(self.send_message(rid, batch[0]))
+        return int(self.transport.send(rid, "BATCH",
+                                       {"type": "BATCH", "messages": batch}))
+
+    def _note_peer_traffic(self, peer_ids: Set[str]) -> None:
+        now = time.monotonic()
+        with self.lock:
+            for peer_id in peer_ids:
+                if peer_id not in self.nodes:
+                    continue
+                interval = self._peer_intervals.get(peer_id, self.heartbeat_interval)
+                if now - self._last_traffic.get(peer_id, -math.inf) >= interval:
+                    self._last_traffic[peer_id] = now
+                    self._push_deadline(peer_id)
+
+    # ------------------------------------------------------------------
+    # Heartbeats
+    # ------------------------------------------------------------------
+    def _broadcast_heartbeat(self) -> int:
+        """Send this node's heartbeat to every peer in one broadcast.
+
+        A single payload carries health, leadership and the membership
+        version, so one message per tick serves liveness and roster
+        propagation alike.  Returns the number of peers reached.
+        """
+        interval = self._adapt_heartbeat_interval()
+        if self._is_leader and self.leader_registry is not None:
+            self._try_claim_leader()  # renew; demotes us if the name was lost
+        with self.lock:
+            resources = self._local_resources()
+        heartbeat = {
+            "type": "HEARTBEAT",
+            "node_id": self.local_node_id,
+            "timestamp": time.time(),
+            "interval": interval,
+            "is_leader": self.is_leader,
+            "ballot": self._ballot,
+            "lease": self.leader_lease_factor * interval if self.is_leader else None,
+            "membership_version": self._membership_version,
+            "resources": resources,
+        }
+        if self.is_leader:
+            heartbeat["claim"] = self._leader_claim
+            heartbeat["succession"] = self._successors()
+        return self.broadcast_message(heartbeat)
+
+    def _adapt_heartbeat_interval(self) -> float:
+        """Scale the heartbeat interval with the square root of cluster size.
+
+        ``min(max_interval, max(min_interval, min_interval * sqrt(N) * load))``
+        keeps total heartbeat traffic at O(sqrt(N)) per interval.
+        """
+        active = self._active_count
+        interval = min(self.heartbeat_max_interval,
+                       max(self.heartbeat_min_interval,
+                           self.heartbeat_min_interval * math.sqrt(active)
+                           * self.heartbeat_load_factor))
+        if interval != self.heartbeat_interval:
+            self.heartbeat_interval = interval
+            with self._timer_lock:
+                task = self._tasks.get("heartbeat")
+                if task is not None:
+                    task.interval = interval
+        return interval
+
+    def receive_heartbeat(self, message: Dict[str, Any]) -> bool:
+        """Apply a peer heartbeat; returns False for unknown senders.
+
+        A heartbeat from a node that had timed out marks it active again.
+        """
+        peer_id = message.get("node_id")
+        node = self.nodes.get(peer_id)
+        if node is None:
+            return False
+        clash = self._is_leader and bool(message.get("is_leader"))
+        interval = message.get("interval")
+        if interval is not None:
+            self._peer_intervals[peer_id] = interval
+        self.partition_detector.record_heartbeat(peer_id)
+        node.last_sync_time = time.time()
+        resources = message.get("resources")
+        if resources is not None and resources == node.resources:
+            # Steady state: keep the stored report and skip the republish
+            resources = None
+        if (resources is None and node.is_active and peer_id in self._hb_epoch
+                and self._is_routine_heartbeat(peer_id, message)):
+            # Fast path, no lock: nothing shared changes but this peer's own
+            # liveness (and, from the current leader, its lease)
+            self._last_beat[peer_id] = time.monotonic()
+            if self.nodes.get(peer_id) is not node:
+                self._forget_peer_timing(peer_id)
+                return False
+            if message.get("is_leader"):
+                self._renew_leader_lease(peer_id, message)
+            return True
+        with self.lock:
+            if self.nodes.get(peer_id) is not node:
+                # Deregistered (or replaced) since the unlocked lookup
+                self._forget_peer_timing(peer_id)
+                return False
+            self._push_deadline(peer_id)
+            leader_changed = self._apply_leader_claim(peer_id, message)
+            demote = self._is_leader and self.leader_id == peer_id
+            # The known leader stepped down: nobody else will elect a new one
+            elect = leader_changed and self.leader_id is None
+            revived = not node.is_active
+            if resources is not None or revived:
+                # One bracket covers both the status flip and new resources
+                self._count_node(node, -1)
+                node.is_active = True
+                if resources is not None:
+                    node.resources = resources
+                self._count_node(node, 1)
+                if revived:
+                    self._index_active(peer_id, True)
+                    self._inactive_since.pop(peer_id, None)
+                self._publish_status()
+            elif leader_changed:
+                self._publish_status()
+        if revived:
+            logger.info("Node %s is back", peer_id)
+        if clash:
+            logger.warning("Leader clash between %s and %s", self.local_node_id, peer_id)
+        if demote:
+            self._self_demote()
+        if elect:
+            logger.info("Leader %s stepped down", peer_id)
+            self._start_leader_election()
+        return True
+
+    def _forget_peer_timing(self, peer_id: str) -> None:
+        """Undo unlocked timing writes for a peer that is no longer registered.
+
+        The membership re-check follows the writes, and deregister_node
+        removes the node before pruning, so one side always cleans up.
+        """
+        if peer_id not in self.nodes:
+            self._peer_intervals.pop(peer_id, None)
+            self._last_beat.pop(peer_id, None)
+
+    def _is_routine_heartbeat(self, peer_id: str, message: Dict[str, Any]) -> bool:
+        """Whether *message* leaves leadership exactly as it is.
+
+        True for a follower that is not the known leader, or for the known
+        leader repeating its current claim, with no newer ballot either way.
+        """
+        ballot = message.get("ballot", 0)
+        if ballot > self._ballot:
+            return False
+        if not message.get("is_leader"):
+            return self.leader_id != peer_id
+        return (not self._is_leader and self.leader_id == peer_id
+                and self._claim_of(peer_id, message) == self._leader_claim)
+
+    @staticmethod
+    def _claim_of(peer_id: str, message: Dict[str, Any]) -> Tuple[int, int, str]:
+        """The ``(ballot, membership_version, node_id)`` claim a heartbeat makes."""
+        claim = message.get("claim")
+        if claim is not None:
+            ballot, version, node_id = claim
+            return ballot, version, node_id
+        return message.get("ballot", 0), message.get("membership_version", 0), peer_id
+
+    def _renew_leader_lease(self, peer_id: str, message: Dict[str, Any]) -> None:
+        succession = message.get("succession")
+        if succession is not None:
+            self._succession = tuple(succession)
+        lease = message.get("lease")
+        if lease is None:
+            lease = self.leader_lease_factor * self._peer_intervals.get(
+                peer_id, self.heartbeat_interval)
+        self._leader_lease_deadline = time.monotonic() + lease
+
+    def _apply_leader_claim(self, peer_id: str, message: Dict[str, Any]) -> bool:
+        """Track leadership and renew the lease from a heartbeat.
+
+        Caller holds ``lock``.  Returns True if the known leader changed.
+        """
+        ballot = message.get("ballot", 0)
+        self._ballot = max(self._ballot, ballot)
+        if not message.get("is_leader"):
+            if self.leader_id == peer_id:
+                # The leader stepped down; its lease ends now
+                self.leader_id = None
+                self._leader_lease_deadline = 0.0
+                return True
+            return False
+        claim = self._claim_of(peer_id, message)
+        if claim < self._leader_claim and self.leader_lease_valid:
+            # Stale claim while a newer leader holds the lease; if that is
+            # this node, the peer yields when it sees our heartbeat
+            return False
+        changed = self.leader_id != peer_id
+        self._end_election()
+        # If this node was leading, the newer ballot wins: the caller steps
+        # down through _self_demote() once ``lock`` is released
+        self.leader_id = peer_id
+        self._leader_claim = claim
+        self._renew_leader_lease(peer_id, message)
+        return changed
+
+    @property
+    def leader_lease_valid(self) -> bool:
+        """Whether a leader is known and its lease has not run out."""
+        if self._is_leader:
+            return True
+        return (self.leader_id is not None
+                and time.monotonic() < self._leader_lease_deadline)
+
+    def _check_leader_lease(self, now: float) -> Optional[str]:
+        # Caller holds ``lock``; returns the leader whose lease just expired
+        leader = self.leader_id
+        if (leader is None or leader == self.local_node_id
+                or now < self._leader_lease_deadline):
+            return None
+        self.leader_id = None
+        # The lapsed leader cannot be its own successor
+        self._succession = tuple(nid for nid in self._succession if nid != leader)
+        self._publish_status()
+        return leader
+
+    def _peer_timeout(self, peer_id: str) -> float:
+        interval = self._peer_intervals.get(peer_id)
+        return self.node_timeout if interval is None else 3 * interval
+
+    def _check_node_timeouts(self, now: Optional[float] = None) -> List[str]:
+        """Mark peers silent for three of their heartbeat intervals inactive.
+
+        Peers that have not advertised an interval use ``node_timeout``.
+        Only deadlines that have passed are popped from the heap, so a
+        check costs O(k log N) for k expiring (or superseded) entries.
+        An expired leader lease is reported to the ``on_leader_lost``
+        callbacks.  Peers still inactive ``node_eviction_timeout`` after
+        timing out are deregistered.
+        """
+        if now is None:
+            now = time.monotonic()
+        heap = self._deadline_heap
+        # Fast path, no lock: the earliest deadline, the leader lease and the
+        # oldest eviction are all in the future (the usual case)
+        try:
+            next_deadline = heap[0][0]
+        except IndexError:
+            next_deadline = math.inf
+        leader = self.leader_id
+        if (next_deadline > now and now < self._next_eviction
+                and now < self._election_deadline
+                and (leader is None or leader == self.local_node_id
+                     or now < self._leader_lease_deadline)):
+            return []
+        expired: List[str] = []
+        with self.lock:
+            while heap and heap[0][0] <= now:
+                _deadline, peer_id, epoch = heapq.heappop(heap)
+                if self._hb_epoch.get(peer_id) != epoch:
+                    continue  # superseded by a later heartbeat
+                node = self.nodes.get(peer_id)
+                if node is not None and node.is_active:
+                    renewed = (self._last_beat.get(peer_id, -math.inf)
+                               + self._peer_timeout(peer_id))
+                    if renewed > now:
+                        # Heard from via the fast path since this was pushed
+                        heapq.heappush(heap, (renewed, peer_id, epoch))
+                        continue
+                    self._count_node(node, -1)
+                    node.is_active = False
+                    self._index_active(peer_id, False)
+                    if not self._inactive_since:
+                        self._next_eviction = now + self.node_eviction_timeout
+                    self._inactive_since[peer_id] = now
+                    expired.append(peer_id)
+            if expired:
+                self._publish_status()
+            lost_leader = self._check_leader_lease(now)
+            stalled: Tuple[str, ...] = ()
+            if now >= self._election_deadline:
+                # The challenged nodes produced no leader in time
+                stalled = self._election_challenged
+                self._election_excluded.update(stalled)
+                self._election_deadline = math.inf
+            evict: List[str] = []
+            horizon = now - self.node_eviction_timeout
+            self._next_eviction = math.inf
+            for peer_id, since in self._inactive_since.items():
+                if since > horizon:
+                    self._next_eviction = since + self.node_eviction_timeout
+                    break
+                evict.append(peer_id)
+        for peer_id in evict:
+            logger.info("Evicting node %s after %.0fs inactive", peer_id,
+                        self.node_eviction_timeout)
+            self.deregister_node(peer_id)
+        if len(expired) > _TIMEOUT_LOG_LIMIT:
+            logger.warning("%d nodes timed out (%s, ...)", len(expired),
+                           ", ".join(expired[:_TIMEOUT_LOG_LIMIT]))
+        else:
+            for peer_id in expired:
+                logger.warning("Node %s timed out", peer_id)
+        if lost_leader is not None:
+            logger.warning("Leader lease of %s expired", lost_leader)
+            for cb in self._on_leader_lost:
+                try:
+                    cb(lost_leader)
+                except Exception:
+                    logger.exception("on_leader_lost callback error")
+            self._start_leader_election()
+        elif stalled and self.leader_id is None:
+            logger.warning("No leader after challenging %s; re-running the election",
+                           ", ".join(stalled))
+            self._start_leader_election()
+        return expired
+
+    # ------------------------------------------------------------------
+    # Leader election (Bully)
+    # ------------------------------------------------------------------
+    def _try_claim_leader(self) -> Optional[str]:
+        """Claim (or renew) the cluster's global leader name.
+
+        The claim lives for one leader lease.  Winning makes this node
+        leader; losing records the holder as leader, demoting this node if
+        it had been leading.  Returns the holder, or None without a registry.
+        """
+        if self.leader_registry is None:
+            return None
+        ttl = self.leader_lease_factor * self.heartbeat_interval
+        holder = self.leader_registry.claim_name(
+            self._global_name, self.local_node_id, ttl)
+        if holder == self.local_node_id:
+            if not self._is_leader:
+                self.is_leader = True
+        else:
+            if self._is_leader:
+                self._self_demote()
+            with self.lock:
+                if self.leader_id != holder:
+                    # The holder's claim arrives with its first heartbeat;
+                    # don't reject that as stale
+                    self._leader_claim = (0, 0, "")
+                self.leader_id = holder
+                self._end_election()
+                # The registry vouches for the holder for one claim TTL, so
+                # the timeout check does not expire it before it can beat
+                self._leader_lease_deadline = time.monotonic() + ttl
+                self._publish_status()
+        return holder
+
+    def _end_election(self) -> None:
+        # Caller holds ``lock``; a leader is known, so no round is pending
+        self._election_deadline = math.inf
+        self._election_challenged = ()
+        self._election_excluded.clear()
+
+    def _self_demote(self) -> None:
+        """Step down and give up the registry claim so a leader is re-elected."""
+        if self.leader_registry is not None:
+            self.leader_registry.release_name(self._global_name, self.local_node_id)
+        if self._is_leader:
+            self.is_leader = False
+        logger.info("Node %s stepped down as leader", self.local_node_id)
+
+    def _start_leader_election(self) -> List[str]:
+        """Elect a leader; returns the node IDs sent an ELECTION message.
+
+        With a leader registry this is a single name claim.  Otherwise the
+        succession list the last leader advertised is consulted first
+        (modified Bully): if this node is the best live successor it takes
+        over at once, else only that successor is challenged.  Without a
+        live successor every active node with a higher ID is challenged;
+        with no higher node alive this node takes over.  Either way its
+        next heartbeat carries the claim.  If no leader heartbeat arrives
+        within one leader lease of a challenge, the timeout check re-runs
+        the round as plain Bully without the nodes that were challenged.
+        """
+        if self.leader_registry is not None:
+            self._try_claim_leader()
+            return []
+        ids = self._active_ids  # one consistent roster for the whole round
+        excluded = self._election_excluded
+        if excluded:
+            # A round stalled: a silent successor must not be the only node
+            # asked again, so this round is plain Bully over the rest
+            ids = tuple(nid for nid in ids if nid not in excluded)
+            successor = None
+        else:
+            successor = self._live_successor(ids)
+        if successor is None:
+            higher = list(ids[bisect.bisect_right(ids, self.local_node_id):])
+        elif successor == self.local_node_id:
+            higher = []
+        else:
+            higher = [successor]  # one message instead of a broadcast
+        if not higher:
+            logger.info("Node %s has the highest ID; taking leadership",
+                        self.local_node_id)
+            self.is_leader = True
+            return []
+        with self.lock:
+            self._election_challenged = tuple(higher)
+            self._election_deadline = (time.monotonic() + self.leader_lease_factor
+                                       * self.heartbeat_interval)
+        election = {"type": "ELECTION", "node_id": self.local_node_id,
+                    "ballot": self._ballot}
+        for peer_id in higher:
+            self.send_message(peer_id, election)
+        return higher
+
+    def _successors(self) -> Tuple[str, ...]:
+        """The highest active IDs other than ours, best first.
+
+        Sent in every leader heartbeat, so the tuple is cached against the
+        roster snapshot it was computed from and rebuilt only after a
+        membership change.
+        """
+        ids = self._active_ids
+        cached_ids, succession = self._succession_cache
+        if cached_ids is not ids:
+            top = ids[-_SUCCESSION_SIZE - 1:]
+            succession = tuple(nid for nid in reversed(top)
+                               if nid != self.local_node_id)[:_SUCCESSION_SIZE]
+            self._succession_cache = (ids, succession)
+        return succession
+
+    def _live_successor(self, ids: Tuple[str, ...]) -> Optional[str]:
+        """First entry of the cached succession list that is active in *ids*.
+
+        Returns None if no successor is known or none is alive, in which
+        case the election falls back to plain Bully.
+        """
+        leader_id = self.leader_id
+        for nid in self._succession:
+            if nid == self.local_node_id:
+                return nid
+            i = bisect.bisect_left(ids, nid)
+            if i < len(ids) and ids[i] == nid and nid != leader_id:
+                return nid
+        return None
+
+    def receive_election(self, message: Dict[str, Any]) -> bool:
+        """Answer a lower node's ELECTION and start our own round.
+
+        Returns True if the challenge was answered.
+        """
+        sender = message.get("node_id")
+        if sender is None or sender >= self.local_node_id:
+            return False
+        with self.lock:
+            self._ballot = max(self._ballot, message.get("ballot", 0))
+        self.send_message(sender, {"type": "ELECTION_OK",
+                                   "node_id": self.local_node_id})
+        if not self._is_leader:
+            self._start_leader_election()
+        return True
+
+    def receive_election_ok(self, message: Dict[str, Any]) -> bool:
+        """Note that a higher node answered our ELECTION.
+
+        That node runs its own round and announces the winner on its
+        heartbeats, so this node only waits, up to the election deadline.
+        """
+        logger.debug("Node %s answered our election", message.get("node_id"))
+        return True
+
+    # ------------------------------------------------------------------
+    # Periodic tasks
+    # ------------------------------------------------------------------
+    def schedule_periodic(self, name: str, interval: float,
+                          callback: Callable[[], Any]) -> None:
+        """Run *callback* every *interval* seconds on the timer thread."""
+        with self._timer_lock:
+            task = _PeriodicTask(interval, time.monotonic() + interval, callback)
+            self._tasks[name] = task
+            heapq.heappush(self._task_heap, (task.deadline, next(self._task_seq), name))
+            if self._timer_thread is None and not self._stop.is_set():
+                self._timer_thread = threading.Thread(
+                    target=self._timer_loop, name=f"qndb-node-{self.local_node_id}",
+                    daemon=True)
+                self._timer_thread.start()
+            self._timer_cond.notify()
+
+    def cancel_periodic(self, name: str) -> bool:
+        with self._timer_lock:
+            return self._tasks.pop(name, None) is not None
+
+    def start(self) -> None:
+        """Start sending heartbeats, handling control messages and checking
+        peer timeouts."""
+        self.schedule_periodic("heartbeat", self.heartbeat_interval, self._broadcast_heartbeat)
+        self.schedule_periodic("messages", self.message_poll_interval, self.process_messages)
+        self.schedule_periodic("timeouts", self.heartbeat_interval, self._check_node_timeouts)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the timer thread; returns as soon as it wakes."""
+        self._stop.set()
+        with self._timer_lock:
+            thread = self._timer_thread
+            self._timer_cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _pin_timer_thread(self) -> None:
+        if not self.timer_cpus:
+            return
+        if not hasattr(os, "sched_setaffinity"):
+            logger.warning("CPU affinity is not supported on this platform")
+            return
+        try:
+            # pid 0 is the calling thread on Linux
+            os.sched_setaffinity(0, self.timer_cpus)
+        except OSError as exc:
+            logger.warning("Could not pin timer thread to %s: %s",
+                           sorted(self.timer_cpus), exc)
+
+    def _pop_due_tasks(self, now: float) -> List[_PeriodicTask]:
+        # Caller holds ``_timer_lock``; reschedules each due task before returning it
+        heap = self._task_heap
+        due: List[_PeriodicTask] = []
+        while heap and heap[0][0] <= now:
+            deadline, _seq, name = heapq.heappop(heap)
+            task = self._tasks.get(name)
+            if task is None or task.deadline != deadline:
+                continue  # cancelled or replaced
+            task.deadline = now + task.interval
+            heapq.heappush(heap, (task.deadline, next(self._task_seq), name))
+            due.append(task)
+        return due
+
+    def _timer_loop(self) -> None:
+        self._pin_timer_thread()
+        while True:
+            with self._timer_lock:
+                while True:
+                    if self._stop.is_set():
+                        return
+                    now = time.monotonic()
+                    due = self._pop_due_tasks(now)
+                    if due:
+                        break
+                    heap = self._task_heap
+                    self._timer_cond.wait(heap[0][0] - now if heap else None)
+            for task in due:
+                if self._stop.is_set():
+                    return
+                try:
+                    task.callback()
+                except Exception:
+                    logger.exception("Periodic task failed")
 
     # ------------------------------------------------------------------
     # Health / partition
     # ------------------------------------------------------------------
     def record_heartbeat(self, peer_id: str) -> None:
         self.partition_detector.record_heartbeat(peer_id)
-        if peer_id in self.nodes:
-            self.nodes[peer_id].last_sync_time = time.time()
+        node = self.nodes.get(peer_id)
+        if node is not None:
+            node.last_sync_time = time.time()
+            with self.lock:
+                self._push_deadline(peer_id)
+
+    def _push_deadline(self, peer_id: str) -> None:
+        # Caller holds ``lock``
+        epoch = self._hb_epoch.get(peer_id, 0) + 1
+        self._hb_epoch[peer_id] = epoch
+        now = self._last_beat[peer_id] = time.monotonic()
+        heapq.heappush(self._deadline_heap,
+                       (now + self._peer_timeout(peer_id), peer_id, epoch))
 
     def peer_health(self, peer_id: str) -> NodeHealth:
         return self.partition_detector.peer_health(peer_id)
@@ -253,6 +1412,26 @@ class NodeManager:
         self.deregister_node(node_id)
         return True
 
+    def receive_membership_change(self, message: Dict[str, Any]) -> bool:
+        """Apply a peer's MEMBERSHIP_CHANGE; returns True if the roster changed.
+
+        The proposer has already broadcast the change, so it is applied
+        locally without being proposed again.
+        """
+        node_id = message.get("node_id")
+        if node_id is None or message.get("proposer") == self.local_node_id:
+            return False
+        action = message.get("action")
+        if action == "ADD":
+            if node_id in self.nodes:
+                return False
+            self.register_node(node_id, message.get("host", ""),
+                               message.get("port", 0), is_active=True)
+            return True
+        if action == "REMOVE":
+            return self.deregister_node(node_id)
+        return False
+
     # ------------------------------------------------------------------
     # Callbacks
     # ------------------------------------------------------------------
@@ -262,6 +1441,10 @@ class NodeManager:
     def on_node_leave(self, callback: Callable[[str], None]) -> None:
         self._on_node_leave.append(callback)
 
+    def on_leader_lost(self, callback: Callable[[str], None]) -> None:
+        """Call *callback* with the old leader's ID when its lease expires."""
+        self._on_leader_lost.append(callback)
+
     # ------------------------------------------------------------------
     # Qubit transfer (quantum-specific, simulated)
     # ------------------------------------------------------------------
@@ -277,12 +1460,29 @@ class NodeManager:
     # Cluster summary
     # ------------------------------------------------------------------
     def cluster_info(self) -> Dict[str, Any]:
+        # Node counts and qubit totals cover the same set: the registered,
+        # active nodes.  The active-ID roster and the status counters
+        # always include the local node, so it is taken back out unless it
+        # is itself registered and active.
+        with self.lock:
+            status = self._status_snapshot
+            roster = self._node_list
+            local = self.nodes.get(self.local_node_id)
+            local_counted = local is not None and local.is_active
+            active = len(self._active_ids) - 1 + local_counted
+            total_qubits = status["total_qubits"]
+            available_qubits = status["available_qubits"]
+            if not local_counted:
+                total_qubits -= self._resource_template.get("qubits", 0)
+                available_qubits -= self._local_available
         return {
             "local_node_id": self.local_node_id,
-            "membership_version": self._membership_version,
-            "total_nodes": len(self.nodes),
-            "active_nodes": len(self.get_active_nodes()),
+            "membership_version": status["membership_version"],
+            "total_nodes": len(roster),
+            "active_nodes": active,
+            "total_qubits": total_qubits,
+            "available_qubits": available_qubits,
             "partition_state": self.partition_state.value,
             "has_quorum": self.has_quorum,
-            "nodes": {nid: str(n) for nid, n in self.nodes.items()},
+            "nodes": {n.id: str(n) for n in roster},
         }
\ No newline at end of file
@@ -11,9 +11,10 @@ import logging
 import threading
 import time
 import uuid
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -195,6 +196,18 @@ class DistributedJoinPlanner:
 
 
 # ── Distributed aggregation ───────────────────────────────────────────
+def _merge_kind(key: str, val: Any) -> str:
+    """How :meth:`DistributedAggregator.merge` combines values under *key*."""
+    if isinstance(val, Mapping):
+        return "hist"  # e.g. measurement counts per bitstring
+    if key.startswith(("COUNT", "SUM")):
+        return "add"
+    for prefix in ("MIN", "MAX", "AVG"):
+        if key.startswith(prefix):
+            return prefix
+    return "last"
+
+
 class DistributedAggregator:
     """Collects partial aggregation results from nodes and merges them."""
 
@@ -205,24 +218,38 @@ class DistributedAggregator:
         self._partials.setdefault(query_id, []).append(partial)
 
     def merge(self, query_id: str) -> Dict[str, Any]:
+        """Combine the partials of *query_id*.
+
+        COUNT/SUM add, MIN/MAX keep the extreme, AVG collects the partial
+        values, and mapping values (histograms) are summed per bucket with
+        ``Counter.update``.  Anything else is last-writer-wins.
+        """
         partials = self._partials.get(query_id, [])
         if not partials:
             return {}
 
         merged: Dict[str, Any] = {}
+        kinds: Dict[str, str] = {}  # classify each key once, not per partial
         for p in partials:
             for key, val in p.items():
-                if key.startswith("COUNT"):
-                    merged[key] = merged.get(key, 0) + val
-                elif key.startswith("SUM"):
+                kind = kinds.get(key)
+                if kind is None:
+                    kind = kinds[key] = _merge_kind(key, val)
+                if kind == "add":
                     merged[key] = merged.get(key, 0) + val
-                elif key.startswith("MIN"):
+                elif kind == "hist":
+                    hist = merged.get(key)
+                    if hist is None:
+                        merged[key] = Counter(val)
+                    else:
+                        hist.update(val)
+                elif kind == "MIN":
                     if key not in merged or val < merged[key]:
                         merged[key] = val
-                elif key.startswith("MAX"):
+                elif kind == "MAX":
                     if key not in merged or val > merged[key]:
                         merged[key] = val
-                elif key.startswith("AVG"):
+                elif kind == "AVG":
                     # need count+sum — callers should provide SUM/COUNT pairs
                     merged.setdefault(key, [])
                     merged[key].append(val)
@@ -415,19 +442,30 @@ class DistributedQueryExecutor:
         """
         query_id = str(uuid.uuid4())
         fragments = self.planner.plan(query_id, sql, table)
-
-        for frag in fragments:
-            if frag.fragment_type == "merge":
-                continue
-            self.node_manager.send_message(frag.target_node, {
-                "type": "QUERY_FRAGMENT",
-                "fragment": frag.to_dict(),
-            })
+        for frag in self._dispatch(fragments):
             frag.status = "running"
 
         self._results[query_id] = []
         return query_id
 
+    def _dispatch(self, fragments: List[QueryFragment]) -> List[QueryFragment]:
+        """Send the non-merge *fragments*, one coalesced frame per node.
+
+        A table with more partitions than nodes puts several fragments on
+        the same node; grouping them first sends each node its share in a
+        single BATCH frame instead of one message per fragment.
+        """
+        per_node: Dict[str, List[QueryFragment]] = {}
+        for frag in fragments:
+            if frag.fragment_type != "merge":
+                per_node.setdefault(frag.target_node, []).append(frag)
+        for target, frags in per_node.items():
+            self.node_manager.send_messages(target, [
+                {"type": "QUERY_FRAGMENT", "fragment": frag.to_dict()}
+                for frag in frags
+            ])
+        return [frag for frags in per_node.values() for frag in frags]
+
     def receive_result(self, query_id: str, fragment_id: str,
                        result: Any) -> None:
         self._results.setdefault(query_id, []).append(result)
@@ -443,13 +481,7 @@ class DistributedQueryExecutor:
         query_id = str(uuid.uuid4())
         fragments = self.join_planner.plan_join(
             query_id, left_table, right_table, join_key, strategy)
-        for frag in fragments:
-            if frag.fragment_type == "merge":
-                continue
-            self.node_manager.send_message(frag.target_node, {
-                "type": "QUERY_FRAGMENT",
-                "fragment": frag.to_dict(),
-            })
+        self._dispatch(fragments)
         self._results[query_id] = []
         return query_id
 
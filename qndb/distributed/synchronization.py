@@ -411,10 +411,18 @@ class QuantumStateSynchronizer:
     # Lifecycle
     # ------------------------------------------------------------------
     def start_sync_service(self) -> None:
-        logger.info("Sync service started")
+        """Run :meth:`sync_with_nodes` every ``sync_interval`` seconds.
+
+        The sync shares the node manager's timer thread with heartbeats
+        and timeout checks rather than running a thread of its own.
+        """
         self.sync_in_progress = False
+        self.node_manager.schedule_periodic("state_sync", self.sync_interval,
+                                            self.sync_with_nodes)
+        logger.info("Sync service started")
 
     def stop_sync_service(self) -> None:
+        self.node_manager.cancel_periodic("state_sync")
         logger.info("Sync service stopped")
         self.sync_in_progress = False
 
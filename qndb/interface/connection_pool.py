@@ -234,7 +234,7 @@ class ConnectionPool:
 
         self._initialize_pool()
 
-        self.stop_maintenance = False
+        self._stop_maintenance = threading.Event()
         self.maintenance_thread = threading.Thread(
             target=self._maintenance_loop, daemon=True)
         self.maintenance_thread.start()
@@ -314,12 +314,14 @@ class ConnectionPool:
     # -- maintenance -------------------------------------------------------
 
     def _maintenance_loop(self) -> None:
-        while not self.stop_maintenance:
+        # Waiting on the event rather than sleeping lets close_all_connections
+        # stop the loop at once instead of after the rest of the interval
+        while not self._stop_maintenance.is_set():
             try:
                 self._perform_maintenance()
             except Exception as e:
                 logger.error("Maintenance error: %s", e)
-            time.sleep(60)
+            self._stop_maintenance.wait(60)
 
     def _perform_maintenance(self) -> None:
         with self.lock:
@@ -351,11 +353,12 @@ class ConnectionPool:
     # -- shutdown ----------------------------------------------------------
 
     def close_all_connections(self) -> None:
-        with self.lock:
-            self.stop_maintenance = True
-            if self.maintenance_thread.is_alive():
-                self.maintenance_thread.join(timeout=5)
+        self._stop_maintenance.set()
+        # Joined outside the lock: a maintenance pass in progress needs it
+        if self.maintenance_thread.is_alive():
+            self.maintenance_thread.join(timeout=5)
 
+        with self.lock:
             for conn in list(self.active_connections):
                 conn.close()
             self.active_connections.clear()
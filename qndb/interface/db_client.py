@@ -132,10 +132,11 @@ class QuantumDatabaseClient:
             user_uuid = self._resolve_user_uuid()
             
             query_dict = parsed_query.to_dict() if hasattr(parsed_query, 'to_dict') else {}
-            logger.info(f"Authorizing query on table {query_dict.get('target_table')} for user {user_uuid}")
+            logger.info("Authorizing query on table %s for user %s",
+                        query_dict.get('target_table'), user_uuid)
             
             if not self.access_controller.authorize_query(query_dict, user_uuid):
-                logger.warning(f"Query not authorized for user {user_uuid}: {query_string}")
+                logger.warning("Query not authorized for user %s: %s", user_uuid, query_string)
                 return {
                     "success": False,
                     "error": "Query not authorized",
@@ -206,28 +207,29 @@ class QuantumDatabaseClient:
         transaction_id = self.transaction_manager.begin_transaction()
         
         try:
+            # Get a proper user UUID for authorization -- once per batch, not
+            # once per query (the fallback scans every known user)
+            user_uuid = None
+            if hasattr(self.access_controller, 'get_user_by_username'):
+                user = self.access_controller.get_user_by_username(self.connection.user_id)
+                if user:
+                    user_uuid = user.id
+            
+            if not user_uuid and hasattr(self.access_controller, 'users'):
+                for uid, user in self.access_controller.users.items():
+                    if hasattr(user, 'username') and user.username == self.connection.user_id:
+                        user_uuid = uid
+                        break
+            
+            if not user_uuid:
+                user_uuid = self.connection.user_id
+            
             for i, query in enumerate(queries):
                 query_params = None if params is None else params[i]
                 
                 # Parse and optimize each query
                 parsed_query = self.query_parser.parse(query, query_params)
                 
-                # Get a proper user UUID for authorization
-                user_uuid = None
-                if hasattr(self.access_controller, 'get_user_by_username'):
-                    user = self.access_controller.get_user_by_username(self.connection.user_id)
-                    if user:
-                        user_uuid = user.id
-                
-                if not user_uuid and hasattr(self.access_controller, 'users'):
-                    for uid, user in self.access_controller.users.items():
-                        if hasattr(user, 'username') and user.username == self.connection.user_id:
-                            user_uuid = uid
-                            break
-                
-                if not user_uuid:
-                    user_uuid = self.connection.user_id
-                    
                 # Convert parsed_query to dict for authorization
                 query_dict = parsed_query.to_dict() if hasattr(parsed_query, 'to_dict') else {}
                 
@@ -283,6 +285,23 @@ class QuantumDatabaseClient:
             })
             return results
     
+    def execute_many(self, query: str, param_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute one parameterized query once per parameter set, as a batch.
+        
+        Loading N rows this way costs one transaction and one authorization
+        lookup instead of N separate execute_query() calls.
+        
+        Args:
+            query: Quantum SQL query string with parameter placeholders
+            param_rows: One parameter dictionary per execution
+            
+        Returns:
+            List of results, one per parameter set
+        """
+        param_rows = list(param_rows)
+        return self.batch_execute([query] * len(param_rows), param_rows)
+    
     def get_quantum_resource_stats(self) -> Dict[str, Any]:
         """
         Get statistics about quantum resources usage.
@@ -10,7 +10,11 @@ Features:
  - Query validation / semantic analysis
 """
 
+import functools
 import re
+import threading
+from collections import OrderedDict
+from copy import deepcopy
 from typing import Dict, List, Any, Optional, Tuple
 
 from qndb.core.quantum_engine import QuantumEngine
@@ -28,6 +32,35 @@ from qndb.interface.query.helpers import flatten_conditions, find_top_level, ext
 
 logger = get_logger(__name__)
 
+# Parsed queries kept per parser, keyed on the final (substituted) text
+_PARSE_CACHE_SIZE = 128
+
+_PLACEHOLDER_RE = re.compile(r':(\w+)')
+
+
+@functools.lru_cache(maxsize=256)
+def _split_placeholders(query: str) -> Tuple[str, ...]:
+    """Split *query* into alternating text and ``:name`` placeholder names.
+
+    Even indices hold literal text, odd indices placeholder names.  The
+    split is cached per query text, so a statement bound with fresh
+    parameters row after row is scanned only once.
+    """
+    return tuple(_PLACEHOLDER_RE.split(query))
+
+
+def _sql_literal(value: Any) -> str:
+    """Render *value* as an escaped SQL literal."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    # Strings, and unknown types treated as strings for safety
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
 
 class QueryParser:
     """Parser for the quantum SQL dialect."""
@@ -35,6 +68,8 @@ class QueryParser:
     def __init__(self):
         """Initialize the quantum SQL parser."""
         self.quantum_engine = QuantumEngine()
+        self._parse_cache: "OrderedDict[str, ParsedQuery]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Main entry point
@@ -55,6 +90,24 @@ class QueryParser:
         if params:
             query_string = self._substitute_params(query_string, params)
 
+        # Callers (optimizer, executor) mutate what they get back, so the
+        # cache hands out copies; copying is an order of magnitude cheaper
+        # than re-running the regex passes below.
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(query_string)
+            if cached is not None:
+                self._parse_cache.move_to_end(query_string)
+        if cached is not None:
+            return deepcopy(cached)
+
+        parsed = self._parse_uncached(query_string)
+        with self._parse_cache_lock:
+            self._parse_cache[query_string] = deepcopy(parsed)
+            if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        return parsed
+
+    def _parse_uncached(self, query_string: str) -> ParsedQuery:
         normalized = self._normalize_query(query_string)
         query_type = self._determine_query_type(normalized)
 
@@ -89,24 +142,17 @@ class QueryParser:
     # ------------------------------------------------------------------
 
     def _substitute_params(self, query: str, params: Dict[str, Any]) -> str:
-        """Replace ``:name`` placeholders with properly escaped literal values."""
-        result = query
-        for key, value in params.items():
-            placeholder = f":{key}"
-            if isinstance(value, str):
-                escaped = value.replace("'", "''")
-                result = result.replace(placeholder, f"'{escaped}'")
-            elif value is None:
-                result = result.replace(placeholder, "NULL")
-            elif isinstance(value, bool):
-                result = result.replace(placeholder, "TRUE" if value else "FALSE")
-            elif isinstance(value, (int, float)):
-                result = result.replace(placeholder, str(value))
-            else:
-                # Treat unknown types as strings for safety
-                escaped = str(value).replace("'", "''")
-                result = result.replace(placeholder, f"'{escaped}'")
-        return result
+        """Replace ``:name`` placeholders with properly escaped literal values.
+
+        Placeholders are matched by whole name in a single pass, so ``:id``
+        never rewrites part of ``:id2`` and a bound value is never itself
+        scanned for placeholders.  Names without a parameter are left as is.
+        """
+        parts = list(_split_placeholders(query))
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = _sql_literal(params[name]) if name in params else f":{name}"
+        return "".join(parts)
 
     # ------------------------------------------------------------------
     # Normalisation
@@ -10,6 +10,7 @@ dispatched for search, join, and aggregation when the query requests them.
 """
 
 import re
+import heapq
 import logging
 from typing import (
     Any, Callable, Dict, Iterator, List, Optional, Tuple,
@@ -128,16 +129,34 @@ class ProjectOperator(Operator):
 
 
 class SortOperator(Operator):
-    """Sort rows by one or more columns.  Materialises the full child."""
+    """Sort rows by one or more columns.  Materialises the full child.
 
-    def __init__(self, child: Operator, order_by_columns: List[Dict[str, Any]]):
+    With a *limit* (ORDER BY ... LIMIT k) and a single sort direction only
+    the top *k* rows are kept, selected with a heap in O(N log k) instead
+    of sorting all N rows.
+    """
+
+    def __init__(self, child: Operator, order_by_columns: List[Dict[str, Any]],
+                 limit: Optional[int] = None):
         self.child = child
         self.order_by_columns = order_by_columns
+        self.limit = limit
         self._sorted: List[Row] = []
         self._idx = 0
 
     def open(self):
         self.child.open()
+        directions = {spec.get("direction", "ASC").upper() == "DESC"
+                      for spec in self.order_by_columns}
+        if self.limit is not None and len(directions) == 1:
+            # heapq's selections match sorted(...)[:k], ties included
+            cols = [spec["column"] for spec in self.order_by_columns]
+            select = heapq.nlargest if directions.pop() else heapq.nsmallest
+            self._sorted = select(
+                self.limit, self.child,
+                key=lambda r: tuple((r.get(c) is None, r.get(c, '')) for c in cols))
+            self._idx = 0
+            return
         self._sorted = list(self.child)
         for spec in reversed(self.order_by_columns):
             col = spec["column"]
@@ -211,19 +230,31 @@ class AggregateOperator(Operator):
             key = tuple(row.get(g) for g in self.group_by) if self.group_by else ()
             groups.setdefault(key, []).append(row)
 
+        # Parse the select list once, not once per group
+        specs = []
+        for col_expr in self.select_columns:
+            m = self._AGG_RE.match(col_expr)
+            specs.append((col_expr, m.group(1).upper(), m.group(2)) if m
+                         else (col_expr, None, None))
+
         self._results = []
         for key, rows in groups.items():
             out_row: Row = {}
             # group-by columns
             for i, g in enumerate(self.group_by):
                 out_row[g] = key[i]
-            # aggregates & pass-through columns
-            for col_expr in self.select_columns:
-                m = self._AGG_RE.match(col_expr)
-                if m:
-                    func_name = m.group(1).upper()
-                    arg = m.group(2)
-                    out_row[col_expr] = self._compute_agg(func_name, arg, rows)
+            # aggregates & pass-through columns; aggregates over the same
+            # column (SUM(x), AVG(x), MAX(x)) share one pass over the rows
+            values: Dict[str, List[Any]] = {}
+            for col_expr, func_name, arg in specs:
+                if func_name == 'COUNT' and arg == '*':
+                    out_row[col_expr] = len(rows)
+                elif func_name:
+                    vals = values.get(arg)
+                    if vals is None:
+                        vals = values[arg] = [
+                            v for v in (r.get(arg) for r in rows) if v is not None]
+                    out_row[col_expr] = self._compute_agg(func_name, vals)
                 elif col_expr == '*':
                     # pass all columns from first row
                     out_row.update(rows[0])
@@ -236,12 +267,10 @@ class AggregateOperator(Operator):
         self._idx = 0
 
     @staticmethod
-    def _compute_agg(func: str, arg: str, rows: List[Row]) -> Any:
+    def _compute_agg(func: str, vals: List[Any]) -> Any:
+        """Apply *func* to a column's non-null values within one group."""
         if func == 'COUNT':
-            if arg == '*':
-                return len(rows)
-            return sum(1 for r in rows if r.get(arg) is not None)
-        vals = [r.get(arg) for r in rows if r.get(arg) is not None]
+            return len(vals)
         if not vals:
             return None
         if func == 'SUM':
@@ -552,7 +581,7 @@ class QueryExecutor:
 
         # 6. Sort (ORDER BY)
         if parsed.order_by_columns:
-            plan = SortOperator(plan, parsed.order_by_columns)
+            plan = SortOperator(plan, parsed.order_by_columns, limit=parsed.limit)
 
         # 7. Limit
         if parsed.limit is not None:
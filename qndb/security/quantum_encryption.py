@@ -144,15 +144,12 @@ class QuantumEncryption:
         Returns:
             Bob's measurement results
         """
-        bob_results = []
-        for i in range(len(alice_bits)):
-            if bob_bases[i] == alice_bases[i]:
-                # Same basis, Bob gets the same bit
-                bob_results.append(alice_bits[i])
-            else:
-                # Different basis, 50% chance of getting either outcome
-                bob_results.append(1 if self.secure_random.random() < 0.5 else 0)
-        return bob_results
+        # Same basis: Bob gets Alice's bit.  Different basis: a fair coin.
+        # All coins are drawn in one call instead of one draw per bit.
+        bits = np.asarray(alice_bits)
+        coins = self.secure_random.randint(0, 2, size=bits.shape[0])
+        same_basis = np.asarray(alice_bases) == np.asarray(bob_bases)
+        return np.where(same_basis, bits, coins).tolist()
     
     def extract_key_from_matching_bases(self, 
                                      alice_bits: List[int], 
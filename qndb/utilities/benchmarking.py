@@ -29,7 +29,12 @@ logger = logging.getLogger(__name__)
 # ======================================================================
 
 class Timer:
-    """Simple context manager for timing code execution."""
+    """Simple context manager for timing code execution.
+
+    Readings come from ``time.perf_counter_ns()``: monotonic and integer,
+    so sub-microsecond operations are not lost to wall-clock resolution
+    or NTP adjustments.  ``elapsed`` is reported in seconds.
+    """
 
     def __init__(self, name=None):
         self.name = name
@@ -38,12 +43,12 @@ class Timer:
         self.elapsed = None
 
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.end_time = time.time()
-        self.elapsed = self.end_time - self.start_time
+        self.end_time = time.perf_counter_ns()
+        self.elapsed = (self.end_time - self.start_time) / 1e9
         if self.name:
             logger.info("Timer '%s' completed in %.6f seconds", self.name, self.elapsed)
 
@@ -310,15 +315,15 @@ class ResourceProfiler:
                     'rss_memory_bytes': proc.memory_info().rss,
                     'vms_memory_bytes': proc.memory_info().vms,
                 })
-                time.sleep(0.1)
+                stop.wait(0.1)
 
         t = threading.Thread(target=monitor, daemon=True)
         t.start()
-        start = time.time()
+        start = time.perf_counter()
         try:
             result = func(*args, **kwargs)
         finally:
-            end = time.time()
+            end = time.perf_counter()
             stop.set()
             t.join(timeout=1.0)
 
@@ -590,10 +595,10 @@ class CLOPSCalculator:
     def measure(circuit_runner: Callable, num_qubits: int = 5,
                 depth: int = 10, num_circuits: int = 100,
                 shots_per_circuit: int = 100) -> Dict[str, Any]:
-        start = time.time()
+        start_ns = time.perf_counter_ns()
         for _ in range(num_circuits):
             circuit_runner(num_qubits, depth, shots_per_circuit)
-        elapsed = time.time() - start
+        elapsed = (time.perf_counter_ns() - start_ns) / 1e9
         total_layers = num_circuits * depth
         clops = total_layers / elapsed if elapsed > 0 else 0
         return {
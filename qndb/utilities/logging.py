@@ -27,6 +27,28 @@ DEFAULT_BACKUP_COUNT = 5
 _thread_local = threading.local()
 
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders each second's timestamp only once.
+    
+    ``datefmt`` has one-second resolution, so records logged within the
+    same second share a single ``localtime`` + ``strftime`` call.
+    """
+    
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._cached_time = (None, None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_fmt, text = self._cached_time
+        if second != cached_second or datefmt != cached_fmt:
+            text = time.strftime(datefmt, self.converter(record.created))
+            self._cached_time = (second, datefmt, text)
+        return text
+
+
 def configure_logging(config=None):
     """
     Configure the logging system based on provided configuration.
@@ -59,7 +81,7 @@ def configure_logging(config=None):
         root_logger.removeHandler(handler)
     
     # Create formatters
-    formatter = logging.Formatter(log_format, date_format)
+    formatter = _CachedTimeFormatter(log_format, date_format)
     
     # Console handler
     if log_to_console:
@@ -200,11 +222,13 @@ class CircuitLogger:
         self.circuit_id = circuit_id
         set_context('circuit_id', circuit_id)
         
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         metadata_str = ""
         if metadata:
             metadata_str = f" metadata={json.dumps(metadata)}"
         
-        self.logger.info(f"Circuit execution started{metadata_str}")
+        self.logger.info("Circuit execution started%s", metadata_str)
     
     def log_gate(self, gate_name, qubits, parameters=None):
         """
@@ -215,11 +239,13 @@ class CircuitLogger:
             qubits (list): Qubits the gate acts on
             parameters (dict, optional): Gate parameters
         """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         params_str = ""
         if parameters:
             params_str = f" params={json.dumps(parameters)}"
         
-        self.logger.debug(f"Gate {gate_name} applied to qubits {qubits}{params_str}")
+        self.logger.debug("Gate %s applied to qubits %s%s", gate_name, qubits, params_str)
     
     def log_measurement(self, qubits, results):
         """
@@ -229,7 +255,8 @@ class CircuitLogger:
             qubits (list): Measured qubits
             results (dict): Measurement results
         """
-        self.logger.info(f"Measurement on qubits {qubits}: {json.dumps(results)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Measurement on qubits %s: %s", qubits, json.dumps(results))
     
     def end_circuit(self, success=True, error=None):
         """
@@ -240,7 +267,7 @@ class CircuitLogger:
             error (Exception, optional): Error if execution failed
         """
         if success:
-            self.logger.info(f"Circuit execution completed successfully")
+            self.logger.info("Circuit execution completed successfully")
         else:
             error_info = ""
             if error:
@@ -274,16 +301,18 @@ class QueryLogger:
             query_text (str): Query text
         """
         self.query_id = query_id
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         
         set_context('query_id', query_id)
         
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         # Truncate very long queries in the log
         log_query = query_text
         if len(log_query) > 1000:
             log_query = log_query[:997] + "..."
         
-        self.logger.info(f"Query execution started: {log_query}")
+        self.logger.info("Query execution started: %s", log_query)
     
     def log_plan(self, execution_plan):
         """
@@ -292,7 +321,8 @@ class QueryLogger:
         Args:
             execution_plan (dict): Query execution plan
         """
-        self.logger.debug(f"Execution plan: {json.dumps(execution_plan)}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Execution plan: %s", json.dumps(execution_plan))
     
     def log_step(self, step_name, details=None):
         """
@@ -302,11 +332,13 @@ class QueryLogger:
             step_name (str): Step name
             details (dict, optional): Step details
         """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         details_str = ""
         if details:
             details_str = f": {json.dumps(details)}"
         
-        self.logger.debug(f"Query step '{step_name}'{details_str}")
+        self.logger.debug("Query step '%s'%s", step_name, details_str)
     
     def end_query(self, success=True, result_summary=None, error=None):
         """
@@ -318,10 +350,10 @@ class QueryLogger:
             error (Exception, optional): Error if execution failed
         """
         duration = None
-        if self.start_time:
-            duration = time.time() - self.start_time
+        if self.start_time is not None:
+            duration = (time.perf_counter_ns() - self.start_time) / 1e9
         
-        if success:
+        if success and self.logger.isEnabledFor(logging.INFO):
             summary_str = ""
             if result_summary:
                 summary_str = f": {json.dumps(result_summary)}"
@@ -330,8 +362,8 @@ class QueryLogger:
             if duration:
                 duration_str = f" in {duration:.3f}s"
             
-            self.logger.info(f"Query execution completed{duration_str}{summary_str}")
-        else:
+            self.logger.info("Query execution completed%s%s", duration_str, summary_str)
+        elif not success:
             error_info = ""
             if error:
                 error_info = f": {str(error)}"
@@ -343,7 +375,7 @@ class QueryLogger:
             self.logger.error(f"Query execution failed{duration_str}{error_info}")
             
             if error and self.logger.isEnabledFor(logging.DEBUG):
-                self.logger.debug(f"Error traceback: {traceback.format_exc()}")
+                self.logger.debug("Error traceback: %s", traceback.format_exc())
         
         clear_context()
         self.query_id = None
@@ -371,11 +403,14 @@ class PerformanceLogger:
             execution_time (float): Execution time in seconds
             metadata (dict, optional): Additional metadata
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         metadata_str = ""
         if metadata:
             metadata_str = f" metadata={json.dumps(metadata)}"
         
-        self.logger.info(f"Operation '{operation}' completed in {execution_time:.6f}s{metadata_str}")
+        self.logger.info("Operation '%s' completed in %.6fs%s",
+                         operation, execution_time, metadata_str)
     
     def log_resource_usage(self, operation, cpu_percent, memory_mb, metadata=None):
         """
@@ -387,13 +422,15 @@ class PerformanceLogger:
             memory_mb (float): Memory usage in MB
             metadata (dict, optional): Additional metadata
         """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         metadata_str = ""
         if metadata:
             metadata_str = f" metadata={json.dumps(metadata)}"
         
         self.logger.info(
-            f"Resource usage for '{operation}': CPU={cpu_percent:.1f}%, "
-            f"Memory={memory_mb:.2f}MB{metadata_str}"
+            "Resource usage for '%s': CPU=%.1f%%, Memory=%.2fMB%s",
+            operation, cpu_percent, memory_mb, metadata_str
         )
     
     def log_benchmark(self, benchmark_results):
@@ -403,7 +440,8 @@ class PerformanceLogger:
         Args:
             benchmark_results (dict): Benchmark results
         """
-        self.logger.info(f"Benchmark results: {json.dumps(benchmark_results)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Benchmark results: %s", json.dumps(benchmark_results))
 
 
 class LogAnalyzer:
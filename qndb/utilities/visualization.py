@@ -13,6 +13,23 @@ import io
 import base64
 from IPython.display import HTML
 
+
+def _show(fig):
+    """
+    Display a figure without blocking the caller.
+    
+    Under a non-interactive backend such as Agg (headless and batch runs)
+    there is no window to open, so nothing is done.  Otherwise the window
+    is opened non-blocking, so rendering does not stall the calling code.
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figure to display
+    """
+    if getattr(fig.canvas, "required_interactive_framework", None) is None:
+        return
+    plt.show(block=False)
+    fig.canvas.flush_events()
+
 class CircuitVisualizer:
     """Visualizer for quantum circuits and their properties."""
     
@@ -86,7 +103,7 @@ class CircuitVisualizer:
             fig.savefig(filename, dpi=150, bbox_inches='tight', facecolor=self.background_color)
         
         if show:
-            plt.show()
+            _show(fig)
             
         return fig
     
@@ -250,7 +267,7 @@ class StateVisualizer:
             fig.savefig(filename, dpi=150, bbox_inches='tight', facecolor=self.background_color)
         
         if show:
-            plt.show()
+            _show(fig)
             
         return fig
     
@@ -297,7 +314,7 @@ class StateVisualizer:
             fig.savefig(filename, dpi=150, bbox_inches='tight', facecolor=self.background_color)
         
         if show:
-            plt.show()
+            _show(fig)
             
         return fig
     
@@ -451,7 +468,7 @@ class EntanglementVisualizer:
             fig.savefig(filename, dpi=150, bbox_inches='tight', facecolor=self.background_color)
         
         if show:
-            plt.show()
+            _show(fig)
             
         return fig
     
@@ -522,7 +539,7 @@ class EntanglementVisualizer:
             fig.savefig(filename, dpi=150, bbox_inches='tight', facecolor=self.background_color)
         
         if show:
-            plt.show()
+            _show(fig)
             
         return fig
 
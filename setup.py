@@ -33,6 +33,18 @@ extras_require = {
     'braket': [
         "amazon-braket-sdk>=1.50",
     ],
+    'gpu': [
+        "qsimcirq",
+    ],
+    'numba': [
+        "numba",
+    ],
+    'zstd': [
+        "zstandard",
+    ],
+    'orjson': [
+        "orjson",
+    ],
     'hardware': [
         "python-dotenv>=1.0.0",
         "qiskit>=1.0",
@@ -5,10 +5,14 @@ Covers: networking, node_manager, consensus, synchronization,
         query_processor, and cluster_manager.
 """
 import json
+import math
 import os
 import tempfile
+import threading
 import time
+import types
 import unittest
+from unittest import mock
 
 from qndb.distributed.networking import (
     NodeHealth, PartitionState,
@@ -16,10 +20,11 @@ from qndb.distributed.networking import (
     PartitionDetector, TLSConfig,
     TransportChannel, TransportLayer,
     RPCRequest, RPCResponse,
-    encode_message, decode_header, HEADER_SIZE, PROTO_VERSION,
+    encode_message, decode_header, encode_payload, decode_payload,
+    HEADER_SIZE, PROTO_VERSION,
     MSG_HEARTBEAT, MSG_VOTE_REQUEST,
 )
-from qndb.distributed.node_manager import Node, NodeManager
+from qndb.distributed.node_manager import Node, NodeManager, expand_allocation
 from qndb.distributed.consensus import (
     LogEntry, PersistentLog, ConsensusMetrics,
     QuantumConsensusProtocol, QuantumRaft, QuantumPBFT,
@@ -33,7 +38,7 @@ from qndb.distributed.query_processor import (
     PartitionStrategy, PartitionConfig, DataPartitioner,
     QueryFragment, DistributedQueryPlanner,
     DistributedJoinStrategy, DistributedJoinPlanner,
-    DistributedAggregator,
+    DistributedAggregator, DistributedQueryExecutor,
     TwoPhaseCommitState, TwoPhaseCommitCoordinator,
     DistributedDeadlockDetector,
 )
@@ -63,6 +68,19 @@ class TestWireProtocol(unittest.TestCase):
         with self.assertRaises(ValueError):
             decode_header(b"\x00")
 
+    def test_payload_roundtrip(self):
+        heartbeat = {"node_id": "n1", "interval": 5.0, "is_leader": False,
+                     "resources": {"qubits": 100, "qubits_available": 40}}
+        data = encode_payload(heartbeat)
+        self.assertIsInstance(data, bytes)
+        self.assertNotIn(b" ", data)  # compact framing
+        self.assertEqual(decode_payload(data), heartbeat)
+        # Read-only views encode like dicts
+        self.assertEqual(decode_payload(encode_payload(
+            {"r": types.MappingProxyType({"q": 1})})), {"r": {"q": 1}})
+        # Non-string keys still encode (stdlib fallback)
+        self.assertEqual(decode_payload(encode_payload({1: "a"})), {"1": "a"})
+
 
 class TestPhiAccrualFailureDetector(unittest.TestCase):
     def setUp(self):
@@ -82,6 +100,12 @@ class TestPhiAccrualFailureDetector(unittest.TestCase):
         phi_now = self.fd.phi()
         self.assertLess(phi_now, 5.0)
 
+    def test_wall_clock_jump_is_ignored(self):
+        for _ in range(5):
+            self.fd.heartbeat()
+        with mock.patch("time.time", return_value=time.time() + 3600):
+            self.assertTrue(self.fd.is_available)
+
 
 class TestServiceDiscovery(unittest.TestCase):
     def setUp(self):
@@ -131,6 +155,17 @@ class TestPartitionDetector(unittest.TestCase):
     def test_has_quorum_no_peers(self):
         self.assertTrue(self.pd.has_quorum)
 
+    def test_partition_state_from_one_snapshot(self):
+        for i in range(4):
+            self.pd.register_peer(f"p{i}")
+        # p3 went silent long ago: its detector reports maximal suspicion
+        det = self.pd._detectors["p3"]
+        det._intervals = [1000.0, 1000.0]
+        det._last_heartbeat = time.monotonic() - 3600
+        self.assertEqual(self.pd.unreachable_peers(), ["p3"])
+        self.assertEqual(self.pd.reachable_peers(), ["p0", "p1", "p2"])
+        self.assertEqual(self.pd.partition_state, PartitionState.PARTIAL)
+
 
 class TestTransportChannel(unittest.TestCase):
     def test_send_receive(self):
@@ -172,6 +207,15 @@ class TestTransportLayer(unittest.TestCase):
         sent = tl.broadcast("hb", {"t": 1}, exclude={"n3"})
         self.assertEqual(sent, 1)
 
+    def test_broadcast_shares_one_envelope(self):
+        tl = TransportLayer("n1")
+        for rid in ("n2", "n3", "n4"):
+            tl.connect(rid)
+        self.assertEqual(tl.broadcast("hb", {"t": 1}), 3)
+        queued = [tl.get_channel(rid)._outbox[-1] for rid in ("n2", "n3", "n4")]
+        self.assertEqual(len({id(req) for req in queued}), 1)
+        self.assertEqual(queued[0].sender_id, "n1")
+
     def test_disconnect(self):
         tl = TransportLayer("n1")
         tl.connect("n2")
@@ -211,6 +255,13 @@ class TestNodeManager(unittest.TestCase):
     def setUp(self):
         self.manager = NodeManager(node_id="node1")
 
+    def test_generated_node_ids(self):
+        ids = {NodeManager().local_node_id for _ in range(5)}
+        self.assertEqual(len(ids), 5)
+        for nid in ids:
+            self.assertEqual(len(nid), 16)
+            int(nid, 16)  # fixed-width hex: string order is numeric order
+
     def test_register_node(self):
         self.manager.register_node("node2", "localhost", 8000, is_active=True)
         self.assertIn("node2", self.manager.nodes)
@@ -229,6 +280,20 @@ class TestNodeManager(unittest.TestCase):
         self.assertIn("n2", ids)
         self.assertNotIn("n3", ids)
 
+    def test_roster_snapshots_are_copy_on_write(self):
+        self.manager.register_node("n2", "h", 1)
+        nodes, ids = self.manager._node_list, self.manager._active_ids
+        self.manager.register_node("n3", "h", 2)
+        self.manager.deregister_node("n2")
+        # Readers holding the old snapshots still see the old roster
+        self.assertEqual([n.id for n in nodes], ["n2"])
+        self.assertEqual(ids, ("n2", "node1"))
+        self.assertEqual(self.manager._active_ids, ("n3", "node1"))
+        self.assertEqual([n.id for n in self.manager.get_all_nodes()], ["n3"])
+        # Succession reads the published roster without taking the lock
+        with self.manager.lock:
+            self.assertEqual(self.manager._successors(), ("n3",))
+
     def test_mark_node_inactive_and_active(self):
         self.manager.register_node("n2", "h", 1, is_active=True)
         self.manager.mark_node_inactive("n2")
@@ -251,6 +316,720 @@ class TestNodeManager(unittest.TestCase):
         sent = self.manager.broadcast_message({"type": "hb"})
         self.assertGreaterEqual(sent, 1)
 
+    def test_heartbeat_broadcast_and_receive(self):
+        self.manager.register_node("n2", "h", 1)
+        self.manager.register_node("n3", "h", 2)
+        self.manager.update_resources(qubits_available=40)
+        self.assertEqual(self.manager._broadcast_heartbeat(), 2)
+
+        ch = self.manager.transport.get_channel("n2")
+        hb = ch._outbox[-1].payload
+        self.assertIs(hb, self.manager.transport.get_channel("n3")._outbox[-1].payload)
+        self.assertEqual(hb["resources"]["qubits_available"], 40)
+        with self.assertRaises(TypeError):
+            hb["resources"]["qubits_available"] = 0  # shared, read-only
+        self.assertGreater(ch.stats()["bytes_sent"], 0)
+
+        peer = NodeManager(node_id="n2")
+        peer.register_node("node1", "h", 0)
+        self.assertTrue(peer.receive_heartbeat(hb))
+        self.assertEqual(peer.nodes["node1"].resources["qubits_available"], 40)
+        self.assertFalse(peer.receive_heartbeat({"node_id": "ghost"}))
+
+    def test_periodic_tasks_share_one_thread(self):
+        calls = []
+        self.manager.schedule_periodic("a", 0.01, lambda: calls.append("a"))
+        self.manager.schedule_periodic("b", 0.01, lambda: calls.append("b"))
+        thread = self.manager._timer_thread
+        deadline = time.monotonic() + 2
+        while {"a", "b"} - set(calls) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual({"a", "b"}, set(calls))
+        self.assertIs(self.manager._timer_thread, thread)
+
+        # Shutdown interrupts a long sleep immediately
+        self.manager.cancel_periodic("a")
+        self.manager.cancel_periodic("b")
+        self.manager.schedule_periodic("slow", 60, lambda: None)
+        start = time.monotonic()
+        self.manager.shutdown(timeout=5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(thread.is_alive())
+
+    def test_membership_proposals_sent_immediately(self):
+        self.manager.register_node("n2", "h", 1)
+        self.manager.schedule_periodic("heartbeat", 3600, lambda: None)
+        try:
+            channel = self.manager.transport.get_channel("n2")
+            # Not held for the heartbeat tick, even with one scheduled
+            self.manager.propose_add_node("n3", "h", 2)
+            self.manager.propose_remove_node("n3")
+            self.assertEqual([req.payload["action"] for req in channel._outbox],
+                             ["ADD", "REMOVE"])
+        finally:
+            self.manager.shutdown(timeout=5)
+
+        # The receiving manager applies membership changes itself
+        peer = NodeManager(node_id="n2")
+        peer.register_node("node1", "h", 0)
+        peer.transport.get_channel("node1").deliver(channel._outbox[0])
+        self.assertEqual(peer.get_messages(), [])
+        self.assertIn("n3", peer.nodes)
+
+    def test_send_messages_coalesces_into_batches(self):
+        self.manager.register_node("n2", "h", 1)
+        channel = self.manager.transport.get_channel("n2")
+        self.assertEqual(self.manager.send_messages(
+            "n2", [{"type": "QUERY", "q": i} for i in range(3)]), 1)
+        batch = channel._outbox[-1]
+        self.assertEqual(batch.method, "BATCH")
+
+        peer = NodeManager(node_id="n2")
+        peer.register_node("node1", "h", 0)
+        peer.transport.get_channel("node1").deliver(batch)
+        self.assertEqual([m["q"] for m in peer.get_messages()], [0, 1, 2])
+
+    def test_control_messages_dispatched_on_poll(self):
+        leader = NodeManager(node_id="n2")
+        leader.register_node("node1", "h", 0)
+        leader.is_leader = True
+        leader._broadcast_heartbeat()
+        hb = leader.transport.get_channel("node1")._outbox[-1]
+
+        self.manager.register_node("n2", "h", 1)
+        channel = self.manager.transport.get_channel("n2")
+        channel.deliver(hb)
+        channel.deliver(RPCRequest(method="QUERY", payload={"type": "QUERY"},
+                                   sender_id="n2"))
+        # The timer-driven poll answers the heartbeat and keeps the rest
+        self.manager.process_messages()
+        self.assertEqual(self.manager.leader_id, "n2")
+        self.assertEqual(self.manager.get_messages(), [{"type": "QUERY"}])
+        self.assertEqual(self.manager.get_messages(), [])
+
+        channel.deliver(RPCRequest(method="ELECTION", sender_id="n2",
+                                   payload={"type": "ELECTION", "node_id": "n2"}))
+        self.assertEqual(self.manager.get_messages(), [])
+        self.assertEqual(channel._outbox[-1].payload["type"], "ELECTION_OK")
+
+    def test_peer_traffic_counts_as_heartbeat(self):
+        self.manager.register_node("n2", "h", 1)
+        channel = self.manager.transport.get_channel("n2")
+        for _ in range(3):
+            channel.deliver(RPCRequest(method="QUERY", payload={"q": 1}, sender_id="n2"))
+        self.assertEqual(len(self.manager.get_messages()), 3)
+        # One deadline for the burst, not one per message
+        self.assertEqual([p for _, p, _ in self.manager._deadline_heap], ["n2"])
+        channel.deliver(RPCRequest(method="QUERY", payload={}, sender_id="n2"))
+        self.manager.get_messages()
+        self.assertEqual(len(self.manager._deadline_heap), 1)
+
+    def test_timer_does_not_need_the_node_lock(self):
+        manager = NodeManager(node_id="busy")
+        fired = threading.Event()
+        try:
+            with manager.lock:  # e.g. a long allocation in progress
+                manager.schedule_periodic("probe", 0.01, fired.set)
+                self.assertTrue(fired.wait(5))
+                self.assertTrue(manager.cancel_periodic("probe"))
+        finally:
+            manager.shutdown(timeout=5)
+
+    def test_shutdown_stops_timer_between_tasks(self):
+        manager = NodeManager(node_id="stopper")
+        ran = []
+
+        def first():
+            ran.append("first")
+            manager.shutdown()  # from the timer thread itself
+
+        manager.schedule_periodic("a", 0.01, first)
+        manager.schedule_periodic("b", 0.01, lambda: ran.append("second"))
+        manager._timer_thread.join(timeout=5)
+        self.assertFalse(manager._timer_thread.is_alive())
+        self.assertEqual(ran, ["first"])
+        # A stopped manager does not start a new timer thread
+        thread = manager._timer_thread
+        manager.schedule_periodic("c", 0.01, lambda: None)
+        self.assertIs(manager._timer_thread, thread)
+
+    @unittest.skipUnless(hasattr(os, "sched_getaffinity"), "needs CPU affinity")
+    def test_timer_thread_pinned(self):
+        caller_cpus = os.sched_getaffinity(0)
+        cpu = min(caller_cpus)
+        manager = NodeManager(node_id="pinned", timer_cpus={cpu})
+        seen = []
+        manager.schedule_periodic("probe", 0.01,
+                                  lambda: seen.append(os.sched_getaffinity(0)))
+        deadline = time.monotonic() + 2
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        manager.shutdown(timeout=5)
+        self.assertEqual(seen[0], {cpu})
+        self.assertEqual(os.sched_getaffinity(0), caller_cpus)  # caller untouched
+
+    def test_adaptive_heartbeat_interval(self):
+        for i in range(15):
+            self.manager.register_node(f"p{i}", "h", i)
+        self.manager._broadcast_heartbeat()
+        # 5s * sqrt(15 peers + local node) * 0.5
+        self.assertAlmostEqual(self.manager.heartbeat_interval, 10.0)
+        hb = self.manager.transport.get_channel("p0")._outbox[-1].payload
+        self.assertEqual(hb["interval"], 10.0)
+
+        peer = NodeManager(node_id="p0")
+        peer.register_node("node1", "h", 0)
+        peer.receive_heartbeat(hb)
+        now = time.monotonic()
+        self.assertEqual(peer._check_node_timeouts(now + 20), [])  # 3 x 10s not yet up
+        self.assertEqual(peer._check_node_timeouts(now + 31), ["node1"])
+
+    def test_mass_timeout_logs_one_summary(self):
+        for i in range(8):
+            self.manager.register_node(f"p{i}", "h", i)
+            self.manager.record_heartbeat(f"p{i}")
+        with self.assertLogs("qndb.distributed.node_manager", "WARNING") as logs:
+            expired = self.manager._check_node_timeouts(
+                time.monotonic() + self.manager.node_timeout + 1)
+        self.assertEqual(len(expired), 8)
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("8 nodes timed out", logs.output[0])
+
+    def test_cluster_status_snapshot(self):
+        status = self.manager.get_cluster_status()
+        self.assertEqual(status["active_nodes"], 1)
+        self.assertEqual(status["total_qubits"], 100)
+        self.manager.register_node("n2", "h", 1)
+        self.manager.register_node("n3", "h", 2)
+        self.manager.receive_heartbeat({
+            "node_id": "n2",
+            "resources": {"qubits": 50, "qubits_available": 20},
+        })
+        status = self.manager.get_cluster_status()
+        self.assertEqual(status["total_nodes"], 3)
+        self.assertEqual(status["active_nodes"], 3)
+        self.assertEqual(status["total_qubits"], 150)
+        self.assertEqual(status["available_qubits"], 120)
+        # An unchanged report leaves the published snapshot alone
+        self.manager.receive_heartbeat({
+            "node_id": "n2",
+            "resources": {"qubits": 50, "qubits_available": 20},
+        })
+        self.assertIs(self.manager.get_cluster_status(), status)
+        with self.assertRaises(TypeError):
+            status["active_nodes"] = 0  # read-only snapshot
+
+        self.manager.mark_node_inactive("n2")
+        self.manager.update_resources(qubits_available=90)
+        status = self.manager.get_cluster_status()
+        self.assertEqual(status["active_nodes"], 2)
+        self.assertEqual(status["available_qubits"], 90)
+        self.manager.deregister_node("n3")
+        self.assertEqual(self.manager.get_cluster_status()["active_nodes"], 1)
+        info = self.manager.cluster_info()
+        # cluster_info counts registered nodes only: n2, and it is inactive
+        self.assertEqual(info["active_nodes"], 0)
+        self.assertEqual(info["total_nodes"], 1)
+        self.assertEqual((info["total_qubits"], info["available_qubits"]), (0, 0))
+        self.assertEqual(info["nodes"], {"n2": str(self.manager.nodes["n2"])})
+        json.dumps(info)  # a plain, serializable summary
+
+    def test_cluster_info_counts_registered_nodes(self):
+        info = self.manager.cluster_info()
+        self.assertEqual((info["total_nodes"], info["active_nodes"]), (0, 0))
+        self.manager.register_node("b", "h", 1)
+        self.manager.register_node("c", "h", 2, is_active=False)
+        info = self.manager.cluster_info()
+        self.assertEqual((info["total_nodes"], info["active_nodes"]), (2, 1))
+        self.manager.register_node("node1", "h", 0)
+        self.manager.mark_node_inactive("node1")
+        info = self.manager.cluster_info()
+        self.assertEqual(info["total_nodes"], 3)
+        self.assertEqual(info["active_nodes"], len(self.manager.get_active_nodes()))
+        self.assertEqual(info["available_qubits"], 0)  # only b, which reported none
+        self.manager.mark_node_active("node1")
+        info = self.manager.cluster_info()
+        self.assertEqual(info["active_nodes"], len(self.manager.get_active_nodes()))
+        # The local node now counts, with its own resource report
+        self.assertEqual((info["total_qubits"], info["available_qubits"]), (100, 100))
+
+    def test_allocate_and_release_qubits(self):
+        self.assertIsNone(self.manager.allocate_qubits(1))  # followers refuse
+        self.assertEqual(self.manager.release_qubits(["node1:qubit:0"]), 0)
+        self.manager.is_leader = True
+        self.manager.register_node("n2", "h", 1)
+        self.manager.register_node("n3", "h", 2)
+        for peer, available in (("n2", 30), ("n3", 60)):
+            self.manager.receive_heartbeat({
+                "node_id": peer,
+                "resources": {"qubits": 60, "qubits_available": available},
+            })
+        # The local node (100 free) serves a request that fits on it
+        ids = self.manager.allocate_qubits(10)
+        self.assertEqual(ids, [f"node1:qubit:{i}" for i in range(10)])
+        # 90 local + 60 on n3
+        ids = self.manager.allocate_qubits(150)
+        self.assertEqual(len(ids), 150)
+        self.assertIn("n3:qubit:59", ids)
+        self.assertIn("node1:qubit:99", ids)
+        self.assertEqual(self.manager.get_cluster_status()["available_qubits"], 30)
+        self.assertIsNone(self.manager.allocate_qubits(31))
+
+        self.assertEqual(self.manager.release_qubits(ids[:5] + ["gone:qubit:0"]), 5)
+        self.assertEqual(self.manager.get_cluster_status()["available_qubits"], 35)
+        # Only qubits still on the ledger are credited back
+        self.assertEqual(self.manager.release_qubits(ids[:5]), 0)
+        self.assertEqual(self.manager.release_qubits(["n2:qubit:0"]), 0)
+        self.assertEqual(self.manager.get_cluster_status()["available_qubits"], 35)
+        again = self.manager.allocate_qubits(5)
+        self.assertTrue(all(q.startswith("n2:") for q in again))  # n2 has most
+        self.assertEqual(len(set(again) & set(ids)), 0)  # IDs are not reused
+
+        # An inactive node is no longer allocated from
+        self.manager.mark_node_inactive("n2")
+        self.assertEqual(self.manager.get_cluster_status()["available_qubits"], 5)
+        self.assertIsNone(self.manager.allocate_qubits(6))
+        self.assertEqual(self.manager.allocate_qubits(5),
+                         [f"node1:qubit:{i}" for i in range(100, 105)])
+
+    def test_allocate_qubit_blocks(self):
+        self.manager.is_leader = True
+        self.manager.register_node("n2", "h", 1)
+        self.manager.receive_heartbeat({
+            "node_id": "n2", "resources": {"qubits": 60, "qubits_available": 60},
+        })
+        self.assertEqual(self.manager.allocate_qubit_blocks(10), [("node1", 0, 10)])
+        blocks = self.manager.allocate_qubit_blocks(120)
+        self.assertEqual(blocks, [("node1", 10, 90), ("n2", 0, 30)])
+        ids = expand_allocation(blocks)
+        self.assertEqual(len(ids), 120)
+        self.assertEqual(ids[0], "node1:qubit:10")
+        self.assertEqual(ids[-1], "n2:qubit:29")
+        self.assertEqual(expand_allocation([]), [])
+        # Blocks are released without expanding them
+        self.assertEqual(self.manager.release_qubits(blocks), 120)
+        self.assertEqual(self.manager.get_cluster_status()["available_qubits"], 150)
+        self.assertEqual(self.manager.release_qubits(blocks), 0)
+        self.assertEqual(self.manager.release_qubits([]), 0)
+
+    def test_release_qubits_uses_allocation_ledger(self):
+        self.manager.is_leader = True
+        self.manager.register_node("10.0.0.1:7000", "h", 1)
+        self.manager.receive_heartbeat({
+            "node_id": "10.0.0.1:7000",
+            "resources": {"qubits": 200, "qubits_available": 200},
+        })
+        ids = self.manager.allocate_qubits(20)
+        self.assertTrue(all(q.startswith("10.0.0.1:7000:qubit:") for q in ids))
+        # Part of a block, duplicates and a never-allocated index
+        self.assertEqual(self.manager.release_qubits(
+            ids[5:10] + ids[5:7] + ["10.0.0.1:7000:qubit:99"]), 5)
+        self.assertEqual(self.manager._allocated["10.0.0.1:7000"], [(0, 5), (10, 20)])
+        self.assertEqual(self.manager.release_qubits(
+            [("10.0.0.1:7000", 0, 20)]), 15)
+        self.assertNotIn("10.0.0.1:7000", self.manager._allocated)
+        self.assertEqual(self.manager.nodes["10.0.0.1:7000"]
+                         .resources["qubits_available"], 200)
+
+    def test_resource_report_rebuilt_only_for_heartbeats(self):
+        self.manager.is_leader = True
+        self.manager.register_node("n2", "h", 1)
+        self.manager._broadcast_heartbeat()
+        sent = self.manager.transport.get_channel("n2")._outbox[-1].payload
+        for _ in range(3):
+            self.manager.allocate_qubits(10)
+        self.assertIsNone(self.manager._resource_view)
+        self.assertEqual(sent["resources"]["qubits_available"], 100)  # untouched
+        self.manager._broadcast_heartbeat()
+        hb = self.manager.transport.get_channel("n2")._outbox[-1].payload
+        self.assertEqual(dict(hb["resources"]), {"qubits": 100, "qubits_available": 70})
+
+    def test_availability_heap_stays_bounded(self):
+        self.manager.is_leader = True
+        self.manager.register_node("n2", "h", 1)
+        for available in range(1, 500):
+            self.manager.receive_heartbeat({
+                "node_id": "n2",
+                "resources": {"qubits": 1000, "qubits_available": available},
+            })
+        self.assertLess(len(self.manager._avail_heap), 100)
+        # The most recent availability is still the one allocated from
+        ids = self.manager.allocate_qubits(400)
+        self.assertEqual(sum(q.startswith("n2:") for q in ids), 400)
+
+    def test_leader_lease_rides_on_heartbeats(self):
+        leader = NodeManager(node_id="n2")
+        leader.register_node("node1", "h", 0)
+        leader.is_leader = True
+        leader._broadcast_heartbeat()
+        hb = leader.transport.get_channel("node1")._outbox[-1].payload
+        self.assertEqual(hb["ballot"], 1)
+        self.assertEqual(hb["lease"], 5 * hb["interval"])
+
+        lost = []
+        self.manager.on_leader_lost(lost.append)
+        self.manager.register_node("n2", "h", 1)
+        self.manager.receive_heartbeat(hb)
+        self.assertEqual(self.manager.leader_id, "n2")
+        self.assertTrue(self.manager.leader_lease_valid)
+        self.assertEqual(self.manager.get_cluster_status()["leader_id"], "n2")
+
+        # A stale claim does not displace the leaseholder
+        self.manager.register_node("n3", "h", 2)
+        self.manager.receive_heartbeat({"node_id": "n3", "is_leader": True,
+                                        "ballot": 0, "lease": 25.0})
+        self.assertEqual(self.manager.leader_id, "n2")
+
+        # Without renewal the lease runs out on the timer's next check
+        self.manager._check_node_timeouts(time.monotonic() + hb["lease"] + 1)
+        self.assertEqual(lost, ["n2"])
+        # ... and with n2/n3 timed out too, node1 wins the election
+        self.assertTrue(self.manager.is_leader)
+        self.assertEqual(self.manager.leader_id, "node1")
+
+    def test_bully_election_challenges_higher_ids(self):
+        manager = NodeManager(node_id="m")
+        for peer in ("a", "p", "q", "z"):
+            manager.register_node(peer, "h", 1)
+        manager.mark_node_inactive("z")
+        self.assertEqual(manager._start_leader_election(), ["p", "q"])
+        self.assertFalse(manager.is_leader)
+        msg = manager.transport.get_channel("q")._outbox[-1].payload
+        self.assertEqual(msg["type"], "ELECTION")
+        self.assertEqual(manager.transport.get_channel("a")._outbox, [])
+
+        # The top active node answers a challenge and takes over
+        top = NodeManager(node_id="q")
+        for peer in ("m", "p"):
+            top.register_node(peer, "h", 1)
+        self.assertTrue(top.receive_election(msg))
+        self.assertEqual(top.transport.get_channel("m")._outbox[-1].payload["type"],
+                         "ELECTION_OK")
+        self.assertTrue(top.is_leader)
+        self.assertFalse(top.receive_election({"node_id": "z"}))
+
+    def test_modified_bully_asks_best_live_successor(self):
+        leader = NodeManager(node_id="z")
+        for peer in ("a", "m", "p", "q"):
+            leader.register_node(peer, "h", 1)
+        leader.is_leader = True
+        leader._broadcast_heartbeat()
+        hb = leader.transport.get_channel("m")._outbox[-1].payload
+        self.assertEqual(hb["succession"], ("q", "p", "m", "a"))
+        # Unchanged roster: the next heartbeat reuses the same tuple
+        leader._broadcast_heartbeat()
+        self.assertIs(leader.transport.get_channel("m")._outbox[-1].payload["succession"],
+                      hb["succession"])
+
+        manager = NodeManager(node_id="m")
+        for peer in ("a", "p", "q", "z"):
+            manager.register_node(peer, "h", 1)
+        manager.receive_heartbeat(hb)
+        manager.mark_node_inactive("q")
+        # z's lease lapses: only p, the best live successor, is asked
+        manager._check_node_timeouts(time.monotonic() + hb["lease"] + 1)
+        self.assertEqual(manager.transport.get_channel("p")._outbox[-1].payload["type"],
+                         "ELECTION")
+        self.assertEqual(manager.transport.get_channel("a")._outbox, [])
+        self.assertNotIn("ELECTION", [r.payload.get("type") for r in
+                                      manager.transport.get_channel("z")._outbox])
+
+        # A node at the head of the live succession takes over directly
+        successor = NodeManager(node_id="p")
+        for peer in ("a", "m", "q", "z"):
+            successor.register_node(peer, "h", 1)
+        successor.receive_heartbeat(hb)
+        successor.mark_node_inactive("q")
+        successor.mark_node_inactive("z")
+        self.assertEqual(successor._start_leader_election(), [])
+        self.assertTrue(successor.is_leader)
+
+    def test_election_retries_without_silent_challenger(self):
+        leader = NodeManager(node_id="z")
+        for peer in ("a", "m", "p", "q"):
+            leader.register_node(peer, "h", 1)
+        leader.is_leader = True
+        leader._broadcast_heartbeat()
+        hb = leader.transport.get_channel("m")._outbox[-1].payload
+
+        manager = NodeManager(node_id="m")
+        for peer in ("a", "p", "q", "z"):
+            manager.register_node(peer, "h", 1)
+        manager.receive_heartbeat(hb)
+        manager.mark_node_inactive("q")
+        t1 = time.monotonic() + hb["lease"] + 1
+        manager._check_node_timeouts(t1)
+        self.assertEqual(manager._election_challenged, ("p",))
+        # p never answers: nothing happens until the election deadline ...
+        deadline = manager._election_deadline
+        manager._check_node_timeouts(deadline - 1)
+        self.assertFalse(manager.is_leader)
+        # ... then the round is re-run without p, and m is next in line
+        manager._check_node_timeouts(deadline)
+        self.assertTrue(manager.is_leader)
+        self.assertEqual(manager._election_excluded, set())
+        self.assertEqual(manager._election_deadline, math.inf)
+
+    def test_silent_successor_falls_back_to_plain_bully(self):
+        leader = NodeManager(node_id="z")
+        for peer in ("a", "m", "p", "q", "r"):
+            leader.register_node(peer, "h", 1)
+        leader.is_leader = True
+        leader._broadcast_heartbeat()
+        hb = leader.transport.get_channel("m")._outbox[-1].payload
+
+        manager = NodeManager(node_id="m")
+        for peer in ("a", "p", "q", "r", "z"):
+            manager.register_node(peer, "h", 1)
+        manager.receive_heartbeat(hb)
+        manager._check_node_timeouts(time.monotonic() + hb["lease"] + 1)
+        self.assertEqual(manager._election_challenged, ("r",))
+        # r is live but silent: every other higher ID is challenged next
+        manager._check_node_timeouts(manager._election_deadline)
+        self.assertEqual(manager._election_challenged, ("p", "q"))
+        self.assertEqual(manager.transport.get_channel("q")._outbox[-1].payload["type"],
+                         "ELECTION")
+        self.assertFalse(manager.is_leader)
+
+    def test_global_name_leader_claim(self):
+        registry = ServiceDiscovery()
+        a = NodeManager(node_id="a", leader_registry=registry)
+        b = NodeManager(node_id="b", leader_registry=registry)
+        a.register_node("b", "h", 1)
+        b.register_node("a", "h", 0)
+
+        # One claim elects a leader; no election messages are sent
+        self.assertEqual(a._start_leader_election(), [])
+        self.assertTrue(a.is_leader)
+        self.assertEqual(b._start_leader_election(), [])
+        self.assertFalse(b.is_leader)
+        self.assertEqual(b.leader_id, "a")
+        self.assertEqual(b.transport.get_channel("a")._outbox, [])
+
+        # The leader renews the claim with each heartbeat; once it releases
+        # the name (self-demotion) the next claimant wins
+        a._broadcast_heartbeat()
+        self.assertEqual(registry.claim_name(a._global_name, "b", 1.0), "a")
+        a._self_demote()
+        self.assertFalse(a.is_leader)
+        b._start_leader_election()
+        self.assertTrue(b.is_leader)
+
+    def test_lost_claim_grants_holder_a_lease(self):
+        registry = ServiceDiscovery()
+        a = NodeManager(node_id="a", leader_registry=registry)
+        b = NodeManager(node_id="b", leader_registry=registry)
+        a.register_node("b", "h", 1)
+        b.register_node("a", "h", 0)
+        a._start_leader_election()
+        lost = []
+        b.on_leader_lost(lost.append)
+        b._start_leader_election()
+        self.assertEqual(b.leader_id, "a")
+        self.assertTrue(b.leader_lease_valid)
+        for _ in range(3):
+            b._check_node_timeouts()
+        self.assertEqual(lost, [])
+        self.assertEqual(b.leader_id, "a")
+        # The holder's first heartbeat is accepted whatever its claim
+        a._broadcast_heartbeat()
+        hb = a.transport.get_channel("b")._outbox[-1].payload
+        self.assertTrue(b.receive_heartbeat(hb))
+        self.assertEqual(b._leader_claim, a._leader_claim)
+
+    def test_leader_clash_releases_claim(self):
+        registry = ServiceDiscovery()
+        a = NodeManager(node_id="a", leader_registry=registry)
+        a.register_node("b", "h", 1)
+        a._start_leader_election()
+        # After a partition heals, b shows up leading on a newer ballot
+        a.receive_heartbeat({"node_id": "b", "is_leader": True,
+                             "ballot": 7, "lease": 25.0})
+        self.assertFalse(a.is_leader)
+        self.assertEqual(a.leader_id, "b")
+        self.assertEqual(registry.claim_name(a._global_name, "b", 1.0), "b")
+
+    def test_equal_leader_claims_resolve_to_one_leader(self):
+        a = NodeManager(node_id="a", is_leader=True)
+        b = NodeManager(node_id="b", is_leader=True)
+        a.register_node("b", "h", 1)
+        b.register_node("a", "h", 1)
+        for _ in range(2):
+            a._broadcast_heartbeat()
+            b._broadcast_heartbeat()
+            a.receive_heartbeat(b.transport.get_channel("a")._outbox[-1].payload)
+            b.receive_heartbeat(a.transport.get_channel("b")._outbox[-1].payload)
+        # Same ballot and version: the higher ID keeps leading
+        self.assertEqual((a.is_leader, b.is_leader), (False, True))
+        self.assertEqual((a.leader_id, b.leader_id), ("b", "b"))
+        self.assertTrue(a.leader_lease_valid)
+
+    def test_leader_step_down_starts_election(self):
+        leader = NodeManager(node_id="z")
+        for peer in ("a", "m"):
+            leader.register_node(peer, "h", 1)
+        leader.is_leader = True
+        leader._broadcast_heartbeat()
+        hb = leader.transport.get_channel("m")._outbox[-1].payload
+
+        manager = NodeManager(node_id="m")
+        for peer in ("a", "z"):
+            manager.register_node(peer, "h", 1)
+        manager.receive_heartbeat(hb)
+        self.assertEqual(manager.leader_id, "z")
+        leader.is_leader = False
+        leader._broadcast_heartbeat()
+        manager.receive_heartbeat(leader.transport.get_channel("m")._outbox[-1].payload)
+        # m heads z's succession list, so it takes over at once
+        self.assertTrue(manager.is_leader)
+        self.assertEqual(manager.leader_id, "m")
+
+    def test_higher_ballot_demotes_leader(self):
+        self.manager.is_leader = True
+        self.manager.register_node("n2", "h", 1)
+        self.manager.receive_heartbeat({"node_id": "n2", "is_leader": True,
+                                        "ballot": 5, "lease": 25.0})
+        self.assertFalse(self.manager.is_leader)
+        self.assertEqual(self.manager.leader_id, "n2")
+        # Our next claim outranks the ballot we have seen
+        self.manager.is_leader = True
+        self.assertEqual(self.manager._ballot, 6)
+
+    def test_leader_change_sends_heartbeat(self):
+        self.manager.register_node("n2", "h", 1)
+        self.manager.start()
+        try:
+            channel = self.manager.transport.get_channel("n2")
+            sent = len(channel._outbox)
+            self.manager.is_leader = True
+            self.assertEqual(len(channel._outbox), sent + 1)
+            self.assertTrue(channel._outbox[-1].payload["is_leader"])
+            # Losing to a newer ballot announces the step-down the same way
+            self.manager.receive_heartbeat({"node_id": "n2", "is_leader": True,
+                                            "ballot": 5, "lease": 25.0})
+            self.assertFalse(self.manager.get_cluster_status()["is_leader"])
+            self.assertFalse(channel._outbox[-1].payload["is_leader"])
+        finally:
+            self.manager.shutdown(timeout=5)
+
+    def test_check_node_timeouts(self):
+        self.manager.register_node("n2", "h", 1)
+        self.manager.register_node("n3", "h", 2)
+        self.manager.record_heartbeat("n2")
+        self.manager.record_heartbeat("n3")
+        # n3 advertises a slower interval, superseding its first deadline
+        self.manager._peer_intervals["n3"] = 100.0
+        self.manager.record_heartbeat("n3")
+        later = time.monotonic() + self.manager.node_timeout + 1
+        self.assertEqual(self.manager._check_node_timeouts(later), ["n2"])
+        self.assertFalse(self.manager.nodes["n2"].is_active)
+        self.assertTrue(self.manager.nodes["n3"].is_active)
+        # Only n3's current deadline is left on the heap
+        self.assertEqual([p for _, p, _ in self.manager._deadline_heap], ["n3"])
+
+        # A heartbeat brings the timed-out node back
+        self.assertTrue(self.manager.receive_heartbeat({"node_id": "n2"}))
+        self.assertTrue(self.manager.nodes["n2"].is_active)
+        self.assertIn("n2", self.manager._active_ids)
+        self.assertEqual(self.manager.get_cluster_status()["active_nodes"], 3)
+        self.assertNotIn("n2", self.manager._inactive_since)
+
+    def test_timeout_check_with_nothing_due_skips_the_lock(self):
+        self.manager.register_node("n2", "h", 1)
+        self.manager.record_heartbeat("n2")
+        result = []
+        with self.manager.lock:
+            checker = threading.Thread(
+                target=lambda: result.append(self.manager._check_node_timeouts()))
+            checker.start()
+            checker.join(timeout=5)
+            self.assertEqual(result, [[]])
+        # Once a deadline has passed the check does its work
+        later = time.monotonic() + self.manager.node_timeout + 1
+        self.assertEqual(self.manager._check_node_timeouts(later), ["n2"])
+
+    def test_routine_heartbeat_skips_the_lock(self):
+        self.manager.register_node("n2", "h", 1)
+        self.manager.receive_heartbeat({"node_id": "n2"})  # first: slow path
+        first_deadline = self.manager._deadline_heap[0][0]
+        result = []
+        with self.manager.lock:
+            beat = threading.Thread(target=lambda: result.append(
+                self.manager.receive_heartbeat({"node_id": "n2", "ballot": 0})))
+            beat.start()
+            beat.join(timeout=5)
+            self.assertEqual(result, [True])
+        self.assertEqual(len(self.manager._deadline_heap), 1)  # nothing pushed
+        # The stale deadline is pushed back rather than expiring the peer
+        self.manager._last_beat["n2"] += 5
+        self.assertEqual(self.manager._check_node_timeouts(first_deadline + 1), [])
+        self.assertTrue(self.manager.nodes["n2"].is_active)
+        self.assertEqual(self.manager._deadline_heap[0][0],
+                         self.manager._last_beat["n2"] + self.manager.node_timeout)
+        # A newer ballot still goes through the locked path
+        self.manager.receive_heartbeat({"node_id": "n2", "ballot": 7})
+        self.assertEqual(self.manager._ballot, 7)
+
+    def test_heartbeat_racing_deregistration_leaves_no_timing(self):
+        detector = self.manager.partition_detector
+        for first in (True, False):  # slow path, then the lock-free one
+            self.manager.register_node("n2", "h", 1)
+            if not first:
+                self.manager.receive_heartbeat({"node_id": "n2"})
+            # The node goes away between the unlocked lookup and the writes
+            with mock.patch.object(detector, "record_heartbeat",
+                                   side_effect=lambda _p: self.manager.deregister_node("n2")):
+                ok = self.manager.receive_heartbeat({"node_id": "n2", "interval": 0.5})
+            self.assertFalse(ok)
+            self.assertNotIn("n2", self.manager._peer_intervals)
+            self.assertNotIn("n2", self.manager._last_beat)
+            self.assertNotIn("n2", self.manager._hb_epoch)
+
+    def test_churn_leaves_no_availability_state(self):
+        self.manager.is_leader = True
+        resources = {"qubits": 200, "qubits_available": 200}
+
+        def join(peer):
+            self.manager.register_node(peer, "h", 1)
+            self.manager.receive_heartbeat({"node_id": peer, "resources": resources})
+
+        for i in range(2000):
+            join(f"p{i}")
+            # The peer has the most free qubits, so it serves the request
+            self.assertEqual(self.manager.allocate_qubit_blocks(10), [(f"p{i}", 0, 10)])
+            self.manager.deregister_node(f"p{i}")
+        self.assertEqual(set(self.manager._avail_epoch), {"node1"})
+        self.assertEqual(self.manager._qubit_next_idx, {})
+        self.assertEqual(self.manager._allocated, {})
+        self.assertLess(len(self.manager._avail_heap), 100)
+        # A returning ID starts clean; its old heap entries stay stale
+        join("p0")
+        self.assertEqual(self.manager.allocate_qubit_blocks(195), [("p0", 0, 195)])
+
+    def test_long_inactive_nodes_are_evicted(self):
+        for peer in ("n2", "n3", "n4"):
+            self.manager.register_node(peer, "h", 1)
+            self.manager.record_heartbeat(peer)
+        t0 = time.monotonic() + self.manager.node_timeout + 1
+        self.assertEqual(self.manager._check_node_timeouts(t0), ["n2", "n3", "n4"])
+        # Within the window the dead nodes are kept
+        self.manager._check_node_timeouts(t0 + 1)
+        self.assertIn("n2", self.manager.nodes)
+        self.manager.mark_node_inactive("n3")  # now disabled by an admin
+        self.manager.receive_heartbeat({"node_id": "n4"})  # came back
+        # Nodes disabled or registered inactive are never timed out
+        self.manager.register_node("n5", "h", 1)
+        self.manager.mark_node_inactive("n5")
+        self.manager.register_node("n6", "h", 1, is_active=False)
+
+        horizon = t0 + self.manager.node_eviction_timeout + 1
+        self.manager._check_node_timeouts(horizon)
+        self.assertEqual(sorted(self.manager.nodes), ["n3", "n4", "n5", "n6"])
+        # n4 went silent again at the horizon; it starts a fresh window
+        self.assertEqual(list(self.manager._inactive_since), ["n4"])
+        self.assertEqual(self.manager.get_cluster_status()["total_nodes"], 5)
+        self.assertIsNone(self.manager.transport.get_channel("n2"))
+
 
 # ======================================================================
 # Consensus — Persistent log
@@ -386,6 +1165,22 @@ class TestQuantumRaft(unittest.TestCase):
         raft.handle_vote_response({"vote_granted": True, "term": 1, "node_id": "n2"})
         self.assertEqual(raft.state, "LEADER")
 
+    def test_send_heartbeats_batches_caught_up_followers(self):
+        raft = self._make_raft()
+        raft.start_election()
+        raft.become_leader()
+        transport = raft.node_manager.transport
+        # Only n2 has acknowledged the leader's log
+        raft.next_index["n2"] = raft.log.last_index() + 1
+        raft.send_heartbeats()
+
+        n2_msg = transport.get_channel("n2")._outbox[-1].payload
+        n3_msg = transport.get_channel("n3")._outbox[-1].payload
+        self.assertEqual(n2_msg["entries"], [])
+        self.assertEqual(n2_msg["prev_log_index"], raft.log.last_index())
+        self.assertEqual(len(n3_msg["entries"]), raft.log.last_index())
+        self.assertEqual(raft.metrics.messages_sent, 2 + 2)  # votes + heartbeats
+
     def test_handle_append_entries(self):
         raft = self._make_raft()
         resp = raft.handle_append_entries({
@@ -605,6 +1400,22 @@ class TestQuantumStateSynchronizer(unittest.TestCase):
             consistency=ConsistencyLevel.ONE,
         )
 
+    def test_sync_service_runs_on_node_timer(self):
+        calls = []
+        self.sync.sync_interval = 0.01
+        self.sync.sync_with_nodes = lambda: calls.append(1)
+        self.sync.start_sync_service()
+        try:
+            deadline = time.monotonic() + 2
+            while not calls and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(calls)
+            self.assertIn("state_sync", self.nm._tasks)
+        finally:
+            self.sync.stop_sync_service()
+            self.nm.shutdown(timeout=5)
+        self.assertNotIn("state_sync", self.nm._tasks)
+
     def test_put_and_get(self):
         rv = self.sync.put("key1", "value1")
         self.assertEqual(rv.key, "key1")
@@ -689,6 +1500,27 @@ class TestDistributedQueryPlanner(unittest.TestCase):
         self.assertIn("n2", targets)
 
 
+class TestDistributedQueryExecutor(unittest.TestCase):
+    def setUp(self):
+        self.nm = NodeManager(node_id="n1")
+        self.nm.register_node("n2", "h", 2)
+        self.nm.register_node("n3", "h", 3)
+
+    def test_fragments_coalesced_per_node(self):
+        dp = DataPartitioner()
+        dp.configure(PartitionConfig(table="t", num_partitions=6))
+        executor = DistributedQueryExecutor(self.nm, dp)
+        executor.execute_query("SELECT * FROM t", table="t")
+        sent = {}
+        for node_id in ("n2", "n3"):
+            outbox = self.nm.transport.get_channel(node_id)._outbox
+            self.assertEqual([req.method for req in outbox], ["BATCH"])
+            sent[node_id] = [m["fragment"]["partition_id"]
+                             for m in outbox[0].payload["messages"]]
+        self.assertEqual(sorted(sent["n2"] + sent["n3"]), list(range(6)))
+        self.assertFalse(set(sent["n2"]) & set(sent["n3"]))
+
+
 class TestDistributedJoinPlanner(unittest.TestCase):
     def setUp(self):
         self.nm = NodeManager(node_id="n1")
@@ -727,6 +1559,16 @@ class TestDistributedAggregator(unittest.TestCase):
         self.assertEqual(merged["MIN_val"], 2)
         self.assertEqual(merged["MAX_val"], 80)
 
+    def test_merge_histograms(self):
+        agg = DistributedAggregator()
+        first = {"00": 480, "11": 520}
+        agg.add_partial("q1", {"counts": first, "shots": 1000})
+        agg.add_partial("q1", {"counts": {"00": 500, "01": 3}, "shots": 1003})
+        merged = agg.merge("q1")
+        self.assertEqual(merged["counts"], {"00": 980, "11": 520, "01": 3})
+        self.assertEqual(merged["shots"], 1003)  # last writer wins
+        self.assertEqual(first, {"00": 480, "11": 520})  # partial untouched
+
     def test_clear(self):
         agg = DistributedAggregator()
         agg.add_partial("q1", {"COUNT_x": 1})
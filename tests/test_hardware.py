@@ -172,6 +172,15 @@ class TestBackendRegistry(unittest.TestCase):
         selected = reg.select_backend(min_qubits=2)
         self.assertIsNotNone(selected)
 
+    def test_connect_all_reports_each_backend(self):
+        reg = BackendRegistry()
+        reg.auto_register_defaults()
+        results = reg.connect_all({"ionq": {"api_key": "unused"}})
+        self.assertEqual(set(results), set(reg.list_backends()))
+        # No vendor SDKs are installed, only the simulator connects
+        self.assertTrue(results["simulator"])
+        self.assertFalse(results["ionq"])
+
 
 # ======================================================================
 # 6.1 Hardware backends (fallback mode)
@@ -447,6 +456,22 @@ class TestCircuitKnitter(unittest.TestCase):
         fragments = knitter.cut(_ghz_circuit(6))
         self.assertGreaterEqual(len(fragments), 1)
 
+    def test_cut_routes_ops_to_their_group(self):
+        q = cirq.LineQubit.range(4)
+        circuit = cirq.Circuit([
+            cirq.H(q[0]), cirq.CNOT(q[0], q[1]),   # group 0
+            cirq.X(q[3]), cirq.CZ(q[2], q[3]),     # group 1
+            cirq.CNOT(q[1], q[2]),                 # crosses groups: dropped
+        ])
+        knitter = CircuitKnitter(max_qubits=2)
+        with self.assertLogs("qndb.core.engine.hardware.hybrid_executor", "WARNING"):
+            fragments = knitter.cut(circuit)
+        self.assertEqual(len(fragments), 2)
+        self.assertEqual(list(fragments[0].all_operations()),
+                         [cirq.H(q[0]), cirq.CNOT(q[0], q[1])])
+        self.assertEqual(list(fragments[1].all_operations()),
+                         [cirq.X(q[3]), cirq.CZ(q[2], q[3])])
+
     def test_reconstruct(self):
         knitter = CircuitKnitter(max_qubits=10)
         sim = cirq.Simulator()
@@ -1,6 +1,7 @@
 import unittest
 import logging
 import sys
+import time
 from unittest.mock import MagicMock, patch
 
 from qndb.interface.query_language import QueryParser, ParsedQuery, QueryType
@@ -107,6 +108,16 @@ class TestQueryParser(unittest.TestCase):
             elif "table1" in parsed:
                 self.assertEqual(parsed["table1"], "table1")
         
+    def test_repeated_parse_returns_independent_copies(self):
+        """Repeated query text is served from the parse cache as a copy."""
+        query = "SELECT a, b FROM table1 WHERE a = 1"
+        first = self.parser.parse(query)
+        first.columns.append("mutated")
+        second = self.parser.parse(query)
+        self.assertEqual(second.columns, ["a", "b"])
+        self.assertIsNot(second, first)
+        self.assertEqual(second.to_dict(), self.parser._parse_uncached(query).to_dict())
+
     def test_invalid_query(self):
         """Test handling invalid query syntax."""
         logger.debug("Testing invalid_query")
@@ -194,6 +205,27 @@ class TestDatabaseClient(unittest.TestCase):
             logger.error(f"Execute query error: {str(e)}")
             # Continue with other tests
         
+    def test_execute_many_batches_parameter_rows(self):
+        """One parameterized statement runs once per row in a single batch."""
+        self.client.transaction_manager = MagicMock()
+        self.client.query_parser = MagicMock()
+        self.client.query_parser.parse.return_value.to_dict.return_value = {}
+        self.client.access_controller = MagicMock()
+        self.client.access_controller.authorize_query.return_value = True
+        self.client.query_optimizer = MagicMock()
+        self.client.job_scheduler = MagicMock()
+        self.client.connection = MagicMock()
+        self.client.connection.user_id = "test_user"
+        rows = [{"id": i, "name": f"c{i}"} for i in range(3)]
+        results = self.client.execute_many(
+            "INSERT INTO customers (id, name) VALUES (:id, :name)", rows)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual([c.args[1] for c in self.client.query_parser.parse.call_args_list], rows)
+        self.client.transaction_manager.begin_transaction.assert_called_once()
+        # The user is resolved once for the whole batch
+        self.client.access_controller.get_user_by_username.assert_called_once_with("test_user")
+
     def test_disconnect(self):
         """Test disconnecting from the database."""
         logger.debug("Testing disconnect")
@@ -473,6 +505,14 @@ class TestQueryParserPhase2(unittest.TestCase):
         # name should be escaped
         self.assertIn("O''Brien", p.raw_query)
 
+    def test_param_substitution_matches_whole_names(self):
+        q = "SELECT * FROM t WHERE id = :id AND id2 = :id2 AND note = :note"
+        bound = self.parser._substitute_params(
+            q, {"id": 1, "id2": None, "note": ":id"})
+        self.assertEqual(
+            bound, "SELECT * FROM t WHERE id = 1 AND id2 = NULL AND note = ':id'")
+        self.assertEqual(self.parser._substitute_params(q, {}), q)
+
     # ----- query validation -----
 
     def test_validate_having_without_group_by(self):
@@ -556,6 +596,17 @@ class TestQueryExecutor(unittest.TestCase):
         rows = self._exec("SELECT * FROM vals ORDER BY v ASC")
         self.assertEqual([r["v"] for r in rows], [1, 2, 3])
 
+    def test_select_order_by_with_limit_keeps_top_rows(self):
+        self._exec("CREATE TABLE sales (id INT, amount INT)")
+        for i, amount in enumerate([40, 10, 50, 30, 50, 20]):
+            self._exec(f"INSERT INTO sales (id, amount) VALUES ({i}, {amount})")
+        rows = self._exec("SELECT * FROM sales ORDER BY amount DESC LIMIT 3")
+        # Ties keep insertion order, exactly as a full sort would
+        self.assertEqual([(r["id"], r["amount"]) for r in rows],
+                         [(2, 50), (4, 50), (0, 40)])
+        rows = self._exec("SELECT * FROM sales ORDER BY amount ASC LIMIT 2")
+        self.assertEqual([r["amount"] for r in rows], [10, 20])
+
     def test_update(self):
         self._exec("CREATE TABLE t (id INT, val INT)")
         self._exec("INSERT INTO t (id, val) VALUES (1, 10)")
@@ -581,6 +632,19 @@ class TestQueryExecutor(unittest.TestCase):
         self.assertEqual(counts["INFO"], 3)
         self.assertEqual(counts["ERROR"], 2)
 
+    def test_select_several_aggregates_of_one_column(self):
+        self._exec("CREATE TABLE orders (region TEXT, amount INT)")
+        for region, amount in [('EU', 10), ('EU', 30), ('US', 5), ('EU', 20)]:
+            self._exec(f"INSERT INTO orders (region, amount) VALUES ('{region}', {amount})")
+        rows = self._exec("SELECT region, SUM(amount), AVG(amount), MAX(amount), "
+                          "COUNT(amount), COUNT(*) FROM orders GROUP BY region")
+        eu = next(r for r in rows if r["region"] == 'EU')
+        self.assertEqual(eu["SUM(amount)"], 60)
+        self.assertEqual(eu["AVG(amount)"], 20)
+        self.assertEqual(eu["MAX(amount)"], 30)
+        self.assertEqual(eu["COUNT(amount)"], 3)
+        self.assertEqual(eu["COUNT(*)"], 3)
+
 
 class TestTransactionManagerPhase2(unittest.TestCase):
     """Tests for transaction manager enhancements."""
@@ -641,6 +705,13 @@ class TestConnectionPoolPhase2(unittest.TestCase):
             "port": 5000,
         })
 
+    def test_close_stops_maintenance_promptly(self):
+        start = time.monotonic()
+        self.pool.close_all_connections()
+        self.assertFalse(self.pool.maintenance_thread.is_alive())
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(len(self.pool.idle_connections), 0)
+
     def test_connection_ping(self):
         conn = self.pool.get_connection()
         self.assertTrue(conn.ping())
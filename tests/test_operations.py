@@ -112,6 +112,43 @@ class TestQuantumJoin(unittest.TestCase):
             logger.error(f"Error in inner_join: {e}")
             self.fail(f"inner_join raised exception: {e}")
     
+    def test_inner_join_small_registers(self):
+        """Test small joins copy with direct controlled CNOTs (no fan-out ancillae)."""
+        logger.debug("Testing inner_join depth and width on small registers")
+        keys_a, keys_b, out_keys = (cirq.LineQubit.range(i, i + 2) for i in (0, 10, 20))
+        values_a, values_b = cirq.LineQubit.range(30, 31), cirq.LineQubit.range(40, 41)
+        out_a, out_b = cirq.LineQubit.range(50, 51), cirq.LineQubit.range(60, 61)
+        flag = cirq.LineQubit(70)
+        
+        join_circuit = self.join.inner_join(keys_a, values_a, keys_b, values_b,
+                                            out_keys, out_a, out_b, flag)
+        
+        direct = self.join.gates.create_equality_test(keys_a, keys_b, flag)
+        direct += [cirq.TOFFOLI(flag, s, d) for s, d in
+                   zip(keys_a + values_a + values_b, out_keys + out_a + out_b)]
+        self.assertEqual(join_circuit.all_qubits(), direct.all_qubits())
+        self.assertLessEqual(len(join_circuit), len(direct))
+    
+    def test_simulate_classical(self):
+        """Test the classical basis-state join matches a nested-loop join."""
+        logger.debug("Testing simulate_classical")
+        keys_a = np.array([1, 2, 3, 2], dtype=np.uint64)
+        values_a = np.array([10, 20, 30, 21], dtype=np.uint64)
+        keys_b = np.array([2, 4, 2, 1], dtype=np.uint64)
+        values_b = np.array([200, 400, 201, 100], dtype=np.uint64)
+        
+        result = self.join.simulate_classical(keys_a, values_a, keys_b, values_b)
+        
+        expected = sorted(
+            (int(ka), int(va), int(vb))
+            for ka, va in zip(keys_a, values_a)
+            for kb, vb in zip(keys_b, values_b)
+            if ka == kb
+        )
+        joined = sorted(zip(result["keys"].tolist(), result["values_a"].tolist(),
+                            result["values_b"].tolist()))
+        self.assertEqual(joined, expected)
+    
     def test_left_join(self):
         """Test left join quantum circuit."""
         logger.debug("Testing left_join")
@@ -259,6 +296,28 @@ class TestDatabaseGates(unittest.TestCase):
             logger.error(f"Error in create_amplitude_amplification: {e}")
             self.fail(f"create_amplitude_amplification raised exception: {e}")
 
+    def test_create_fanout_controlled_cnot(self):
+        """Test fan-out controlled copy matches per-pair controlled CNOTs."""
+        logger.debug("Testing create_fanout_controlled_cnot")
+        flag = cirq.LineQubit(0)
+        sources = [cirq.LineQubit(i) for i in range(1, 6)]
+        destinations = [cirq.LineQubit(i) for i in range(6, 11)]
+        
+        fanout_circuit = self.gates.create_fanout_controlled_cnot(flag, sources, destinations,
+                                                                 num_copies=3)
+        logger.debug(f"Fan-out circuit: {fanout_circuit}")
+        
+        # Run on |flag=1, sources=10110>; destinations must receive the copy
+        ancillas = sorted(q for q in fanout_circuit.all_qubits() if isinstance(q, cirq.NamedQubit))
+        source_bits = [1, 0, 1, 1, 0]
+        prep = cirq.Circuit([cirq.X(flag)] + [cirq.X(q) for q, b in zip(sources, source_bits) if b])
+        measure = cirq.Circuit(cirq.measure(*destinations, key="dst"),
+                               cirq.measure(*ancillas, key="anc"))
+        result = cirq.Simulator().run(prep + fanout_circuit + measure, repetitions=1)
+        
+        self.assertEqual(list(result.measurements["dst"][0]), source_bits)
+        self.assertEqual(int(result.measurements["anc"].sum()), 0)
+
 
 if __name__ == "__main__":
     logger.info("Starting quantum operations tests")
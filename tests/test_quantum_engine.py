@@ -1,3 +1,4 @@
+import importlib.util
 import unittest
 import numpy as np
 import cirq
@@ -233,6 +234,36 @@ class TestQuantumEngine(unittest.TestCase):
         logger.debug(f"All rotation operations: {operations}")
         self.assertEqual(len(operations), 3)
         
+    def test_run_circuits_batch(self):
+        """Test running one parameterised circuit over several resolvers."""
+        logger.debug("Testing run_circuits_batch")
+
+        theta = self.engine.create_parameter("theta")
+        self.engine.apply_operation("Rx", [0], [theta])
+        self.engine.measure_qubits([0], "m")
+
+        results = self.engine.run_circuits_batch(
+            [{"theta": 0.0}, {"theta": np.pi}], repetitions=20
+        )
+        self.assertEqual(len(results), 2)
+        self.assertTrue(np.all(results[0]["m"] == 0))
+        self.assertTrue(np.all(results[1]["m"] == 1))
+
+    def test_run_circuit_packed(self):
+        """Test packed measurement output round-trips through unpackbits."""
+        logger.debug("Testing run_circuit_packed")
+
+        self.engine.apply_operation("X", [1])
+        self.engine.measure_qubits([0, 1], "a")
+        self.engine.measure_qubits([2], "b")
+
+        packed, key_order = self.engine.run_circuit_packed(repetitions=10)
+        self.assertEqual(sorted(key_order), [("a", 2), ("b", 1)])
+        self.assertEqual(packed.shape, (10, 1))
+        bits = np.unpackbits(packed, axis=1, count=3)
+        expected = {"a": [0, 1], "b": [0]}
+        self.assertTrue(np.all(bits == sum((expected[k] for k, _ in key_order), [])))
+
     def test_circuit_depth(self):
         """Test circuit depth calculation."""
         logger.debug("Testing circuit depth estimation")
@@ -273,6 +304,141 @@ class TestQuantumEngine(unittest.TestCase):
             self.assertGreaterEqual(moment_count, 3, 
                                   "Circuit should have at least 3 moments for this test circuit")
         
+    def test_cached_program_invalidation(self):
+        """Test cached state vectors are invalidated when the circuit changes."""
+        logger.debug("Testing prepared-program cache invalidation")
+
+        self.engine.apply_operation("X", [0])
+        first = self.engine.get_state_vector()
+        self.assertAlmostEqual(abs(self.engine.get_state_vector()[1]), 1.0, places=5)
+
+        # Mutating the returned array must not corrupt the cache
+        first[:] = 0
+        self.assertAlmostEqual(abs(self.engine.get_state_vector()[1]), 1.0, places=5)
+
+        self.engine.apply_operation("X", [0])
+        self.assertAlmostEqual(abs(self.engine.get_state_vector()[0]), 1.0, places=5)
+
+    def test_cached_program_circuit_assignment(self):
+        """Test assigning a new circuit never reuses a stale cached program."""
+        logger.debug("Testing prepared-program cache across circuit assignment")
+
+        q0 = self.engine.qubits[0]
+        for _ in range(20):
+            for gate in (cirq.X, cirq.H, cirq.Y):
+                self.engine.circuit = cirq.Circuit([gate(q0)])
+                expected = cirq.final_state_vector(cirq.Circuit([gate(q0)]))
+                np.testing.assert_allclose(self.engine.get_state_vector(), expected, atol=1e-6)
+
+    def test_cached_program_direct_append(self):
+        """Test in-place edits of engine.circuit invalidate the cached program."""
+        logger.debug("Testing prepared-program cache after direct append")
+
+        q0, q1 = self.engine.qubits[:2]
+        self.engine.circuit = cirq.Circuit(cirq.X(q0))
+        self.assertEqual(len(self.engine.get_state_vector()), 2)
+
+        # Lands in the existing moment, so the moment count is unchanged
+        self.engine.circuit.append(cirq.X(q1))
+        state = self.engine.get_state_vector()
+        self.assertEqual(len(state), 4)
+        self.assertAlmostEqual(abs(state[3]), 1.0, places=5)
+
+    def test_repeated_terminal_measurement_runs(self):
+        """Test repeated runs of a terminal-measurement circuit stay consistent."""
+        logger.debug("Testing repeated run_circuit on cached pre-measurement state")
+
+        self.engine.apply_operation("X", [2])
+        self.engine.apply_operation("H", [0])
+        self.engine.apply_operation("CNOT", [0, 1])
+        self.engine.measure_qubits([0, 1, 2], "m")
+
+        for repetitions in (20, 50):
+            results = self.engine.run_circuit(repetitions=repetitions)
+            self.assertEqual(results["m"].shape, (repetitions, 3))
+            np.testing.assert_array_equal(results["m"][:, 0], results["m"][:, 1])
+            self.assertTrue(np.all(results["m"][:, 2] == 1))
+
+    def test_noisy_simulator_skips_cached_sampling(self):
+        """Test noisy simulators sample fresh trajectories for every shot."""
+        logger.debug("Testing run_circuit with a noisy cirq.Simulator")
+
+        self.engine.simulator = cirq.Simulator(noise=cirq.bit_flip(0.5), seed=7)
+        self.engine.apply_operation("X", [0])
+        self.engine.measure_qubits([0], "m")
+
+        results = self.engine.run_circuit(repetitions=200)
+        self.assertEqual(set(np.unique(results["m"])), {0, 1})
+
+    def test_gpu_simulator_type(self):
+        """Test simulator_type='gpu' selects the GPU backend (or its CPU fallback)."""
+        logger.debug("Testing simulator_type='gpu'")
+
+        gpu_engine = QuantumEngine(num_qubits=2, simulator_type="gpu")
+        if importlib.util.find_spec("qsimcirq") is None:
+            self.assertEqual(gpu_engine._backend.name, "gpu-fallback")
+            self.assertIsInstance(gpu_engine.simulator, cirq.Simulator)
+
+        gpu_engine.apply_operation("H", [0])
+        gpu_engine.apply_operation("CNOT", [0, 1])
+
+        state_vector = gpu_engine.get_state_vector()
+        self.assertAlmostEqual(abs(state_vector[0]), 1/np.sqrt(2), places=5)
+        self.assertAlmostEqual(abs(state_vector[3]), 1/np.sqrt(2), places=5)
+
+        gpu_engine.measure_qubits([0, 1], "bell")
+        results = gpu_engine.run_circuit(repetitions=50)
+        self.assertEqual(len(results["bell"]), 50)
+
+    @unittest.skipUnless(importlib.util.find_spec("qsimcirq"), "qsimcirq not installed")
+    def test_gpu_matches_cpu_state(self):
+        """Test the qsim GPU backend produces the same state as the CPU path."""
+        logger.debug("Testing GPUBackend against cirq.Simulator")
+
+        gpu_engine = QuantumEngine(num_qubits=3, simulator_type="gpu")
+        if not gpu_engine._backend.gpu_enabled:
+            self.skipTest("qsimcirq built without GPU support")
+        self.assertEqual(gpu_engine._backend.name, "gpu")
+        for engine in (gpu_engine, self.engine):
+            engine.apply_operation("H", [0])
+            engine.apply_operation("CNOT", [0, 1])
+            engine.apply_operation("Ry", [2], [0.3])
+
+        np.testing.assert_allclose(
+            gpu_engine.get_state_vector(), self.engine.get_state_vector(), atol=1e-5
+        )
+
+    def test_numba_simulator_type(self):
+        """Test the Numba backend state vector matches the Cirq simulator."""
+        logger.debug("Testing simulator_type='numba'")
+
+        numba_engine = QuantumEngine(num_qubits=3, simulator_type="numba")
+        for engine in (numba_engine, self.engine):
+            engine.apply_operation("H", [0])
+            engine.apply_operation("CNOT", [0, 1])
+            engine.apply_operation("Ry", [2], [0.3])
+            engine.apply_operation("SWAP", [1, 2])
+
+        np.testing.assert_allclose(
+            numba_engine.get_state_vector(), self.engine.get_state_vector(), atol=1e-6
+        )
+
+    def test_numba_sum_of_products_controls(self):
+        """Test multi-product control sets fall back to the Cirq simulator."""
+        logger.debug("Testing Numba lowering of SumOfProducts controls")
+
+        from qndb.core.engine.numba_backend import lower_circuit
+
+        q0, q1 = cirq.LineQubit.range(2)
+        op = cirq.X(q1).controlled_by(q0, control_values=cirq.SumOfProducts(((0,), (1,))))
+        self.assertIsNone(lower_circuit(cirq.Circuit(op), [q0, q1]))
+
+        numba_engine = QuantumEngine(num_qubits=2, simulator_type="numba")
+        numba_engine.add_operations([op])
+        np.testing.assert_allclose(
+            numba_engine.get_state_vector(), cirq.final_state_vector(cirq.Circuit(op)), atol=1e-6
+        )
+
     def test_error_handling(self):
         """Test error handling for invalid operations."""
         logger.debug("Testing error handling for invalid operations")
@@ -63,6 +63,17 @@ class TestQuantumEncryption(unittest.TestCase):
         
         self.assertEqual(decrypted, data)  # Should match original
         
+    def test_bob_measurement_matches_alice_on_shared_bases(self):
+        alice_bits = [1, 0, 1, 1, 0, 0]
+        alice_bases = [0, 1, 0, 1, 0, 1]
+        bob_bases = [0, 1, 1, 1, 1, 0]
+        bob = self.encryption.simulate_bob_measurement(alice_bits, alice_bases, bob_bases)
+        self.assertEqual(len(bob), 6)
+        self.assertEqual([bob[i] for i in (0, 1, 3)], [1, 0, 1])
+        self.assertTrue(set(bob) <= {0, 1})
+        self.assertIsInstance(bob[2], int)
+        self.assertEqual(self.encryption.simulate_bob_measurement([], [], []), [])
+
     def test_quantum_key_distribution(self):
         """Test quantum key distribution protocol."""
         logger.debug("Testing quantum_key_distribution")
@@ -56,6 +56,66 @@ class TestCircuitCompiler(unittest.TestCase):
         self.assertLess(optimized_count, original_count, 
                          f"Expected fewer operations after optimization, but got {optimized_count} (was {original_count})")
         
+    def test_compile_preserves_unitary(self):
+        """Test the fused compile pipeline keeps the circuit unitary."""
+        logger.info("Compiling random circuit at optimization level 1")
+        circuit = cirq.testing.random_circuit(qubits=4, n_moments=20, op_density=0.8,
+                                              random_state=3)
+        compiler = CircuitCompiler(optimization_level=1)
+        compiled, metadata = compiler.compile(circuit)
+        
+        qubit_order = sorted(circuit.all_qubits())
+        self.assertTrue(cirq.allclose_up_to_global_phase(
+            cirq.unitary(circuit), compiled.unitary(qubit_order=qubit_order)))
+        self.assertLessEqual(metadata["optimized_gate_count"], metadata["original_gate_count"])
+        self.assertIsNot(compiled, circuit)
+
+    def test_compile_cancels_involutions(self):
+        """Test back-to-back CNOT and CZ pairs cancel without transpilation."""
+        logger.info("Compiling circuit with cancelling two-qubit gates")
+        a, b = cirq.LineQubit.range(2)
+        circuit = cirq.Circuit([cirq.H(a), cirq.CNOT(a, b), cirq.CNOT(a, b),
+                                cirq.CZ(a, b), cirq.CZ(b, a)])
+        compiled, metadata = CircuitCompiler(optimization_level=1).compile(circuit)
+
+        self.assertEqual(list(compiled.all_operations()), [cirq.H(a)])
+        self.assertEqual(metadata["optimized_gate_count"], 1)
+
+    def test_compile_many(self):
+        """Test batch compilation in worker processes matches compile()."""
+        logger.info("Compiling a batch of circuits with two workers")
+        circuits = [cirq.testing.random_circuit(qubits=3, n_moments=8, op_density=0.8,
+                                                random_state=seed) for seed in range(4)]
+        compiler = CircuitCompiler(optimization_level=2)
+        results = compiler.compile_many(circuits, workers=2)
+
+        self.assertEqual(len(results), len(circuits))
+        for circuit, (compiled, metadata) in zip(circuits, results):
+            expected, expected_metadata = compiler.compile(circuit)
+            self.assertEqual(compiled, expected)
+            self.assertEqual(metadata, expected_metadata)
+
+    def test_compile_sparse_line_qubits(self):
+        """Test routing circuits on far-apart LineQubits round-trips."""
+        logger.info("Compiling a circuit on sparse LineQubit indices")
+        qubits = [cirq.LineQubit(10 ** 12), cirq.LineQubit(10 ** 12 + 1)]
+        circuit = cirq.Circuit([cirq.H(qubits[0]), cirq.CNOT(*qubits)])
+        compiled, metadata = self.compiler.compile(circuit)
+
+        self.assertEqual(compiled.all_qubits(), frozenset(cirq.LineQubit.range(2)))
+        self.assertEqual(self.compiler.decompile(compiled, metadata).all_qubits(),
+                         frozenset(qubits))
+
+    def test_fuse_adjacent_gates(self):
+        """Test the standalone fusion pass merges single-qubit runs."""
+        logger.info("Fusing a run of single-qubit gates")
+        q = cirq.LineQubit(0)
+        circuit = cirq.Circuit([cirq.H(q), cirq.T(q), cirq.X(q)])
+        fused = self.compiler._fuse_adjacent_gates(circuit)
+
+        self.assertLess(len(list(fused.all_operations())), 3)
+        self.assertTrue(cirq.allclose_up_to_global_phase(cirq.unitary(circuit), cirq.unitary(fused)))
+
     def test_serialize_circuit(self):
         """Test circuit serialization to storable format."""
         from qndb.core.quantum_engine import QuantumEngine
@@ -309,6 +369,72 @@ class TestErrorCorrection(unittest.TestCase):
         self.assertGreater(len(all_qubits), len(protected_qubits),
                           "Syndrome circuit should include ancilla qubits")
 
+    def test_encode_circuits_cached(self):
+        """Test encode/detect builders return shared frozen circuits per layout."""
+        logger.info("Building encoder and syndrome circuits twice")
+        qubits = cirq.LineQubit.range(5)
+        first = self.corrector.encode(qubits[0], qubits[1:3])
+        second = QuantumErrorCorrection().encode(qubits[0], qubits[1:3])
+        self.assertIsInstance(first, cirq.FrozenCircuit)
+        self.assertIs(first, second)
+        self.assertIsNot(first, self.corrector.encode(qubits[1], [qubits[0], qubits[2]]))
+
+        detect = self.corrector.detect_errors(qubits[:3], qubits[3:])
+        self.assertIs(detect, self.corrector.detect_errors(qubits[:3], qubits[3:]))
+
+        # Encoding |1> with the bit-flip code yields |111>
+        circuit = cirq.Circuit(cirq.X(qubits[0]))
+        circuit += first
+        state = cirq.final_state_vector(circuit, qubit_order=qubits[:3])
+        self.assertAlmostEqual(abs(state[0b111]), 1.0, places=5)
+
+    def test_code_type_dispatch(self):
+        """Test encode/detect dispatch on code_type, including unknown codes."""
+        qubits = cirq.LineQubit.range(9)
+        shor = QuantumErrorCorrection("shor")
+        self.assertEqual(len(list(shor.encode(qubits[0], qubits[1:]).all_operations())), 9)
+        self.assertEqual(len(shor.detect_errors(qubits[:3], qubits[3:5])), 0)
+
+        with self.assertRaises(ValueError):
+            QuantumErrorCorrection("unknown").encode(qubits[0], qubits[1:3])
+
+    def test_encoder_templates_remap_qubits(self):
+        """Test Shor/Steane encoders map their templates onto arbitrary qubits."""
+        from qndb.core.storage import error_correction
+
+        qubits = tuple(cirq.NamedQubit(f"c{i}") for i in range(9))
+        shor = self.corrector.encode_shor(qubits[0], qubits[1:])
+        self.assertEqual(shor, cirq.FrozenCircuit(error_correction._shor_encoder_ops(qubits)))
+        steane = self.corrector.encode_steane(qubits[0], qubits[1:7])
+        self.assertEqual(steane, cirq.FrozenCircuit(error_correction._steane_encoder_ops(qubits[:7])))
+        self.assertEqual(len(steane), len(error_correction._STEANE_TEMPLATE))
+
+    def test_gate_layers_shared(self):
+        """Test per-block H/X layers are built once and keep circuit layout."""
+        from qndb.core.storage import error_correction
+
+        qubits = cirq.LineQubit.range(6)
+        layer = error_correction._gate_layer(cirq.H, tuple(qubits[:3]))
+        self.assertIs(layer, error_correction._gate_layer(cirq.H, tuple(qubits[:3])))
+        self.assertEqual(layer, tuple(cirq.H.on_each(*qubits[:3])))
+
+        # Two blocks, each with H on three data qubits twice and on two syndrome qubits
+        circuit = self.corrector.create_syndrome_circuit(cirq.Circuit(cirq.I.on_each(*qubits)),
+                                                         qubits, "phase_flip")
+        h_count = sum(1 for op in circuit.all_operations() if op.gate == cirq.H)
+        self.assertEqual(h_count, 2 * (3 + 3 + 2))
+
+    def test_correct_errors_syndrome_table(self):
+        """Test syndrome-to-correction mapping for the three-qubit codes."""
+        qubits = cirq.LineQubit.range(3)
+        phase = QuantumErrorCorrection("phase_flip")
+        self.assertEqual(list(self.corrector.correct_errors(qubits, 3).all_operations()),
+                         [cirq.X(qubits[1])])
+        self.assertEqual(list(phase.correct_errors(qubits, np.int64(2)).all_operations()),
+                         [cirq.Z(qubits[2])])
+        self.assertEqual(len(self.corrector.correct_errors(qubits, 0)), 0)
+        self.assertEqual(len(QuantumErrorCorrection("shor").correct_errors(qubits, 1)), 0)
+
 
 class TestPersistentStorage(unittest.TestCase):
     def setUp(self):
@@ -387,7 +513,227 @@ class TestPersistentStorage(unittest.TestCase):
             # Check qubit count
             self.assertEqual(len(orig_op.qubits), len(retr_op.qubits),
                            f"Qubit count mismatch at operation {i+1}")
-        
+
+    def test_circuit_json_format(self):
+        """Test circuits round-trip as compressed JSON and legacy pickles load."""
+        import pickle
+
+        a, b = cirq.LineQubit.range(2)
+        circuit = cirq.Circuit([cirq.H(a), cirq.CNOT(a, b), cirq.rz(0.25).on(b),
+                                cirq.measure(a, b, key="m")])
+
+        circuit_path = self.storage.save_circuit(circuit, "json_circuit")
+        self.assertTrue(circuit_path.endswith((".json.zst", ".json.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.test_db_path, "json_circuit_circuit.txt")))
+        self.assertEqual(self.storage.load_circuit("json_circuit"), circuit)
+
+        self.storage.save_circuit(circuit, "readable_circuit", human_readable=True)
+        self.assertTrue(os.path.exists(os.path.join(self.test_db_path, "readable_circuit_circuit.txt")))
+
+        self.storage.save_circuit(circuit, "qasm_circuit", human_readable="qasm")
+        with open(os.path.join(self.test_db_path, "qasm_circuit_circuit.qasm")) as f:
+            self.assertIn("OPENQASM", f.read())
+        self.assertTrue(self.storage.delete_data("qasm_circuit"))
+        self.assertFalse(os.path.exists(os.path.join(self.test_db_path, "qasm_circuit_circuit.qasm")))
+
+        legacy_path = os.path.join(self.test_db_path, "legacy_circuit.pickle")
+        with open(legacy_path, "wb") as f:
+            pickle.dump(circuit, f)
+        self.assertEqual(self.storage.load_circuit("legacy"), circuit)
+        self.assertIn("legacy", {item["name"] for item in self.storage.list_stored_items()})
+        self.assertTrue(self.storage.delete_data("legacy"))
+
+    def test_load_circuit_cache(self):
+        """Test repeated loads reuse the decoded circuit until it is rewritten."""
+        from unittest import mock
+
+        a, b = cirq.LineQubit.range(2)
+        circuit = cirq.Circuit([cirq.H(a), cirq.CNOT(a, b)])
+        self.storage.save_circuit(circuit, "hot")
+        first = self.storage.load_circuit("hot")
+        first.append(cirq.X(b))
+
+        with mock.patch.object(self.storage, "_read_circuit_file", side_effect=AssertionError("reread")):
+            self.assertEqual(self.storage.load_circuit("hot"), circuit)
+
+        updated = circuit + cirq.Circuit(cirq.Z(b))
+        self.storage.save_circuit(updated, "hot")
+        self.assertEqual(self.storage.load_circuit("hot"), updated)
+
+        self.storage.delete_data("hot")
+        with self.assertRaises(FileNotFoundError):
+            self.storage.load_circuit("hot")
+
+    def test_state_vector_memory_mapped(self):
+        """Test state vectors load as read-only memory maps unless copied."""
+        state = np.full(8, 1 / np.sqrt(8), dtype=np.complex128)
+        self.storage.save_state_vector(state, "uniform")
+
+        mapped = self.storage.load_state_vector("uniform")
+        self.assertIsInstance(mapped, np.memmap)
+        self.assertFalse(mapped.flags.writeable)
+        np.testing.assert_allclose(mapped, state)
+
+        copied = self.storage.load_state_vector("uniform", copy=True)
+        self.assertNotIsInstance(copied, np.memmap)
+        copied[0] = 0
+        np.testing.assert_allclose(self.storage.load_state_vector("uniform"), state)
+
+    def test_state_vector_raw(self):
+        """Test raw state vectors round-trip through the layout sidecar."""
+        state = (np.arange(8) / np.sqrt(140)).astype(np.complex64).reshape(2, 4)
+        state_path = self.storage.save_state_vector(state, "raw_state", raw=True)
+        self.assertTrue(state_path.endswith("_state.bin"))
+        self.assertEqual(os.path.getsize(state_path), state.nbytes)
+
+        loaded = self.storage.load_state_vector("raw_state")
+        self.assertEqual(loaded.dtype, np.complex64)
+        np.testing.assert_array_equal(loaded, state)
+
+        items = [item for item in self.storage.list_stored_items() if item["name"] == "raw_state"]
+        self.assertEqual([item["type"] for item in items], ["state"])
+
+        # Saving as .npy replaces the raw files
+        self.storage.save_state_vector(state, "raw_state")
+        self.assertFalse(os.path.exists(state_path))
+        self.assertIsInstance(self.storage.load_state_vector("raw_state"), np.memmap)
+        self.assertTrue(self.storage.delete_data("raw_state"))
+
+    def test_list_stored_items_index(self):
+        """Test listings are served from the index until the directory changes."""
+        from unittest import mock
+
+        self.storage.save_state_vector(np.ones(2, dtype=np.complex128), "indexed")
+        self.storage.list_stored_items()  # creates the index file
+        # Pretend the directory has been quiet for a while
+        quiet_ns = os.stat(self.test_db_path).st_mtime_ns - 10 ** 10
+        os.utime(self.test_db_path, ns=(quiet_ns, quiet_ns))
+
+        first = self.storage.list_stored_items()
+        with mock.patch.object(self.storage, "_scan_items", side_effect=AssertionError("scanned")):
+            self.assertEqual(self.storage.list_stored_items(), first)
+        self.assertEqual([item["name"] for item in first], ["indexed"])
+
+        # A new file bumps the directory mtime and forces a rescan
+        self.storage.save_database_schema({"t": {}}, "later")
+        names = {item["name"] for item in self.storage.list_stored_items()}
+        self.assertEqual(names, {"indexed", "later"})
+
+    def test_atomic_write_keeps_previous_file(self):
+        """Test a failed save leaves the previous file intact and no temp file."""
+        self.storage.save_state_vector(np.ones(2, dtype=np.complex128), "atomic")
+
+        def failing_writer(f):
+            f.write(b"partial")
+            raise IOError("disk full")
+
+        state_path = os.path.join(self.test_db_path, "atomic_state.npy")
+        with self.assertRaises(IOError):
+            self.storage._atomic_write(state_path, failing_writer)
+
+        np.testing.assert_array_equal(self.storage.load_state_vector("atomic"), np.ones(2))
+        self.assertEqual([f for f in os.listdir(self.test_db_path) if ".tmp." in f], [])
+
+    def test_import_does_not_load_cirq(self):
+        """Test importing the storage module alone leaves cirq unimported."""
+        import subprocess
+
+        code = ("import sys, qndb.core.storage.persistent_storage; "
+                "sys.exit('cirq' in sys.modules)")
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
+
+    def test_measurement_results_npz(self):
+        """Test measurement results round-trip as .npz and legacy pickles load."""
+        import pickle
+
+        results = {"m": np.array([[0, 1], [1, 1]], dtype=np.int8), "q2": np.arange(3)}
+        legacy_path = os.path.join(self.test_db_path, "shots_results.pickle")
+        with open(legacy_path, "wb") as f:
+            pickle.dump(results, f)
+        np.testing.assert_array_equal(self.storage.load_measurement_results("shots")["m"], results["m"])
+
+        results_path = self.storage.save_measurement_results(results, "shots")
+        self.assertTrue(results_path.endswith("_results.npz"))
+        self.assertFalse(os.path.exists(legacy_path))
+
+        loaded = self.storage.load_measurement_results("shots")
+        self.assertEqual(set(loaded), set(results))
+        for key, value in results.items():
+            np.testing.assert_array_equal(loaded[key], value)
+            self.assertEqual(loaded[key].dtype, value.dtype)
+
+        items = [item for item in self.storage.list_stored_items() if item["name"] == "shots"]
+        self.assertEqual([item["type"] for item in items], ["results"])
+        self.assertTrue(self.storage.delete_data("shots"))
+        self.assertFalse(os.path.exists(results_path))
+
+    def test_backup_and_restore(self):
+        """Test backups store dense files uncompressed and restore every item."""
+        import tempfile
+        import zipfile
+
+        state = np.arange(4, dtype=np.complex128)
+        self.storage.save_state_vector(state, "backup_state")
+        self.storage.save_database_schema({"table": {"columns": ["a"]}}, "backup_schema")
+        # Leftover of a write in progress: not part of the backup
+        stray = os.path.join(self.test_db_path, "backup_schema_schema.json.tmp.1.2")
+        with open(stray, "w") as f:
+            f.write("{")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = self.storage.backup_database(os.path.join(tmp, "backup"))
+            with zipfile.ZipFile(archive_path) as archive:
+                compression = {info.filename: info.compress_type for info in archive.infolist()}
+            self.assertNotIn(os.path.basename(stray), compression)
+            self.assertEqual(compression["backup_state_state.npy"], zipfile.ZIP_STORED)
+            self.assertEqual(compression["backup_schema_schema.json"], zipfile.ZIP_DEFLATED)
+
+            self.storage.clear_all()
+            self.assertTrue(self.storage.restore_from_backup(archive_path))
+
+        np.testing.assert_array_equal(self.storage.load_state_vector("backup_state"), state)
+        self.assertIn("table", self.storage.load_database_schema("backup_schema"))
+
+    def test_concurrent_atomic_writes_use_separate_temp_files(self):
+        """Test threads saving one item never share a temporary file."""
+        import threading
+
+        path = os.path.join(self.test_db_path, "shared.bin")
+        barrier = threading.Barrier(2)
+        temp_names = []
+
+        def save(payload):
+            def writer(f):
+                temp_names.append(f.name)
+                f.write(payload[:4])
+                barrier.wait(timeout=5)  # both writes are half done here
+                f.write(payload[4:])
+            self.storage._atomic_write(path, writer)
+
+        payloads = [b"a" * 4096, b"b" * 4096]
+        threads = [threading.Thread(target=save, args=(p,)) for p in payloads]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+        self.assertEqual(len(set(temp_names)), 2)
+        with open(path, "rb") as f:
+            self.assertIn(f.read(), payloads)
+        self.assertEqual([n for n in os.listdir(self.test_db_path) if ".tmp." in n], [])
+
+    def test_restore_from_tar_backup(self):
+        """Test non-zip archives still restore through shutil."""
+        import shutil
+        import tempfile
+
+        self.storage.save_state_vector(np.ones(4, dtype=np.complex128), "tar_state")
+        with tempfile.TemporaryDirectory() as tmp:
+            archive_path = shutil.make_archive(os.path.join(tmp, "backup"), "gztar", self.test_db_path)
+            self.storage.clear_all()
+            self.assertTrue(self.storage.restore_from_backup(archive_path))
+
+        np.testing.assert_array_equal(self.storage.load_state_vector("tar_state"), np.ones(4))
+
     def test_store_and_retrieve_data(self):
         """Test storing and retrieving classical data."""
         # Create complex test data
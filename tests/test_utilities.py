@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 from qndb.utilities.visualization import CircuitVisualizer
 from qndb.utilities.benchmarking import BenchmarkRunner
-from qndb.utilities.logging import get_logger
+from qndb.utilities.logging import get_logger, CircuitLogger, PerformanceLogger
 from qndb.utilities.config import Configuration
 
 class TestCircuitVisualizer(unittest.TestCase):
@@ -69,6 +69,21 @@ class TestCircuitVisualizer(unittest.TestCase):
         self.assertIsNotNone(fig)
         plt.close(fig)  # Close the figure to avoid warnings
 
+    @patch('matplotlib.pyplot.show')
+    def test_show_skipped_on_headless_backend(self, mock_show):
+        """show=True does not block under a non-interactive backend."""
+        from qndb.core.quantum_engine import QuantumEngine
+        import matplotlib.pyplot as plt
+        
+        engine = QuantumEngine(num_qubits=2)
+        engine.apply_operation("H", [0])
+        fig = self.visualizer.visualize_circuit(engine.circuit, show=True)
+        if fig.canvas.required_interactive_framework is not None:
+            plt.close(fig)
+            self.skipTest("interactive matplotlib backend in use")
+        mock_show.assert_not_called()
+        plt.close(fig)
+
 
 class TestBenchmarker(unittest.TestCase):
     def setUp(self):
@@ -260,6 +275,40 @@ class TestLogger(unittest.TestCase):
         except:
             pass
 
+    def test_timestamp_formatted_once_per_second(self):
+        """Records within one second reuse the formatted timestamp."""
+        import logging
+        from qndb.utilities.logging import _CachedTimeFormatter, DEFAULT_DATE_FORMAT
+        
+        formatter = _CachedTimeFormatter('%(asctime)s %(message)s', DEFAULT_DATE_FORMAT)
+        records = [logging.makeLogRecord({'msg': 'm', 'created': created})
+                   for created in (1000.1, 1000.9, 1001.0)]
+        with patch('qndb.utilities.logging.time.strftime',
+                   side_effect=lambda fmt, t: str(t.tm_sec)) as mock_strftime:
+            stamps = [formatter.formatTime(r, DEFAULT_DATE_FORMAT) for r in records]
+        self.assertEqual(mock_strftime.call_count, 2)
+        self.assertEqual(stamps[0], stamps[1])
+        self.assertNotEqual(stamps[1], stamps[2])
+
+    @patch('qndb.utilities.logging.json.dumps')
+    def test_disabled_levels_skip_formatting(self, mock_dumps):
+        """Payloads are not serialized for records that would be dropped."""
+        import logging
+        circuit_logger = CircuitLogger("test_quiet_circuit")
+        perf_logger = PerformanceLogger("test_quiet_perf")
+        circuit_logger.logger.logger.setLevel(logging.WARNING)
+        perf_logger.logger.logger.setLevel(logging.WARNING)
+        circuit_logger.log_measurement([0, 1], {"00": 512, "11": 512})
+        circuit_logger.log_gate("H", [0], {"theta": 0.5})
+        perf_logger.log_execution_time("op", 0.1, {"shots": 1024})
+        perf_logger.log_benchmark({"ops": 10})
+        mock_dumps.assert_not_called()
+
+        circuit_logger.logger.logger.setLevel(logging.INFO)
+        mock_dumps.return_value = "{}"
+        circuit_logger.log_measurement([0, 1], {"00": 1024})
+        mock_dumps.assert_called_once_with({"00": 1024})
+
 
 class TestConfigManager(unittest.TestCase):
     def setUp(self):